@@ -14,10 +14,17 @@ namespace StoryBook.Models;
 /// </example>
 public class AquariumAnimalImages
 {
-    /// <summary>主要圖片路徑（相對於 wwwroot）</summary>
+    /// <summary>主要圖片路徑（相對於 wwwroot；部署前以產生腳本的 --publish 改寫為內容指紋檔名，例如 main.6af8452110.png）</summary>
     /// <example>/images/aquarium/clownfish/main.png</example>
     public required string Main { get; set; }
 
     /// <summary>故事插圖路徑列表</summary>
     public List<string> Story { get; init; } = [];
+
+    /// <summary>主圖載入前顯示的低畫質預覽（選填，由圖片產生腳本寫入）</summary>
+    public ImagePlaceholder? Placeholder { get; set; }
+
+    /// <summary>雪碧圖中此動物的 symbol 網址（選填，由圖片產生腳本的 --sprite 寫入），以 &lt;use href&gt; 顯示</summary>
+    /// <example>/images/aquarium/sprite.svg#clownfish</example>
+    public string? Sprite { get; set; }
 }
@@ -0,0 +1,31 @@
+namespace StoryBook.Models;
+
+/// <summary>
+/// 低畫質預覽（LQIP），主圖載入前先顯示的主色與模糊縮圖
+/// 由 generate_aquarium_images.py 產生並寫入 aquarium.json
+/// </summary>
+/// <example>
+/// <code>
+/// var placeholder = new ImagePlaceholder
+/// {
+///     Color = "#4c88b8",
+///     Thumbnail = "data:image/png;base64,iVBORw0KGgo...",
+///     Width = 800,
+///     Height = 600
+/// };
+/// </code>
+/// </example>
+public class ImagePlaceholder
+{
+    /// <summary>圖片主色（#rrggbb）</summary>
+    public required string Color { get; set; }
+
+    /// <summary>約 16px 寬的縮圖（PNG data URI），放大後呈現模糊預覽</summary>
+    public required string Thumbnail { get; set; }
+
+    /// <summary>主圖寬度（像素），用來預留版面</summary>
+    public int Width { get; set; }
+
+    /// <summary>主圖高度（像素），用來預留版面</summary>
+    public int Height { get; set; }
+}
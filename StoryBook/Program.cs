@@ -1,3 +1,7 @@
+using System.Text.RegularExpressions;
+using Microsoft.AspNetCore.StaticFiles;
+using Microsoft.Extensions.FileProviders;
+using Microsoft.Net.Http.Headers;
 using Serilog;
 using Serilog.Events;
 using StoryBook.Services;
@@ -6,6 +10,18 @@ namespace StoryBook;
 
 public class Program
 {
+    /// <summary>內容指紋檔名，例如 main.6af8452110.png</summary>
+    private static readonly Regex FingerprintedFileName = new(@"\.[0-9a-f]{10}\.[A-Za-z0-9]+$", RegexOptions.Compiled);
+
+    /// <summary>generate_aquarium_images.py --precompress 會為這些副檔名產生預先壓縮副本</summary>
+    private static readonly HashSet<string> PrecompressedExtensions = new(StringComparer.OrdinalIgnoreCase) { ".svg", ".json" };
+
+    /// <summary>預先壓縮副本的編碼與副檔名，依偏好順序排列</summary>
+    private static readonly (string Encoding, string Extension)[] PrecompressedEncodings = [("br", ".br"), ("gzip", ".gz")];
+
+    /// <summary>靜態檔的 Content-Type 對照（加入 .br／.gz，壓縮副本才能由靜態檔中介軟體送出）</summary>
+    private static readonly FileExtensionContentTypeProvider ContentTypes = CreateContentTypeProvider();
+
     public static void Main(string[] args)
     {
         // 設定 Serilog
@@ -53,7 +69,37 @@ public class Program
                 app.UseHttpsRedirection();
             }
 
-            app.UseStaticFiles();
+            // 有預先壓縮副本（.br／.gz）的 SVG 與 JSON，依 Accept-Encoding 改送壓縮檔
+            var webRoot = app.Environment.WebRootFileProvider;
+            app.Use((context, next) =>
+            {
+                SelectPrecompressedFile(context, webRoot);
+                return next(context);
+            });
+
+            // 檔名含內容指紋的圖片（例如 main.6af8452110.png，由 generate_aquarium_images.py 產生）
+            // 內容永遠不變，可讓瀏覽器與 CDN 長期快取；重新繪製後網址會跟著改變
+            app.UseStaticFiles(new StaticFileOptions
+            {
+                ContentTypeProvider = ContentTypes,
+                OnPrepareResponse = context =>
+                {
+                    var response = context.Context.Response;
+                    var name = context.File.Name;
+                    if (context.Context.Items[typeof(PrecompressedFile)] is PrecompressedFile precompressed)
+                    {
+                        // 改送壓縮副本：標示編碼並還原原始檔的 Content-Type
+                        response.Headers.ContentEncoding = precompressed.Encoding;
+                        response.ContentType = precompressed.ContentType;
+                        name = Path.GetFileName(precompressed.OriginalPath);
+                    }
+
+                    if (FingerprintedFileName.IsMatch(name))
+                    {
+                        response.Headers.CacheControl = "public, max-age=31536000, immutable";
+                    }
+                }
+            });
 
             app.UseRouting();
 
@@ -72,4 +118,63 @@ public class Program
             Log.CloseAndFlush();
         }
     }
+
+    /// <summary>
+    /// 靜態檔有預先壓縮副本時，依 Accept-Encoding 把請求改寫到 .br／.gz 檔
+    /// </summary>
+    /// <remarks>
+    /// 只要有壓縮副本就加上 Vary: Accept-Encoding，快取才不會把壓縮過的內容送給不支援的瀏覽器；
+    /// 直接請求 .br／.gz 檔時不改寫，以 application/x-brotli、application/gzip 原樣送出。
+    /// </remarks>
+    /// <param name="context">HTTP 內容</param>
+    /// <param name="files">wwwroot 的檔案提供者</param>
+    private static void SelectPrecompressedFile(HttpContext context, IFileProvider files)
+    {
+        var request = context.Request;
+        var path = request.Path.Value;
+        if (!(HttpMethods.IsGet(request.Method) || HttpMethods.IsHead(request.Method))
+            || path is null || !PrecompressedExtensions.Contains(Path.GetExtension(path)))
+        {
+            return;
+        }
+
+        var accepted = request.GetTypedHeaders().AcceptEncoding;
+        var hasCopy = false;
+        foreach (var (encoding, extension) in PrecompressedEncodings)
+        {
+            if (!files.GetFileInfo(path + extension).Exists)
+            {
+                continue;
+            }
+
+            hasCopy = true;
+            if (accepted.Any(value => value.Value.Equals(encoding, StringComparison.OrdinalIgnoreCase) && value.Quality is not 0)
+                && ContentTypes.TryGetContentType(path, out var contentType))
+            {
+                context.Items[typeof(PrecompressedFile)] = new PrecompressedFile(encoding, contentType, path);
+                request.Path = path + extension;
+                break;
+            }
+        }
+
+        if (hasCopy)
+        {
+            context.Response.Headers.Append(HeaderNames.Vary, HeaderNames.AcceptEncoding);
+        }
+    }
+
+    /// <summary>
+    /// 建立加入 .br／.gz 對照的 Content-Type 提供者
+    /// </summary>
+    /// <returns>Content-Type 提供者</returns>
+    private static FileExtensionContentTypeProvider CreateContentTypeProvider()
+    {
+        var provider = new FileExtensionContentTypeProvider();
+        provider.Mappings[".br"] = "application/x-brotli";
+        provider.Mappings[".gz"] = "application/gzip";
+        return provider;
+    }
+
+    /// <summary>改送的預先壓縮副本：Content-Encoding、原始檔的 Content-Type 與路徑</summary>
+    private sealed record PrecompressedFile(string Encoding, string ContentType, string OriginalPath);
 }
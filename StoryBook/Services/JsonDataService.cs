@@ -427,7 +427,36 @@ public class JsonDataService : IJsonDataService, IDisposable
         return new AquariumAnimalImages
         {
             Main = element.GetProperty("main").GetString() ?? string.Empty,
-            Story = storyImages
+            Story = storyImages,
+            Placeholder = element.TryGetProperty("placeholder", out var placeholderElement) && placeholderElement.ValueKind == JsonValueKind.Object
+                ? ParseImagePlaceholder(placeholderElement)
+                : null,
+            Sprite = element.TryGetProperty("sprite", out var spriteElement) && spriteElement.ValueKind == JsonValueKind.String
+                ? spriteElement.GetString()
+                : null
+        };
+    }
+
+    /// <summary>
+    /// 解析低畫質預覽（主色、縮圖與主圖寬高）
+    /// </summary>
+    /// <param name="element">JSON 元素</param>
+    /// <returns>低畫質預覽；缺少主色或縮圖時為 null</returns>
+    private static ImagePlaceholder? ParseImagePlaceholder(JsonElement element)
+    {
+        var color = element.TryGetProperty("color", out var colorElement) ? colorElement.GetString() : null;
+        var thumbnail = element.TryGetProperty("thumbnail", out var thumbnailElement) ? thumbnailElement.GetString() : null;
+        if (string.IsNullOrEmpty(color) || string.IsNullOrEmpty(thumbnail))
+        {
+            return null;
+        }
+
+        return new ImagePlaceholder
+        {
+            Color = color,
+            Thumbnail = thumbnail,
+            Width = element.TryGetProperty("width", out var widthElement) && widthElement.ValueKind == JsonValueKind.Number && widthElement.TryGetInt32(out var width) ? width : 0,
+            Height = element.TryGetProperty("height", out var heightElement) && heightElement.ValueKind == JsonValueKind.Number && heightElement.TryGetInt32(out var height) ? height : 0
         };
     }
 
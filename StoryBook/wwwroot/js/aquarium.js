@@ -284,6 +284,12 @@
         const images = document.querySelectorAll('.animal-image, .story-image, .aquarium-animal-card img');
         images.forEach(function (img) {
             img.addEventListener('error', handleImageError);
+            // 主圖載入後移除低畫質預覽背景
+            if (img.complete && img.naturalWidth > 0) {
+                markImageState(img, 'image-loaded');
+            } else {
+                img.addEventListener('load', handleImageLoad);
+            }
             // 設定 loading 屬性以優化載入
             if (!img.hasAttribute('loading')) {
                 img.setAttribute('loading', 'lazy');
@@ -323,6 +329,27 @@
         imageObserver.observe(document.body, { childList: true, subtree: true });
     }
 
+    /**
+     * 圖片載入完成，移除低畫質預覽背景
+     * @param {Event} event - 載入事件
+     */
+    function handleImageLoad(event) {
+        markImageState(event.target, 'image-loaded');
+    }
+
+    /**
+     * 標記圖片狀態，並同步到低畫質預覽外框（外框負責顯示預覽背景）
+     * @param {HTMLImageElement} img - 圖片元素
+     * @param {string} className - image-loaded 或 image-error
+     */
+    function markImageState(img, className) {
+        img.classList.add(className);
+        var frame = img.closest('.animal-image-frame');
+        if (frame) {
+            frame.classList.add(className);
+        }
+    }
+
     /**
      * 處理圖片載入錯誤
      * @param {Event} event - 錯誤事件
@@ -341,7 +368,7 @@
             img.alt = lang === 'zh' ? '圖片載入失敗' : 'Image failed to load';
             
             // 添加視覺提示樣式
-            img.classList.add('image-error');
+            markImageState(img, 'image-error');
             
             // 記錄錯誤（開發模式）
             if (window.location.hostname === 'localhost') {
@@ -619,6 +646,13 @@
                 image = '/images/aquarium/placeholder.svg';
             }
 
+            // 有雪碧圖時縮圖改以 <use> 取用同一份 sprite.svg，不必為每隻動物各下載一張 PNG
+            var sprite = /^\/[^"'<>]*$/.test(animal.sprite || '') ? animal.sprite : null;
+            var thumb = sprite
+                ? '<svg class="search-result-thumb" role="img" aria-label="' + escapeHtml(displayName) + '">' +
+                  '<use href="' + escapeHtml(sprite) + '"></use></svg>'
+                : '<img class="search-result-thumb" src="' + escapeHtml(image) + '" alt="' + escapeHtml(displayName) + '">';
+
             // 食性圖示
             var dietLower = (diet || '').toLowerCase();
             var dietIcon = '🍽️';
@@ -628,7 +662,7 @@
 
             html += '<a class="search-result-item" href="/Aquarium/' + safeIndex + '" ' +
                     'role="option" id="search-result-' + idx + '" data-index="' + idx + '" tabindex="-1" aria-selected="false">' +
-                    '<img class="search-result-thumb" src="' + escapeHtml(image) + '" alt="' + escapeHtml(displayName) + '">' +
+                    thumb +
                     '<div class="search-result-info">' +
                     '<div class="search-result-name">' + highlightText(displayName, query) + '</div>' +
                     (subName ? '<div class="search-result-subname">' + highlightText(subName, query) + '</div>' : '') +
@@ -0,0 +1,23 @@
+"""水族館動物圖片的產生器
+
+各模組依相依順序：
+  common     共用設定與常數
+  svg        SVG 命名空間、顏色名稱與規則式
+  geometry   路徑、變換與顏色的解析
+  scene      場景目錄、物件模型、串流寫出與共用圖層
+  optimize   SVG 最佳化
+  raster     內建點陣化（NumPy）與視覺差異閘門
+  web        預先壓縮、低畫質預覽、指紋網址與網站資料
+  atlas      SVG 雪碧圖與紋理圖集
+  quantize   調色盤量化
+  renderers  點陣化工具的選擇與外部工具
+  cache      點陣圖快取（SQLite）
+  metrics    建置量測
+  analysis   繪製成本分析
+  shard      分片建置
+  build      建置流程
+  variants   程序化故事插圖變體
+  watch      監看模式
+
+命令列入口是儲存庫根目錄的 generate_aquarium_images.py。
+"""
@@ -0,0 +1,287 @@
+"""繪製成本分析與預算檢查
+
+不實際點陣化，直接從場景物件模型估算每張圖在低階平板上的繪製成本。
+面積一律換算成「畫面的倍數」：1.0 表示相當於把整個 viewBox 塗滿一次。
+"""
+
+import itertools
+import json
+import math
+import os
+import xml.etree.ElementTree as ET
+
+from .common import IMAGES_DIR, OUTPUT_DIR, SPRITE_NAME
+from .svg import NUMBER_RE, URL_REF_RE
+from .geometry import TRANSFORM_RE, _length, flatten_path, parse_color
+from .scene import (
+    ANIMALS, Circle, Element, Ellipse, Group, Line, LinearGradient, Path, Polygon, RadialGradient,
+    Rect, Text, _load_node, _load_points, _split_style, _stop_from_attrs, load_scene, scene_svg,
+)
+from .raster import INHERITED_STYLE, SHAPE_TAGS, _viewbox
+
+
+# 各指標的預設上限（--budget 可用 JSON 檔覆寫部分欄位）
+RENDER_BUDGET = {
+    "elements": 100,          # 繪製的圖形數
+    "overdraw": 4.0,          # 所有圖形面積總和
+    "blend_overdraw": 1.0,    # 半透明（需要與底圖混色）的面積
+    "gradients": 12,          # 以漸層上色的圖形數
+    "stroke_area": 0.5,       # 筆畫長度 × 寬度
+    "filters": 2,             # 套用 filter／mask／clip-path 的元素數
+    "score": 8.0,             # 加權總分
+}
+
+# 加權總分：每種成本相當於「不透明地塗滿一次畫面」的幾倍
+COST_WEIGHTS = {
+    "overdraw": 1.0,
+    "blend_overdraw": 1.0,     # 混色需要讀回底圖，額外再算一次
+    "gradient_overdraw": 0.5,  # 漸層逐像素計算顏色
+    "stroke_area": 2.0,        # 筆畫需要額外的幾何處理（端點、轉角）
+    "filter_overdraw": 4.0,    # 濾鏡與遮罩需要離屏緩衝區
+    "elements": 0.02,          # 每個元素的固定成本
+}
+
+# 估算面積時展平曲線的容許誤差（使用者座標），以及報告列出的最高成本場景數
+ANALYSIS_TOLERANCE = 0.5
+ANALYSIS_TOP = 10
+
+COST_METRICS = ("elements", "overdraw", "blend_overdraw", "gradients", "gradient_overdraw",
+                "stroke_area", "filters", "filter_overdraw")
+
+
+def transform_area_scale(value):
+    """transform 對面積的縮放倍率（各步驟行列式的乘積；旋轉、平移與斜切不改變面積）"""
+    scale = 1.0
+    for name, args in TRANSFORM_RE.findall(value or ""):
+        v = [float(n) for n in NUMBER_RE.findall(args)]
+        if name == "matrix" and len(v) == 6:
+            scale *= v[0] * v[3] - v[1] * v[2]
+        elif name == "scale" and v:
+            scale *= v[0] * (v[1] if len(v) > 1 else v[0])
+    return abs(scale)
+
+
+def _polygon_measure(points, closed):
+    """多邊形的面積（鞋帶公式）與周長"""
+    area = perimeter = 0.0
+    count = len(points)
+    for i in range(count if closed else count - 1):
+        (x0, y0), (x1, y1) = points[i], points[(i + 1) % count]
+        area += x0 * y1 - x1 * y0
+        perimeter += math.hypot(x1 - x0, y1 - y0)
+    return abs(area) / 2, perimeter
+
+
+def shape_measure(node, viewbox):
+    """圖形在區域座標下的 (填色面積, 周長)；無法估算時回傳 None"""
+    _, _, view_width, view_height = viewbox
+    if isinstance(node, Circle):
+        r = _length(node.r, math.hypot(view_width, view_height) / math.sqrt(2))
+        return math.pi * r * r, 2 * math.pi * r
+    if isinstance(node, Ellipse):
+        a, b = _length(node.rx, view_width), _length(node.ry, view_height)
+        # Ramanujan 的橢圓周長近似
+        return math.pi * a * b, math.pi * (3 * (a + b) - math.sqrt(max(0.0, (3 * a + b) * (a + 3 * b))))
+    if isinstance(node, Rect):
+        width, height = _length(node.width, view_width), _length(node.height, view_height)
+        return width * height, 2 * (width + height)
+    if isinstance(node, Line):
+        return 0.0, math.hypot(node.x2 - node.x1, node.y2 - node.y1)
+    if isinstance(node, Polygon):
+        return _polygon_measure(node.points, True)
+    if isinstance(node, Path):
+        area = perimeter = 0.0
+        try:
+            subpaths = flatten_path(node.d, ANALYSIS_TOLERANCE)
+        except ValueError:
+            return None
+        for points, closed in subpaths:
+            sub_area, sub_perimeter = _polygon_measure(points, closed)
+            area += sub_area
+            perimeter += sub_perimeter
+        return area, perimeter
+    if isinstance(node, Text):
+        font_size = _length(node.attrs.get("font-size", "16"), view_height) or 16.0
+        return 0.6 * font_size * font_size * len(node.content), 0.0
+    if isinstance(node, Element) and node.tag == "rect":
+        width = _length(node.attrs.get("width", 0), view_width)
+        height = _length(node.attrs.get("height", 0), view_height)
+        return width * height, 2 * (width + height)
+    if isinstance(node, Element) and node.tag == "polyline":
+        return _polygon_measure(_load_points(node.attrs.get("points", "")), False)
+    return None
+
+
+def gradient_opacity(scene):
+    """各漸層色標中最低的不透明度 {id: 0–1}（判斷漸層是否需要混色）"""
+    lowest = {}
+    for node in itertools.chain(scene.defs, scene.iter_shapes()):
+        if isinstance(node, (LinearGradient, RadialGradient)):
+            gradient_id, stops = node.id, node.stops
+        elif isinstance(node, Element) and node.tag in ("linearGradient", "radialGradient") \
+                and "id" in node.attrs:
+            gradient_id = node.attrs["id"]
+            stops = [_stop_from_attrs(dict(child.attrs)) for child in node.children
+                     if isinstance(child, Element) and child.tag == "stop"]
+        else:
+            continue
+        lowest[gradient_id] = min(
+            ((parse_color(stop.color) or (0, 0, 0, 0))[3] * stop.opacity for stop in stops),
+            default=1.0)
+    return lowest
+
+
+def _paint_cost(value, gradients):
+    """(是否上色, 是否為漸層, 顏色本身的不透明度)"""
+    if value is None or value.strip() == "none":
+        return False, False, 0.0
+    match = URL_REF_RE.search(value)
+    if match:
+        return True, True, gradients.get(match.group(1), 1.0)
+    color = parse_color(value)
+    return color is not None, False, color[3] if color else 0.0
+
+
+def _measure_nodes(nodes, style, opacity, area_scale, viewbox, gradients, costs):
+    """累計 nodes 的繪製成本到 costs，回傳這些節點實際上色的面積"""
+    painted = 0.0
+    for node in nodes:
+        if isinstance(node, (LinearGradient, RadialGradient)):
+            continue
+        attrs = _split_style(dict(node.attrs))
+        if attrs.get("display") == "none":
+            continue
+        node_style = {**style, **{key: attrs[key] for key in INHERITED_STYLE if key in attrs}}
+        node_opacity = opacity * float(attrs.get("opacity", 1))
+        node_scale = area_scale * transform_area_scale(attrs.get("transform"))
+        effects = any(attrs.get(name, "none") != "none" for name in ("filter", "mask", "clip-path"))
+
+        if isinstance(node, Element) and node.tag in SHAPE_TAGS and node.tag not in ("rect", "polyline"):
+            node = _load_node(ET.Element(node.tag, node.attrs))
+        if isinstance(node, (Group, Element)) and not (isinstance(node, Element)
+                                                      and node.tag in SHAPE_TAGS):
+            if getattr(node, "tag", "g") in ("defs", "clipPath", "mask", "pattern", "symbol", "marker"):
+                continue
+            area = _measure_nodes(node.children, node_style, node_opacity, node_scale,
+                                  viewbox, gradients, costs)
+            # 群組層級的 opacity 與濾鏡需要先畫到離屏緩衝區再合成
+            if float(attrs.get("opacity", 1)) < 1 and len(node.children) > 1:
+                costs["blend_overdraw"] += area
+            if effects:
+                costs["filters"] += 1
+                costs["filter_overdraw"] += area
+            painted += area
+            continue
+
+        measure = shape_measure(node, viewbox)
+        if measure is None or node_style["visibility"] != "visible":
+            continue
+        fill_area, perimeter = measure
+        costs["elements"] += 1
+        area = 0.0
+        stroke_width = float(node_style["stroke-width"]) * math.sqrt(node_scale)
+        layers = [(fill_area * node_scale, node_style["fill"], node_style["fill-opacity"])]
+        if stroke_width > 0:
+            caps = 2 * math.pi * (stroke_width / 2) ** 2 \
+                if node_style["stroke-linecap"] != "butt" else 0.0
+            layers.append((perimeter * math.sqrt(node_scale) * stroke_width + caps,
+                           node_style["stroke"], node_style["stroke-opacity"]))
+        for index, (layer_area, paint, paint_opacity) in enumerate(layers):
+            if isinstance(node, Line) and index == 0:
+                continue
+            visible, gradient, alpha = _paint_cost(paint, gradients)
+            if not visible or not layer_area:
+                continue
+            area += layer_area
+            if index == 1:
+                costs["stroke_area"] += layer_area
+            if gradient:
+                costs["gradients"] += 1
+                costs["gradient_overdraw"] += layer_area
+            if node_opacity * float(paint_opacity) * alpha < 1:
+                costs["blend_overdraw"] += layer_area
+        if effects:
+            costs["filters"] += 1
+            costs["filter_overdraw"] += area
+        costs["overdraw"] += area
+        painted += area
+    return painted
+
+
+def scene_cost(svg):
+    """估算單張 SVG 的繪製成本；面積類指標以畫面面積為 1"""
+    scene = load_scene(svg)
+    viewbox = _viewbox(scene.attrs)
+    costs = dict.fromkeys(COST_METRICS, 0.0)
+    _measure_nodes(scene.children, INHERITED_STYLE, 1.0, 1.0, viewbox,
+                   gradient_opacity(scene), costs)
+    canvas = viewbox[2] * viewbox[3]
+    for metric in COST_METRICS:
+        if metric.endswith(("overdraw", "area")):
+            costs[metric] /= canvas
+    for metric in ("elements", "gradients", "filters"):
+        costs[metric] = int(costs[metric])
+    costs["score"] = sum(weight * costs[metric] for metric, weight in COST_WEIGHTS.items())
+    return costs
+
+
+def analysis_sources(images_dir=IMAGES_DIR, output_dir=OUTPUT_DIR):
+    """要分析的場景：ANIMALS 以及 images_dir 下其他 SVG 檔（略過由 ANIMALS 產生的輸出）"""
+    sources = {f"ANIMALS/{animal_id}": scene_svg(data) for animal_id, data in ANIMALS.items()}
+    generated = {os.path.join(os.path.abspath(output_dir), animal_id, "main.svg") for animal_id in ANIMALS}
+    generated.add(os.path.join(os.path.abspath(output_dir), SPRITE_NAME))
+    for dirpath, _, names in sorted(os.walk(images_dir)):
+        for name in sorted(names):
+            path = os.path.abspath(os.path.join(dirpath, name))
+            if name.endswith(".svg") and path not in generated:
+                with open(path, encoding='utf-8') as f:
+                    sources[os.path.relpath(path, images_dir)] = f.read()
+    return sources
+
+
+def load_budget(path=None):
+    """預設預算，並以 JSON 檔中的欄位覆寫"""
+    budget = dict(RENDER_BUDGET)
+    if path:
+        with open(path, encoding='utf-8') as f:
+            overrides = json.load(f)
+        unknown = set(overrides) - set(COST_METRICS) - {"score"}
+        if unknown:
+            raise ValueError(f"未知的預算欄位: {', '.join(sorted(unknown))}")
+        budget.update(overrides)
+    return budget
+
+
+def analyze_costs(sources, budget=RENDER_BUDGET, verbose=True):
+    """估算每張場景的繪製成本並依總分排序，列出最耗費的場景與超出預算的項目
+
+    Returns:
+        依總分由高到低排列的 [{name, 各項指標, score, over}]；over 為超出預算的指標
+    """
+    log = print if verbose else (lambda *args, **kwargs: None)
+    report = []
+    for name, svg in sources.items():
+        try:
+            costs = scene_cost(svg)
+        except (ET.ParseError, ValueError) as e:
+            log(f"⚠️  無法分析 {name}: {e}")
+            continue
+        over = [metric for metric, limit in budget.items() if costs.get(metric, 0) > limit]
+        report.append({"name": name, **costs, "over": over})
+    report.sort(key=lambda entry: entry["score"], reverse=True)
+
+    log(f"🔎 繪製成本分析: {len(report)} 張場景（面積以畫面為 1 倍）")
+    log(f"   {'場景':<40}{'總分':>7}{'元素':>6}{'覆蓋':>7}{'混色':>7}{'漸層':>5}{'筆畫':>7}{'濾鏡':>5}")
+    offenders = [entry for entry in report if entry["over"]]
+    shown = report[:ANALYSIS_TOP] + [entry for entry in offenders if entry not in report[:ANALYSIS_TOP]]
+    for entry in shown:
+        mark = "❌" if entry["over"] else "  "
+        log(f"{mark} {entry['name']:<40}{entry['score']:>7.2f}{entry['elements']:>6}"
+            f"{entry['overdraw']:>7.2f}{entry['blend_overdraw']:>7.2f}{entry['gradients']:>5}"
+            f"{entry['stroke_area']:>7.2f}{entry['filters']:>5}")
+    for entry in offenders:
+        details = "、".join(f"{metric} {entry[metric]:.2f} > {budget[metric]}" for metric in entry["over"])
+        log(f"❌ {entry['name']} 超出預算: {details}")
+    if not offenders:
+        log("✅ 所有場景都在預算內")
+    return report
@@ -0,0 +1,332 @@
+"""合併輸出：所有動物的 SVG 雪碧圖，以及以 MaxRects 裝箱的縮圖與動畫影格紋理圖集"""
+
+import json
+import math
+import os
+import time
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow 為選用套件，缺少時不輸出紋理圖集
+    Image = None
+
+from .common import (
+    ATLAS_MAP_NAME, ATLAS_MAX_SIZE, ATLAS_NAME, ATLAS_PADDING, ATLAS_THUMB_WIDTH, SPRITE_MAP_NAME,
+    SPRITE_NAME, URL_PREFIX, write_if_changed,
+)
+from .svg import SVG_NS, URL_REF_RE, XLINK_NS
+from .optimize import format_saving, optimized_tree, serialize_node
+from .raster import encode_raster
+
+
+# ── SVG 雪碧圖（sprite） ───────────────────────────────────────
+
+def rewrite_refs(node, mapping):
+    """依對照表改寫 url(#id) 與 href="#id" 引用"""
+    for name, value in node["attrs"].items():
+        if name in ("href", "xlink:href") and value.startswith("#"):
+            node["attrs"][name] = "#" + mapping.get(value[1:], value[1:])
+        elif "url(" in value:
+            node["attrs"][name] = URL_REF_RE.sub(
+                lambda m: f"url(#{mapping.get(m.group(1), m.group(1))})", value)
+    for child in node["children"]:
+        rewrite_refs(child, mapping)
+
+
+def iter_nodes(node):
+    yield node
+    for child in node["children"]:
+        yield from iter_nodes(child)
+
+
+def unique_id(candidate, taken):
+    """取得不與 taken 重複的 id，並登記到 taken"""
+    result = candidate
+    suffix = 2
+    while result in taken:
+        result = f"{candidate}-{suffix}"
+        suffix += 1
+    taken.add(result)
+    return result
+
+
+def build_sprite(svgs, href=f"{URL_PREFIX}/{SPRITE_NAME}"):
+    """把所有動物打包成一個以 <symbol> 組成的 SVG
+
+    各動物的 <defs> 內容相同者（例如重複定義的海洋背景漸層）只保留一份，
+    其餘 id 一律加上動物 id 前綴，避免合併後互相衝突。
+
+    Returns:
+        (雪碧圖 SVG 字串, {動物 id: {"href", "viewBox"}}, 合併前的 defs 數量)
+    """
+    taken = set(svgs)
+    shared_defs = []
+    shared_by_key = {}
+    symbols = []
+    fragments = {}
+    defs_before = 0
+
+    for animal_id, svg in svgs.items():
+        tree = optimized_tree(svg)
+        mapping = {}
+
+        # 先處理 defs：內容相同（不含 id）的定義共用同一份
+        body = []
+        for child in tree["children"]:
+            if child["tag"] != "defs":
+                body.append(child)
+                continue
+            for definition in child["children"]:
+                defs_before += 1
+                rewrite_refs(definition, mapping)
+                old_id = definition["attrs"].pop("id", None)
+                key_out = []
+                serialize_node(definition, key_out)
+                key = "".join(key_out)
+                if key not in shared_by_key:
+                    new_id = unique_id(old_id or f"{animal_id}-def", taken)
+                    definition["attrs"] = {"id": new_id, **definition["attrs"]}
+                    shared_by_key[key] = new_id
+                    shared_defs.append(definition)
+                if old_id:
+                    mapping[old_id] = shared_by_key[key]
+
+        # 畫面元素上的 id 加上動物前綴
+        for node in body:
+            for element in iter_nodes(node):
+                if "id" in element["attrs"]:
+                    old_id = element["attrs"]["id"]
+                    mapping[old_id] = unique_id(f"{animal_id}-{old_id}", taken)
+                    element["attrs"]["id"] = mapping[old_id]
+        for node in body:
+            rewrite_refs(node, mapping)
+
+        attrs = {"id": animal_id}
+        for name in ("viewBox", "preserveAspectRatio"):
+            if name in tree["attrs"]:
+                attrs[name] = tree["attrs"][name]
+        symbols.append({"tag": "symbol", "attrs": attrs, "children": body, "text": "", "tail": ""})
+        fragments[animal_id] = {"href": f"{href}#{animal_id}", "viewBox": attrs.get("viewBox")}
+
+    children = []
+    if shared_defs:
+        children.append({"tag": "defs", "attrs": {}, "children": shared_defs, "text": "", "tail": ""})
+    children.extend(symbols)
+    sprite = {"tag": "svg", "attrs": {"xmlns": SVG_NS}, "children": children, "text": "", "tail": ""}
+    if any(name.startswith("xlink:") for node in iter_nodes(sprite) for name in node["attrs"]):
+        sprite["attrs"]["xmlns:xlink"] = XLINK_NS
+
+    out = []
+    serialize_node(sprite, out)
+    return "".join(out), fragments, defs_before
+
+
+def generate_sprite(output_dir, svgs):
+    """寫出 sprite.svg 與 id → 片段對照表 sprite.json
+
+    Returns:
+        ([(路徑, 是否有寫入)], {動物 id: {"href", "viewBox"}})
+    """
+    sprite, fragments, defs_before = build_sprite(svgs)
+    sprite_path = os.path.join(output_dir, SPRITE_NAME)
+    map_path = os.path.join(output_dir, SPRITE_MAP_NAME)
+    data = json.dumps(fragments, indent=2, ensure_ascii=False) + "\n"
+    written = [
+        (sprite_path, write_if_changed(sprite_path, sprite.encode('utf-8'))),
+        (map_path, write_if_changed(map_path, data.encode('utf-8'))),
+    ]
+
+    separate = sum(len(svg.encode('utf-8')) for svg in svgs.values())
+    shared = sprite.count("<linearGradient") + sprite.count("<radialGradient")
+    print(f"🧩 雪碧圖: {len(fragments)} 個 symbol 合併為 {SPRITE_NAME}，"
+          f"defs {defs_before} → {shared} 個，"
+          f"{format_saving(separate, len(sprite.encode('utf-8')))}")
+    return written, fragments
+
+
+# ── 紋理圖集（texture atlas） ──────────────────────────────────
+#
+# 把所有動物的縮圖與動畫影格（<動物>/frames/*.png）以 MaxRects 裝箱合併成
+# 少數幾張圖集，網頁只需下載圖集與座標表，不必為每張影格各發一次請求。
+
+def _contains(outer, inner):
+    return (outer[0] <= inner[0] and outer[1] <= inner[1]
+            and inner[0] + inner[2] <= outer[0] + outer[2]
+            and inner[1] + inner[3] <= outer[1] + outer[3])
+
+
+class MaxRectsBin:
+    """MaxRects 矩形裝箱（Bottom-Left：盡量靠上、靠左），free 為 (x, y, 寬, 高) 的空白矩形
+
+    圖集最後會裁到實際用到的範圍，因此優先把矩形集中在左上角。
+    """
+    __slots__ = ("width", "height", "free")
+
+    def __init__(self, width, height):
+        self.width, self.height = width, height
+        self.free = [(0, 0, width, height)]
+
+    def insert(self, width, height):
+        """放入一個矩形，回傳左上角 (x, y)；放不下時回傳 None"""
+        best = None
+        for fx, fy, fw, fh in self.free:
+            if width <= fw and height <= fh:
+                score = (fy + height, fx)
+                if best is None or score < best[0]:
+                    best = (score, fx, fy)
+        if best is None:
+            return None
+        _, x, y = best
+        self._split((x, y, width, height))
+        return x, y
+
+    def _split(self, used):
+        """從所有與 used 重疊的空白矩形切出剩餘部分，並移除被其他空白矩形包含者"""
+        x, y, w, h = used
+        kept, split = [], []
+        for rect in self.free:
+            fx, fy, fw, fh = rect
+            if x >= fx + fw or x + w <= fx or y >= fy + fh or y + h <= fy:
+                kept.append(rect)
+                continue
+            if x > fx:
+                split.append((fx, fy, x - fx, fh))
+            if x + w < fx + fw:
+                split.append((x + w, fy, fx + fw - x - w, fh))
+            if y > fy:
+                split.append((fx, fy, fw, y - fy))
+            if y + h < fy + fh:
+                split.append((fx, y + h, fw, fy + fh - y - h))
+        # 原本的空白矩形彼此不互相包含，只需比對新切出來的部分
+        split.sort(key=lambda rect: rect[2] * rect[3])
+        split = [rect for i, rect in enumerate(split)
+                 if not any(_contains(other, rect) for other in split[i + 1:])
+                 and not any(_contains(other, rect) for other in kept)]
+        self.free = [rect for rect in kept if not any(_contains(other, rect) for other in split)] + split
+
+
+def _pack(sizes, order, bin_width, max_size, padding):
+    """以固定寬度的圖集依序裝箱，回傳 (placements, extents)"""
+    placements = [None] * len(sizes)
+    bins, extents = [], []
+    for i in order:
+        width, height = sizes[i][0] + 2 * padding, sizes[i][1] + 2 * padding
+        for index, atlas in enumerate(bins):
+            position = atlas.insert(width, height)
+            if position is not None:
+                break
+        else:
+            index = len(bins)
+            bins.append(MaxRectsBin(bin_width, max_size))
+            extents.append((0, 0))
+            position = bins[index].insert(width, height)
+        x, y = position
+        placements[i] = (index, x + padding, y + padding)
+        extents[index] = (max(extents[index][0], x + width), max(extents[index][1], y + height))
+    return placements, extents
+
+
+def pack_rects(sizes, max_size=ATLAS_MAX_SIZE, padding=ATLAS_PADDING):
+    """把 [(寬, 高)] 裝進盡量少的 max_size × max_size 圖集
+
+    由大到小依序放入第一張放得下的圖集，都放不下時才開新圖集；每個矩形
+    四周保留 padding 像素，避免縮放取樣時滲入相鄰影格。影格總面積不到
+    一張圖集時，另外試幾種接近正方形的寬度，取圖集數最少、總面積最小者。
+
+    Returns:
+        ([(圖集編號, x, y)]（與 sizes 同順序）, [(圖集寬, 高)])
+    """
+    for width, height in sizes:
+        if width + 2 * padding > max_size or height + 2 * padding > max_size:
+            raise ValueError(f"影格 {width}×{height} 超過圖集上限 {max_size}")
+    if not sizes:
+        return [], []
+    order = sorted(range(len(sizes)), key=lambda i: (max(sizes[i]), sizes[i][0] * sizes[i][1]),
+                   reverse=True)
+    area = sum((width + 2 * padding) * (height + 2 * padding) for width, height in sizes)
+    widest = max(width for width, _ in sizes) + 2 * padding
+    widths = {max_size}
+    if area < max_size * max_size:
+        widths.update(min(max_size, max(widest, math.ceil(math.sqrt(area * factor))))
+                      for factor in (1.0, 1.15, 1.3, 1.6, 2.0))
+    layouts = [_pack(sizes, order, width, max_size, padding) for width in sorted(widths)]
+    return min(layouts, key=lambda layout: (len(layout[1]), sum(w * h for w, h in layout[1])))
+
+
+def atlas_frames(output_dir, animal_ids, thumb_width=ATLAS_THUMB_WIDTH):
+    """收集要放進圖集的影格：每隻動物的縮圖（由 main.png 縮小）與 frames/*.png
+
+    Returns:
+        [(影格名稱, Pillow 圖片)]，名稱例如 clownfish/thumb、clownfish/frames/swim-1
+    """
+    frames = []
+    for animal_id in animal_ids:
+        animal_dir = os.path.join(output_dir, animal_id)
+        main_png = os.path.join(animal_dir, "main.png")
+        if os.path.exists(main_png):
+            with Image.open(main_png) as image:
+                height = max(1, round(image.height * thumb_width / image.width))
+                frames.append((f"{animal_id}/thumb",
+                               image.convert("RGBA").resize((thumb_width, height), Image.LANCZOS)))
+        frames_dir = os.path.join(animal_dir, "frames")
+        if os.path.isdir(frames_dir):
+            for name in sorted(os.listdir(frames_dir)):
+                if name.endswith(".png"):
+                    with Image.open(os.path.join(frames_dir, name)) as image:
+                        frames.append((f"{animal_id}/frames/{name[:-4]}", image.convert("RGBA")))
+    return frames
+
+
+def generate_atlas(output_dir, animal_ids, max_size=ATLAS_MAX_SIZE, padding=ATLAS_PADDING,
+                   verbose=True):
+    """寫出 atlas-<n>.png 與座標表 atlas.json，回傳 [(路徑, 是否有寫入)]
+
+    座標表的 frames 為 {影格名稱: {"atlas", "x", "y", "width", "height"}}，
+    efficiency 為影格總面積佔圖集總面積的比例。
+    """
+    if Image is None:
+        print("⚠️  紋理圖集需要 Pillow（pip install pillow），略過")
+        return []
+    frames = atlas_frames(output_dir, animal_ids)
+    sizes = [image.size for _, image in frames]
+    started = time.perf_counter()
+    placements, extents = pack_rects(sizes, max_size, padding)
+    pack_seconds = time.perf_counter() - started
+
+    atlases = [Image.new("RGBA", extent, (0, 0, 0, 0)) for extent in extents]
+    coordinates = {}
+    for (name, image), (index, x, y) in zip(frames, placements):
+        atlases[index].paste(image, (x, y))
+        coordinates[name] = {"atlas": index, "x": x, "y": y, "width": image.width, "height": image.height}
+
+    written = []
+    entries = []
+    for index, atlas in enumerate(atlases):
+        name = f"{ATLAS_NAME}-{index}.png"
+        path = os.path.join(output_dir, name)
+        written.append((path, write_if_changed(path, encode_raster(atlas, "png"))))
+        entries.append({"file": f"{URL_PREFIX}/{name}", "width": atlas.width, "height": atlas.height})
+    # 影格變少時移除多出來的舊圖集
+    index = len(atlases)
+    while os.path.exists(os.path.join(output_dir, f"{ATLAS_NAME}-{index}.png")):
+        os.remove(os.path.join(output_dir, f"{ATLAS_NAME}-{index}.png"))
+        index += 1
+
+    used = sum(width * height for width, height in sizes)
+    total = sum(width * height for width, height in extents)
+    efficiency = used / total if total else 0.0
+    data = json.dumps({
+        "maxSize": max_size,
+        "padding": padding,
+        "efficiency": round(efficiency, 4),
+        "atlases": entries,
+        "frames": coordinates,
+    }, indent=2, ensure_ascii=False) + "\n"
+    map_path = os.path.join(output_dir, ATLAS_MAP_NAME)
+    written.append((map_path, write_if_changed(map_path, data.encode('utf-8'))))
+
+    if verbose:
+        print(f"🧱 紋理圖集: {len(frames)} 張影格 → {len(atlases)} 張圖集"
+              f"（{', '.join(f'{w}×{h}' for w, h in extents)}），使用率 {efficiency * 100:.1f}%，"
+              f"裝箱 {pack_seconds * 1000:.1f} ms")
+    return written
@@ -0,0 +1,716 @@
+"""建置：決定建置設定、平行產生每隻動物的 SVG 與點陣圖，並彙整網站資料、雪碧圖與圖集
+
+每隻動物以內容雜湊與建置清單判斷是否需要重建；工作行程負責單隻動物的最佳化、
+點陣化與編碼，主行程彙整結果、寫出建置清單與量測報告。
+"""
+
+import contextlib
+import cProfile
+import hashlib
+import io
+import itertools
+import json
+import os
+import pstats
+import subprocess
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 為選用套件，缺少時只能以 rsvg-convert 點陣化
+    np = None
+
+try:
+    import PIL
+    from PIL import Image, features as pil_features
+except ImportError:  # Pillow 為選用套件，缺少時響應式圖片只輸出 PNG
+    PIL = Image = pil_features = None
+
+try:
+    import sqlite3
+except ImportError:  # 部分精簡版 Python 沒有 sqlite3，缺少時不使用點陣圖快取
+    sqlite3 = None
+
+from .common import (
+    ATLAS_MAX_SIZE, EXTERNAL_RENDERERS, FINGERPRINT_GRACE, MANIFEST_NAME, NUMPY_RENDERER,
+    OUTPUT_DIR, PLACEHOLDER_VERSION, PLACEHOLDER_WIDTH, PNG_HEIGHT, PNG_WIDTH,
+    PRECOMPRESS_ENCODINGS, PROBE_HEIGHT, PROBE_VERSION, PROBE_WIDTH, PROFILE_TOP, QUANTIZE_VERSION,
+    RASTER_CACHE_MAX_BYTES, RASTER_FORMATS, RESPONSIVE_FORMATS, RESPONSIVE_WIDTHS, RSVG_CONVERT,
+    SHARD_RECORD_NAME, SPRITE_NAME, URL_PREFIX, VARIANTS_NAME, write_if_changed,
+)
+from .scene import ANIMALS, scene_svg
+from .optimize import (
+    GEOMETRY_MAX_WIDTH, OPTIMIZER_VERSION, count_elements, format_saving, optimize_svg,
+)
+from .web import (
+    fingerprint_url, format_compression, make_placeholder, precompress_file, publish_animal_data,
+    supported_encodings,
+)
+from .raster import (
+    encode_probe, encode_raster, raster_settings, render_png_numpy, render_probe, reusable_rasters,
+)
+from .atlas import generate_atlas, generate_sprite
+from .quantize import quantize_png
+from .renderers import render_external, renderer_version, select_renderer, svg_aspect_ratio
+from .cache import open_raster_cache, raster_cache_key, worker_raster_cache
+from .metrics import (
+    cpu_time, dominant_stage, make_report, measure, peak_rss_bytes, prometheus_metrics,
+)
+from .shard import load_shard_records, merge_reports, partition_scenes, shard_costs
+
+
+def render_settings(rasterize, widths=(), formats=(), optimize=True, precompress=(),
+                    renderer=RSVG_CONVERT, quantize=None, visual_gate=None):
+    """影響輸出內容的建置設定，納入快取雜湊，並傳給工作行程"""
+    settings = {"svg": True}
+    if optimize:
+        # 座標精度依實際要輸出的最大寬度決定，會改變 SVG 內容
+        settings["optimize"] = {"version": OPTIMIZER_VERSION,
+                                "max_width": max((GEOMETRY_MAX_WIDTH, *widths))}
+    if precompress:
+        settings["precompress"] = list(precompress)
+    if rasterize:
+        settings["png"] = {"renderer": renderer, "width": PNG_WIDTH, "height": PNG_HEIGHT}
+        # 工具升級後輸出可能不同，版本一併納入建置與點陣圖快取的雜湊
+        version = renderer_version(renderer)
+        if version is not None:
+            settings["png"]["version"] = version
+        if quantize:
+            settings["quantize"] = {**quantize, "version": QUANTIZE_VERSION}
+        if Image is not None or np is not None:
+            settings["placeholder"] = {"width": PLACEHOLDER_WIDTH, "version": PLACEHOLDER_VERSION}
+        if visual_gate is not None and np is not None:
+            settings["probe"] = {"width": PROBE_WIDTH, "height": PROBE_HEIGHT,
+                                 "max_diff": visual_gate, "version": PROBE_VERSION}
+        if widths and formats:
+            settings["responsive"] = {
+                "widths": sorted(set(widths)),
+                "formats": list(formats),
+                "encoder": f"pillow-{PIL.__version__}" if Image
+                else renderer if version is None else f"{renderer}-{version}",
+                "options": {fmt: RASTER_FORMATS[fmt]["options"] for fmt in formats},
+            }
+    return settings
+
+
+def supported_formats(formats):
+    """過濾出目前環境能編碼的格式（WebP/AVIF 需要 Pillow）"""
+    supported = []
+    for fmt in formats:
+        if fmt == "png":
+            supported.append(fmt)
+            continue
+        try:
+            available = Image is not None and pil_features.check(fmt)
+        except ValueError:  # 舊版 Pillow 不認識此功能名稱
+            available = False
+        if available:
+            supported.append(fmt)
+        else:
+            print(f"⚠️  目前環境無法輸出 {fmt}（需要支援該格式的 Pillow），已略過")
+    return supported
+
+
+def content_hash(svg, settings):
+    """以 SVG 原始碼與建置設定計算內容雜湊"""
+    digest = hashlib.sha256(svg.encode('utf-8'))
+    digest.update(json.dumps(settings, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def load_manifest(output_dir):
+    """讀取建置快取清單，不存在或損毀時視為空白"""
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def save_manifest(output_dir, manifest):
+    """寫入建置快取清單（內容未變時不更動檔案）
+
+    只依動物 id 排序，紀錄內的欄位維持原本的順序：由清單讀回的紀錄
+    （快取命中、分片合併）寫出的 variants.json 與網站資料才會和剛建置時完全相同。
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    data = json.dumps(dict(sorted(manifest.items())), indent=2, ensure_ascii=False) + "\n"
+    write_if_changed(os.path.join(output_dir, MANIFEST_NAME), data.encode('utf-8'))
+
+
+def is_cache_hit(entry, digest, animal_dir):
+    """快取清單紀錄與目前雜湊相同，且所有輸出檔都還在"""
+    if not entry or entry.get("hash") != digest:
+        return False
+    return all(os.path.isfile(os.path.join(animal_dir, name)) for name in entry.get("outputs", []))
+
+
+def render_sizes(renderer, svg, sizes):
+    """以指定工具繪製多個尺寸，回傳 {(寬, 高): PNG 位元組}
+
+    外部工具一次只執行一個：建置時每個工作行程各自呼叫，行程池的大小
+    就是同時執行的外部行程數，不會超出 CPU 核心數。
+    """
+    if renderer == NUMPY_RENDERER:
+        return render_png_numpy(svg, sizes)
+    data = svg.encode('utf-8')
+    rendered = render_external(((size, data, *size) for size in sizes), renderer)
+    for result in rendered.values():
+        if isinstance(result, Exception):
+            raise result
+    return rendered
+
+
+def rasterize_animal(animal_id, svg, animal_dir, settings, cache=None):
+    """產生 main.png 與響應式圖片，回傳 (輸出檔名, 實際寫入檔名, 響應式圖片清單, 量化統計)
+
+    有 Pillow 時只以最大寬度繪製一次（SVG 只解析一次），其餘尺寸與格式都由
+    這張圖縮放、編碼而來；否則逐一尺寸繪製（內建點陣化會在同一次呼叫中批次完成）。
+    有 cache（RasterCache）時先查快取，全部命中就完全不點陣化，只編碼缺少的輸出。
+    """
+    aspect = svg_aspect_ratio(svg)
+    targets = [("main.png", PNG_WIDTH, PNG_HEIGHT, "png")]
+    responsive = settings.get("responsive")
+    if responsive:
+        for width in responsive["widths"]:
+            height = round(width * aspect)
+            targets.extend(
+                (f"main-{width}w.{fmt}", width, height, fmt) for fmt in responsive["formats"]
+            )
+
+    derived = bool(responsive and Image is not None)
+    keys, cached = {}, {}
+    if cache is not None:
+        digest = hashlib.sha256(svg.encode('utf-8')).hexdigest()
+        keys = {name: raster_cache_key(digest, width, height, fmt, settings, derived)
+                for name, width, height, fmt in targets}
+        try:
+            cached = cache.get_many(keys.values())
+        except sqlite3.Error as e:  # 快取故障時照常點陣化，不影響建置
+            print(f"⚠️  點陣圖快取讀取失敗，略過: {e}")
+            cache = None
+    missing = [target for target in targets if keys.get(target[0]) not in cached]
+
+    renderer = settings["png"]["renderer"]
+    source = rendered = None
+    if missing and derived:
+        largest = max(targets, key=lambda target: target[1])
+        [source_bytes] = render_sizes(renderer, svg, [largest[1:3]]).values()
+        source = Image.open(io.BytesIO(source_bytes))
+        source.load()
+    elif missing:
+        rendered = render_sizes(renderer, svg,
+                                list(dict.fromkeys((width, height) for _, width, height, _ in missing)))
+
+    quantize = settings.get("quantize")
+    outputs, written, variants, quantized = [], [], [], []
+    fresh = []
+    for name, width, height, fmt in targets:
+        stats = None
+        if keys.get(name) in cached:
+            data, stats = cached[keys[name]]
+        elif source is None:
+            data = rendered[(width, height)]
+        elif source.size == (width, height) and fmt == "png":
+            data = source_bytes
+        else:
+            image = source if source.size == (width, height) else source.resize(
+                (width, height), Image.LANCZOS)
+            data = encode_raster(image, fmt)
+        if quantize and fmt == "png":
+            if stats is None:
+                data, stats = quantize_png(data, quantize["dither"], quantize["max_error"])
+            quantized.append({"name": name, **stats})
+        if cache is not None and keys[name] not in cached:
+            fresh.append((keys[name], data, stats))
+
+        outputs.append(name)
+        if write_if_changed(os.path.join(animal_dir, name), data):
+            written.append(name)
+        if name != "main.png":
+            variants.append({
+                "src": f"{URL_PREFIX}/{animal_id}/{name}",
+                "width": width,
+                "height": height,
+                "format": fmt,
+                "type": RASTER_FORMATS[fmt]["mime"],
+                "bytes": len(data),
+            })
+    if fresh:
+        try:
+            cache.put_many(fresh)
+        except sqlite3.Error as e:
+            print(f"⚠️  點陣圖快取寫入失敗，略過: {e}")
+    return outputs, written, variants, quantized
+
+
+def build_animal(animal_id, svg, output_dir, settings, previous=None, raster_cache=None):
+    """產生單一動物的 main.svg 與各尺寸點陣圖，回傳各階段耗時與輸出檔案
+
+    此函式會在行程池的工作行程中執行，因此只接收可序列化的參數。
+    previous 是上次的建置清單紀錄，啟用視覺差異閘門時用來判斷能否沿用舊的點陣圖；
+    raster_cache 是點陣圖快取的設定 {"path", "max_bytes"}（每個工作行程只連線一次，見 worker_raster_cache）。
+    """
+    started = time.perf_counter()
+    cpu_started = cpu_time()
+    stages = {}
+    animal_dir = os.path.join(output_dir, animal_id)
+
+    # 確保目錄存在
+    os.makedirs(animal_dir, exist_ok=True)
+
+    # 最佳化後寫入 SVG 檔案
+    svg_bytes_before = len(svg.encode('utf-8'))
+    elements_before = count_elements(svg)
+    if settings.get("optimize"):
+        with measure(stages, "optimize") as stage:
+            svg = optimize_svg(svg, settings["optimize"]["max_width"])
+            stage["bytes"] = len(svg.encode('utf-8'))
+    svg_file = os.path.join(animal_dir, "main.svg")
+    outputs = ["main.svg"]
+    written = []
+    variants = []
+    quantized = []
+    with measure(stages, "write_svg") as stage:
+        stage["bytes"] = len(svg.encode('utf-8'))
+        if write_if_changed(svg_file, svg.encode('utf-8')):
+            written.append("main.svg")
+    compression = []
+    if settings.get("precompress"):
+        with measure(stages, "precompress") as stage:
+            compression.append(precompress_file(svg_file, settings["precompress"]))
+            stage["bytes"] = sum(size for encoding, size in compression[0].items()
+                                 if encoding != "original")
+        outputs.extend(f"main.svg.{encoding}" for encoding in compression[0] if encoding != "original")
+    svg_done = time.perf_counter()
+
+    # 畫面與上次幾乎相同時沿用舊的點陣圖，不重新點陣化也不改寫檔案
+    probe = None
+    visual_gate = None
+    if "png" in settings and "probe" in settings:
+        with measure(stages, "probe") as stage:
+            pixels = render_probe(svg, settings["probe"]["width"], settings["probe"]["height"])
+            reused, max_diff, mean_diff = reusable_rasters(previous, pixels, settings, animal_dir)
+            probe = previous["probe"] if reused else encode_probe(pixels)
+            stage["bytes"] = len(probe["data"])
+        visual_gate = {"reused": bool(reused), "max_diff": max_diff, "mean_diff": mean_diff}
+        if reused:
+            visual_gate.update(
+                files=len(reused),
+                bytes=sum(os.path.getsize(os.path.join(animal_dir, name)) for name in reused),
+                seconds=previous.get("raster_seconds", 0.0),
+            )
+
+    # 轉換為 aquarium.json 引用的 main.png 與響應式圖片
+    placeholder = None
+    cache_stats = None
+    if visual_gate and visual_gate["reused"]:
+        outputs.extend(reused)
+        variants = previous.get("variants", [])
+        placeholder = previous.get("placeholder")
+    else:
+        if "png" in settings:
+            with measure(stages, "rasterize") as stage:
+                cache = worker_raster_cache(raster_cache)
+                before = (cache.hits, cache.misses, cache.evicted) if cache is not None else None
+                png_outputs, png_written, variants, quantized = rasterize_animal(
+                    animal_id, svg, animal_dir, settings, cache)
+                if cache is not None:
+                    # 連線由同一行程的多隻動物共用，統計取這次建置的差值
+                    cache_stats = {name: value - start for name, value, start in zip(
+                        ("hits", "misses", "evicted"), (cache.hits, cache.misses, cache.evicted),
+                        before)}
+                stage["bytes"] = sum(os.path.getsize(os.path.join(animal_dir, name))
+                                     for name in png_outputs)
+            outputs.extend(png_outputs)
+            written.extend(png_written)
+        if "placeholder" in settings:
+            with measure(stages, "placeholder") as stage:
+                placeholder = make_placeholder(svg, os.path.join(animal_dir, "main.png"),
+                                               settings["placeholder"]["width"])
+                stage["bytes"] = len(placeholder["thumbnail"])
+    png_done = time.perf_counter()
+    raster_seconds = (visual_gate["seconds"] if visual_gate and visual_gate["reused"] else
+                      sum(stages[name]["wall_seconds"] for name in ("rasterize", "placeholder")
+                          if name in stages))
+
+    return {
+        "id": animal_id,
+        "outputs": outputs,
+        "written": written,
+        "variants": variants,
+        "placeholder": placeholder,
+        "quantized": quantized,
+        "probe": probe,
+        "visual_gate": visual_gate,
+        "raster_seconds": raster_seconds,
+        "raster_cache": cache_stats,
+        "svg_bytes_before": svg_bytes_before,
+        "svg_bytes_after": len(svg.encode('utf-8')),
+        "compression": compression,
+        "elements_before": elements_before,
+        "elements": count_elements(svg),
+        "bytes_written": sum(os.path.getsize(os.path.join(animal_dir, name)) for name in written),
+        "stages": stages,
+        "svg_seconds": svg_done - started,
+        "png_seconds": png_done - svg_done,
+        "wall_seconds": png_done - started,
+        "cpu_seconds": cpu_time() - cpu_started,
+        "peak_rss_bytes": peak_rss_bytes(),
+        "finished_at": time.time(),
+    }
+
+
+def save_variants(output_dir, manifest, animal_ids):
+    """依動物順序寫出響應式圖片清單"""
+    variants = {
+        animal_id: manifest[animal_id].get("variants", [])
+        for animal_id in animal_ids
+        if animal_id in manifest
+    }
+    data = json.dumps(variants, indent=2, ensure_ascii=False) + "\n"
+    path = os.path.join(output_dir, VARIANTS_NAME)
+    return path, write_if_changed(path, data.encode('utf-8'))
+
+
+def generate_images(output_dir=OUTPUT_DIR, jobs=None, rasterize=True, force=False,
+                    widths=RESPONSIVE_WIDTHS, formats=RESPONSIVE_FORMATS, optimize=True,
+                    sprite=False, precompress=False, svgs=None, pool=None, verbose=True,
+                    report=None, metrics=None, profile=None, renderer="auto", data_file=None,
+                    fingerprint=True, fingerprint_grace=FINGERPRINT_GRACE,
+                    atlas=False, atlas_max_size=ATLAS_MAX_SIZE, quantize=None, visual_gate=None,
+                    shard=None, raster_cache=None, raster_cache_size=RASTER_CACHE_MAX_BYTES):
+    """生成所有水族館動物的 SVG 圖片，並以行程池平行轉換為 PNG 與響應式圖片
+
+    輸入（SVG 原始碼與建置設定）的雜湊與上次建置相同的動物會直接略過，
+    不會重寫任何檔案。
+
+    Args:
+        output_dir: 輸出根目錄，每隻動物一個子目錄
+        jobs: 平行工作數，預設為 CPU 核心數
+        rasterize: 是否產生 main.png
+        force: 忽略建置快取，全部重新產生
+        widths: 響應式圖片的寬度階梯，空值表示不產生
+        formats: 響應式圖片的輸出格式（png、webp、avif）
+        optimize: 寫入前是否先最佳化 SVG
+        sprite: 是否另外輸出合併所有動物的 sprite.svg 與 sprite.json
+        precompress: 是否為 SVG 與 JSON 輸出產生 .gz／.br 預先壓縮副本
+        svgs: 預先組好的 {動物 id: SVG}，預設由 ANIMALS 組成
+        pool: 沿用既有的行程池（監看模式），預設建立新的
+        verbose: 是否列出快取命中與建置摘要
+        report: 寫出 JSON 量測報告的路徑（各動物、各階段的耗時、位元組與元素數）
+        metrics: 寫出 Prometheus textfile 指標的路徑
+        profile: 以 cProfile 剖析此動物的建置（一律重新產生，在主行程中執行）
+        renderer: 點陣化工具（auto、rsvg-convert 或 numpy），見 select_renderer
+        data_file: 網站的 aquarium.json，建置後把低畫質預覽寫入各動物的 images.placeholder，
+            並把 images.main／images.story 換成指紋網址；搭配 sprite 時另寫入 images.sprite
+        fingerprint: 是否使用內容指紋檔名（需搭配 data_file）
+        fingerprint_grace: 被取代的指紋檔保留秒數，過期才刪除
+        atlas: 是否把縮圖與動畫影格裝箱成紋理圖集（atlas-<n>.png 與 atlas.json）
+        atlas_max_size: 單張圖集的邊長上限（像素）
+        quantize: {"dither", "max_error"}，把 PNG 轉為 8 位元索引色（失真超過門檻時維持全彩）
+        visual_gate: 視覺差異閘門的門檻（最大單一通道差異），None 表示停用；
+            探針與上次相差不超過門檻時保留舊的點陣圖檔案
+        shard: (第幾片, 總片數)，只建置依繪製成本分到此分片的場景；雪碧圖、圖集與網站資料
+            等彙整型輸出留到 merge_shards 合併後再產生，並在輸出目錄寫出 SHARD_RECORD_NAME
+        raster_cache: 點陣圖快取檔（SQLite）的路徑，None 表示不使用；點陣化前先查快取
+        raster_cache_size: 點陣圖快取的容量上限（位元組），超過時淘汰最久未使用的項目
+
+    Returns:
+        每隻動物的建置紀錄（依 ANIMALS 順序）；快取命中者 cached 為 True，
+        失敗的動物含有 error 欄位
+    """
+    log = print if verbose else (lambda *args, **kwargs: None)
+    log("🎨 開始生成可愛風格的水族館動物圖片...")
+
+    jobs = jobs or os.cpu_count() or 1
+    renderer = select_renderer(renderer) if rasterize else None
+    if rasterize and renderer is None:
+        log(f"⚠️  找不到 {'、'.join(EXTERNAL_RENDERERS)} 也沒有安裝 NumPy，略過 PNG 轉換"
+            "（macOS 可執行 brew install librsvg，或 pip install numpy 使用內建點陣化）")
+        rasterize = False
+    elif renderer == NUMPY_RENDERER:
+        log("🖌️  使用內建的 NumPy 點陣化")
+
+    started = time.perf_counter()
+    encodings = supported_encodings(PRECOMPRESS_ENCODINGS) if precompress else ()
+    if quantize and rasterize and (np is None or Image is None):
+        log("⚠️  調色盤量化需要 NumPy 與 Pillow（pip install numpy pillow），輸出全彩 PNG")
+        quantize = None
+    if visual_gate is not None and rasterize and np is None:
+        log("⚠️  視覺差異閘門需要 NumPy（pip install numpy），一律重新點陣化")
+    settings = render_settings(rasterize, widths, supported_formats(formats) if rasterize else (),
+                               optimize, encodings, renderer, quantize, visual_gate)
+    if raster_cache and rasterize and sqlite3 is None:
+        log("⚠️  這個 Python 沒有 sqlite3 模組，不使用點陣圖快取")
+    cache_config = {"path": raster_cache, "max_bytes": raster_cache_size} \
+        if raster_cache and rasterize and sqlite3 is not None else None
+    manifest = {} if force else load_manifest(output_dir)
+    hashes = {}
+    results = {}
+    pending = []
+    if svgs is None:
+        svgs = {animal_id: scene_svg(data) for animal_id, data in ANIMALS.items()}
+    if shard:
+        index, count = shard
+        costs = shard_costs(svgs)
+        assigned = partition_scenes(costs, count)[index - 1]
+        svgs = {animal_id: svg for animal_id, svg in svgs.items() if animal_id in assigned}
+        log(f"🧩 分片 {index}/{count}: {len(svgs)} 張場景，預估成本 "
+            f"{sum(costs[animal_id] for animal_id in svgs):.2f}/{sum(costs.values()):.2f}")
+        sprite = atlas = False
+        data_file = None
+    if profile is not None and profile not in svgs:
+        raise ValueError(f"找不到要剖析的動物: {profile}")
+    for animal_id, svg in svgs.items():
+        hashes[animal_id] = content_hash(svg, settings)
+        entry = manifest.get(animal_id)
+        if animal_id == profile:
+            continue
+        if is_cache_hit(entry, hashes[animal_id], os.path.join(output_dir, animal_id)):
+            results[animal_id] = {"id": animal_id, "cached": True, "outputs": entry["outputs"]}
+            log(f"⏭️  未變更: {animal_id}")
+        else:
+            pending.append(animal_id)
+
+    executor = contextlib.nullcontext(pool) if pool else ProcessPoolExecutor(max_workers=jobs)
+    with executor as pool:
+        futures = {
+            pool.submit(build_animal, animal_id, svgs[animal_id], output_dir, settings,
+                        manifest.get(animal_id) if "probe" in settings else None,
+                        cache_config): animal_id
+            for animal_id in pending
+        }
+        outcomes = ((futures[future], future.result) for future in as_completed(futures))
+        if profile is not None:
+            # 在主行程中剖析，其他動物仍在工作行程中平行建置
+            outcomes = itertools.chain(
+                [(profile, lambda: profile_animal(profile, svgs[profile], output_dir, settings))],
+                outcomes)
+        for animal_id, get_result in outcomes:
+            try:
+                result = get_result()
+            except (OSError, subprocess.SubprocessError, ValueError, ET.ParseError) as e:
+                # 內建點陣化遇到無法解析的路徑或 XML 時拋出 ValueError／ParseError
+                detail = getattr(e, "stderr", None) or str(e)
+                if isinstance(detail, bytes):
+                    detail = detail.decode("utf-8", "replace").strip()
+                results[animal_id] = {"id": animal_id, "error": detail}
+                manifest.pop(animal_id, None)
+                print(f"❌ 生成失敗: {animal_id} - {detail}")
+                continue
+            results[animal_id] = result
+            manifest[animal_id] = {
+                "hash": hashes[animal_id],
+                "outputs": result["outputs"],
+                "variants": result["variants"],
+            }
+            if result["placeholder"]:
+                manifest[animal_id]["placeholder"] = result["placeholder"]
+            if result["probe"]:
+                manifest[animal_id].update(probe=result["probe"],
+                                           raster_settings=raster_settings(settings),
+                                           raster_seconds=result["raster_seconds"])
+            print(f"✅ 已生成: {animal_id}（{len(result['outputs'])} 個檔案，"
+                  f"{result['wall_seconds']:.2f} 秒）")
+            if optimize:
+                print(f"   🧹 main.svg: "
+                      f"{format_saving(result['svg_bytes_before'], result['svg_bytes_after'])}，"
+                      f"節點 {result['elements_before']} → {result['elements']}")
+            if result["quantized"]:
+                stats = result["quantized"]
+                indexed = [item["name"] for item in stats if item["indexed"]]
+                print(f"   🎨 PNG 量化: "
+                      f"{format_saving(sum(i['before'] for i in stats), sum(i['after'] for i in stats))}"
+                      f"（索引色 {len(indexed)}/{len(stats)}，最大 ΔE {max(i['error'] for i in stats):.2f}）")
+            gate = result["visual_gate"]
+            if gate and gate["reused"]:
+                print(f"   👁️  畫面沒有可察覺的變化（最大差異 {gate['max_diff']}），"
+                      f"保留 {gate['files']} 個點陣圖檔案")
+            elif gate and gate["max_diff"] is not None:
+                print(f"   👁️  畫面已變更（最大差異 {gate['max_diff']}，"
+                      f"平均 {gate['mean_diff']:.2f}），重新點陣化")
+    elapsed = time.perf_counter() - started
+
+    aggregate = {}
+    with measure(aggregate, "aggregate") as stage:
+        # 移除已不存在的動物的舊紀錄
+        for animal_id in list(manifest):
+            if animal_id not in svgs:
+                del manifest[animal_id]
+        save_manifest(output_dir, manifest)
+        text_outputs = [save_variants(output_dir, manifest, svgs)]
+        fragments = None
+        if sprite:
+            written, fragments = generate_sprite(output_dir, svgs)
+            text_outputs.extend(written)
+        if atlas and rasterize:
+            text_outputs.extend((path, changed) for path, changed in generate_atlas(
+                output_dir, svgs, atlas_max_size, verbose=verbose) if path.endswith(".json"))
+        if data_file:
+            (path, changed), removed = publish_animal_data(
+                data_file, output_dir, manifest, svgs, fingerprint, fingerprint_grace, fragments)
+            if changed:
+                log(f"🗂️  已更新網站資料: {path}")
+            if removed:
+                log(f"🗑️  已清除 {len(removed)} 個過期的指紋檔")
+            if fragments and fingerprint:
+                # 網站引用的是指紋版雪碧圖（內容與 sprite.svg 相同），同樣需要壓縮副本
+                url = fingerprint_url(f"{URL_PREFIX}/{SPRITE_NAME}", output_dir)
+                text_outputs.append((os.path.join(output_dir, url[len(URL_PREFIX) + 1:]),
+                                     written[0][1]))
+
+        # 彙整型輸出只在內容改變（或尚無壓縮副本）時重新壓縮
+        compression = [sizes for r in results.values() for sizes in r.get("compression", [])]
+        for path, changed in text_outputs:
+            if encodings and (changed or force or not all(
+                    os.path.exists(f"{path}.{encoding}") for encoding in encodings)):
+                compression.append(precompress_file(path, encodings))
+        stage["bytes"] = sum(os.path.getsize(path) for path, changed in text_outputs if changed)
+
+    ordered = [results[animal_id] for animal_id in svgs]
+    built = [r for r in ordered if "wall_seconds" in r]
+    failed = [r for r in ordered if "error" in r]
+    hits = len(svgs) - len(pending)
+    serial = sum(r["wall_seconds"] for r in built)
+
+    log(f"\n🎉 完成！共 {len(svgs) - len(failed)}/{len(svgs)} 隻可愛的水族館動物圖片")
+    log(f"♻️  建置快取: 命中 {hits}、重新產生 {len(built)}、失敗 {len(failed)}"
+        f"（實際寫入 {sum(len(r['written']) for r in built)} 個檔案）")
+    log(f"📁 圖片位置: {output_dir}")
+    if optimize and built:
+        before = sum(r["svg_bytes_before"] for r in built)
+        after = sum(r["svg_bytes_after"] for r in built)
+        log(f"🧹 SVG 最佳化: {format_saving(before, after)}，節點 "
+            f"{sum(r['elements_before'] for r in built)} → {sum(r['elements'] for r in built)}")
+    quantized = [item for r in built for item in r.get("quantized", [])]
+    if quantized:
+        log(f"🎨 PNG 量化: {format_saving(sum(i['before'] for i in quantized), sum(i['after'] for i in quantized))}"
+            f"（{sum(i['indexed'] for i in quantized)}/{len(quantized)} 張改用索引色）")
+    gated = [r["visual_gate"] for r in built if r.get("visual_gate")]
+    if gated:
+        reused = [gate for gate in gated if gate["reused"]]
+        log(f"👁️  視覺差異閘門: {len(reused)}/{len(gated)} 隻動物沿用舊點陣圖，"
+            f"略過 {sum(g['files'] for g in reused)} 個檔案的改寫與上傳"
+            f"（{sum(g['bytes'] for g in reused) / 1024:.1f} KB），"
+            f"省下約 {sum(g['seconds'] for g in reused):.2f} 秒點陣化")
+    cache_stats = [r["raster_cache"] for r in built if r.get("raster_cache")]
+    if cache_stats:
+        hits = sum(stats["hits"] for stats in cache_stats)
+        lookups = hits + sum(stats["misses"] for stats in cache_stats)
+        cache = open_raster_cache(cache_config)
+        if cache is not None:
+            with cache:
+                total = cache.stats()
+            log(f"🗄️  點陣圖快取: 命中 {hits}/{lookups}（{hits / lookups:.0%}）、"
+                f"淘汰 {sum(stats['evicted'] for stats in cache_stats)}，"
+                f"目前 {total['entries']} 筆 {total['bytes'] / 1048576:.1f}/"
+                f"{total['max_bytes'] / 1048576:.1f} MB（{total['path']}）")
+    if compression:
+        log(f"🗜️  預先壓縮 {len(compression)} 個檔案: {format_compression(compression)}")
+    if "responsive" in settings:
+        responsive = settings["responsive"]
+        log(f"🖼️  響應式圖片: {', '.join(map(str, responsive['widths']))}w × "
+            f"{', '.join(responsive['formats'])}，清單見 {VARIANTS_NAME}")
+    if built:
+        log(f"⏱️  總耗時 {elapsed:.2f} 秒（{jobs} 個工作行程，逐一累計 {serial:.2f} 秒，"
+            f"加速 {serial / elapsed if elapsed else 0:.1f} 倍）")
+        slowest = sorted(built, key=lambda r: r["wall_seconds"], reverse=True)[:3]
+        log("🐢 最慢: " + "、".join(
+            f"{r['id']} {r['wall_seconds']:.2f} 秒（{dominant_stage(r)}）" for r in slowest))
+
+    if report or metrics or shard:
+        build_report = make_report(ordered, settings, output_dir, jobs, elapsed, aggregate)
+        if report:
+            data = json.dumps(build_report, indent=2, ensure_ascii=False) + "\n"
+            write_if_changed(report, data.encode('utf-8'))
+            log(f"📝 量測報告: {report}")
+        if metrics:
+            write_if_changed(metrics, prometheus_metrics(build_report).encode('utf-8'))
+            log(f"📈 Prometheus 指標: {metrics}")
+        if shard:
+            record = {"shard": list(shard), "scenes": list(svgs),
+                      "estimated_cost": sum(costs[animal_id] for animal_id in svgs),
+                      "settings": settings, "report": build_report}
+            data = json.dumps(record, indent=2, ensure_ascii=False) + "\n"
+            write_if_changed(os.path.join(output_dir, SHARD_RECORD_NAME), data.encode('utf-8'))
+            log(f"🧩 分片紀錄: {os.path.join(output_dir, SHARD_RECORD_NAME)}")
+    return ordered
+
+
+def profile_animal(animal_id, svg, output_dir, settings, path=None):
+    """在主行程中以 cProfile 剖析單一動物的建置，存檔並列出最耗時的函式"""
+    path = path or f"profile-{animal_id}.prof"
+    profiler = cProfile.Profile()
+    result = profiler.runcall(build_animal, animal_id, svg, output_dir, settings)
+    profiler.dump_stats(path)
+    print(f"🔬 {animal_id} 的剖析結果已存到 {path}（可用 python3 -m pstats 或 snakeviz 檢視）")
+    pstats.Stats(profiler).sort_stats("cumulative").print_stats(PROFILE_TOP)
+    return result
+
+
+def merge_shards(shard_dirs, output_dir=OUTPUT_DIR, report=None, verbose=True, **options):
+    """把各分片的輸出合併到 output_dir，再產生雪碧圖、圖集與網站資料等彙整型輸出
+
+    各分片的檔案依建置清單逐一複製（內容相同時不改寫），建置清單合併後
+    以相同選項執行 generate_images：所有場景都是快取命中，只產生彙整型輸出。
+    options 與 generate_images 相同，必須和分片建置時一致。
+
+    Returns:
+        generate_images 的結果；快取沒有命中的場景代表選項與分片建置時不同
+    """
+    log = print if verbose else (lambda *args, **kwargs: None)
+    started = time.perf_counter()
+    records = load_shard_records(shard_dirs)
+    manifest = {}
+    copied = written = size = 0
+    for shard_dir, record in records:
+        shard_manifest = load_manifest(shard_dir)
+        for scene_id in record["scenes"]:
+            entry = shard_manifest.get(scene_id)
+            if entry is None:  # 此場景在分片中建置失敗
+                continue
+            os.makedirs(os.path.join(output_dir, scene_id), exist_ok=True)
+            for name in entry["outputs"]:
+                try:
+                    with open(os.path.join(shard_dir, scene_id, name), 'rb') as f:
+                        data = f.read()
+                except FileNotFoundError:
+                    raise ValueError(f"分片 {shard_dir} 缺少輸出檔: {scene_id}/{name}") from None
+                copied += 1
+                size += len(data)
+                written += write_if_changed(os.path.join(output_dir, scene_id, name), data)
+            manifest[scene_id] = entry
+        index, count = record["shard"]
+        summary = record["report"]["summary"]
+        log(f"🧩 分片 {index}/{count}: {len(record['scenes'])} 張場景，預估成本 "
+            f"{record['estimated_cost']:.2f}，建置 {summary['wall_seconds']:.2f} 秒")
+    previous = load_manifest(output_dir)
+    save_manifest(output_dir, {**previous, **manifest})
+    log(f"📦 已合併 {len(records)} 個分片: {copied} 個檔案（{size / 1024:.1f} KB），"
+        f"實際寫入 {written} 個")
+
+    results = generate_images(output_dir, verbose=verbose, **options)
+    rebuilt = [r["id"] for r in results if "wall_seconds" in r]
+    if rebuilt:
+        log(f"⚠️  {len(rebuilt)} 張場景與分片的建置設定不同而重新產生: {', '.join(rebuilt)}")
+    if report:
+        merged = merge_reports([record["report"] for _, record in records], list(ANIMALS))
+        merged["merge"] = {
+            "shards": [{"shard": record["shard"], "scenes": record["scenes"],
+                        "estimated_cost": record["estimated_cost"],
+                        "wall_seconds": record["report"]["summary"]["wall_seconds"]}
+                       for _, record in records],
+            "files_copied": copied,
+            "files_written": written,
+            "bytes_copied": size,
+            "rebuilt": rebuilt,
+            "seconds": time.perf_counter() - started,
+        }
+        data = json.dumps(merged, indent=2, ensure_ascii=False) + "\n"
+        write_if_changed(report, data.encode('utf-8'))
+        log(f"📝 合併後的量測報告: {report}")
+    return results
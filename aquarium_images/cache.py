@@ -0,0 +1,195 @@
+"""點陣圖快取：跨建置、跨分支共用的內容定址儲存（SQLite）
+
+以 (SVG 雜湊, 尺寸, 格式, 點陣化工具與版本, 編碼設定) 為鍵保存最終輸出的位元組，
+新的 checkout、其他分支或 CI 工作遇到相同內容時直接取用，不再點陣化。
+儲存在單一 SQLite 檔（WAL 模式），每個工作行程各自連線一次並重複使用，由 SQLite
+的鎖保證多行程同時讀寫的一致性：查詢在一般（deferred）交易中讀取，不會互相等待，
+只有寫入才取得寫入鎖。目前的總大小記在 stats 表的 bytes 列，與資料在同一個交易中
+更新；超過容量上限時淘汰最久未使用的項目。
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import time
+
+try:
+    import sqlite3
+except ImportError:  # 部分精簡版 Python 沒有 sqlite3，缺少時不使用點陣圖快取
+    sqlite3 = None
+
+from .common import (
+    RASTER_CACHE_LOW_WATER, RASTER_CACHE_MAX_BYTES, RASTER_CACHE_PATH, RASTER_CACHE_VERSION,
+)
+
+
+def raster_cache_key(svg_digest, width, height, fmt, settings, derived):
+    """點陣圖快取的鍵；derived 表示由最大尺寸縮放而來（與直接繪製的位元組不同）"""
+    parts = {
+        "version": RASTER_CACHE_VERSION,
+        "svg": svg_digest,
+        "size": [width, height],
+        "format": fmt,
+        "renderer": settings["png"],
+        "derived": derived,
+    }
+    if fmt == "png" and "quantize" in settings:
+        parts["quantize"] = settings["quantize"]
+    if "responsive" in settings:
+        parts["encoder"] = settings["responsive"]["encoder"]
+        parts["options"] = settings["responsive"]["options"].get(fmt)
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class RasterCache:
+    """內容定址的點陣圖快取，可由多個行程同時使用
+
+    hits、misses、evicted 記錄此連線的統計，累計統計存在快取檔中（見 stats）。
+    """
+    __slots__ = ("path", "max_bytes", "connection", "hits", "misses", "evicted")
+
+    def __init__(self, path=RASTER_CACHE_PATH, max_bytes=RASTER_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = self.misses = self.evicted = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # isolation_level=None：自行以 BEGIN IMMEDIATE 控制交易，避免兩個行程同時升級寫入鎖而死結
+        self.connection = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self._transaction() as db:
+            db.execute("CREATE TABLE IF NOT EXISTS rasters (key TEXT PRIMARY KEY, data BLOB NOT NULL, "
+                       "meta TEXT, size INTEGER NOT NULL, last_used REAL NOT NULL)")
+            db.execute("CREATE INDEX IF NOT EXISTS rasters_last_used ON rasters (last_used)")
+            db.execute("CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            # 舊的快取檔沒有總大小列時只計算一次
+            if db.execute("SELECT 1 FROM stats WHERE name = 'bytes'").fetchone() is None:
+                (total,) = db.execute("SELECT COALESCE(SUM(size), 0) FROM rasters").fetchone()
+                db.execute("INSERT INTO stats VALUES ('bytes', ?)", (total,))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @contextlib.contextmanager
+    def _transaction(self, write=True):
+        """write=True 時一開始就取得寫入鎖；唯讀交易用 deferred，WAL 模式下讀取不會互相阻擋"""
+        self.connection.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+        try:
+            yield self.connection
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        self.connection.execute("COMMIT")
+
+    def _count(self, db, name, amount):
+        if amount:
+            db.execute("INSERT INTO stats VALUES (?, ?) "
+                       "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value", (name, amount))
+
+    def get_many(self, keys):
+        """取出多筆快取，回傳 {鍵: (位元組, 附加資訊)}；命中的項目更新最近使用時間"""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        with self._transaction(write=False) as db:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = db.execute(f"SELECT key, data, meta FROM rasters WHERE key IN "
+                                  f"({','.join('?' * len(chunk))})", chunk)
+                found.update((key, (data, json.loads(meta) if meta else None))
+                             for key, data, meta in rows)
+        # 最近使用時間與統計只是簿記，在讀取之後以很短的寫入交易更新
+        with self._transaction() as db:
+            now = time.time()
+            db.executemany("UPDATE rasters SET last_used = ? WHERE key = ?",
+                           [(now, key) for key in found])
+            self._count(db, "hits", len(found))
+            self._count(db, "misses", len(keys) - len(found))
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items):
+        """存入多筆 (鍵, 位元組, 附加資訊)，超過容量上限時淘汰最久未使用的項目"""
+        items = list({key: (key, data, meta) for key, data, meta in items}.values())
+        if not items:
+            return
+        now = time.time()
+        with self._transaction() as db:
+            # 取代既有項目時扣掉舊的大小，總大小才與資料一致
+            replaced = 0
+            for start in range(0, len(items), 500):
+                chunk = [key for key, _, _ in items[start:start + 500]]
+                (size,) = db.execute(f"SELECT COALESCE(SUM(size), 0) FROM rasters WHERE key IN "
+                                     f"({','.join('?' * len(chunk))})", chunk).fetchone()
+                replaced += size
+            db.executemany(
+                "INSERT OR REPLACE INTO rasters VALUES (?, ?, ?, ?, ?)",
+                [(key, data, json.dumps(meta) if meta is not None else None, len(data), now)
+                 for key, data, meta in items])
+            self._count(db, "stored", len(items))
+            self._count(db, "bytes", sum(len(data) for _, data, _ in items) - replaced)
+            (total,) = db.execute("SELECT value FROM stats WHERE name = 'bytes'").fetchone()
+            if total > self.max_bytes:
+                evicted, freed = self._evict(db, total - int(self.max_bytes * RASTER_CACHE_LOW_WATER))
+                self._count(db, "evictions", evicted)
+                self._count(db, "bytes", -freed)
+                self.evicted += evicted
+
+    @staticmethod
+    def _evict(db, excess):
+        """由最久未使用的項目開始刪除，直到釋出 excess 位元組；回傳 (刪除筆數, 釋出位元組)"""
+        victims, freed = [], 0
+        for key, size in db.execute("SELECT key, size FROM rasters ORDER BY last_used, key"):
+            if freed >= excess:
+                break
+            victims.append((key,))
+            freed += size
+        db.executemany("DELETE FROM rasters WHERE key = ?", victims)
+        return len(victims), freed
+
+    def stats(self):
+        """快取的累計統計與目前大小"""
+        db = self.connection
+        (entries,) = db.execute("SELECT COUNT(*) FROM rasters").fetchone()
+        totals = dict(db.execute("SELECT name, value FROM stats"))
+        return {
+            "path": self.path,
+            "entries": entries,
+            "bytes": totals.get("bytes", 0),
+            "max_bytes": self.max_bytes,
+            **{name: totals.get(name, 0) for name in ("hits", "misses", "stored", "evictions")},
+        }
+
+    def close(self):
+        self.connection.close()
+
+
+def open_raster_cache(config):
+    """依 {"path", "max_bytes"} 開啟快取；未設定、沒有 sqlite3 或無法開啟時回傳 None"""
+    if not config or sqlite3 is None:
+        return None
+    try:
+        return RasterCache(config["path"], config["max_bytes"])
+    except (OSError, sqlite3.Error) as e:
+        print(f"⚠️  無法開啟點陣圖快取 {config['path']}: {e}")
+        return None
+
+
+_worker_caches = {}
+
+
+def worker_raster_cache(config):
+    """工作行程共用的快取連線：每個行程、每個快取檔只開啟一次（建表也只執行一次）
+
+    以行程 id 區分，fork 出的子行程不會沿用父行程的連線。
+    """
+    if not config or sqlite3 is None:
+        return None
+    key = (os.getpid(), config["path"], config["max_bytes"])
+    if key not in _worker_caches:
+        _worker_caches[key] = open_raster_cache(config)
+    return _worker_caches[key]
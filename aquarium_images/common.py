@@ -0,0 +1,154 @@
+"""共用設定：輸出路徑、各階段的常數與版本，以及寫檔的小工具
+
+各模組只從這裡取用常數，調整建置行為時集中修改本檔即可。
+"""
+
+import os
+
+# 儲存庫根目錄與本套件所在目錄
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(PACKAGE_DIR)
+
+# 輸出目錄（相對於儲存庫根目錄）
+IMAGES_DIR = os.path.join(ROOT_DIR, "StoryBook", "wwwroot", "images")
+OUTPUT_DIR = os.path.join(IMAGES_DIR, "aquarium")
+
+# 網站的動物資料：建置後把低畫質預覽寫回各動物的 images 物件
+ANIMAL_DATA = os.path.join(os.path.dirname(IMAGES_DIR), "data", "aquarium.json")
+
+# PNG 點陣化設定（aquarium.json 引用的 main.png 尺寸）
+PNG_WIDTH = 800
+PNG_HEIGHT = 600
+RSVG_CONVERT = "rsvg-convert"
+RESVG = "resvg"
+INKSCAPE = "inkscape"
+
+# 外部點陣化工具的命令列：SVG 由 stdin 傳入、PNG 由 stdout 讀回（不產生暫存檔）
+EXTERNAL_RENDERERS = {
+    RSVG_CONVERT: [RSVG_CONVERT, "-w", "{width}", "-h", "{height}", "-f", "png"],
+    RESVG: [RESVG, "-w", "{width}", "-h", "{height}", "-c", "-"],
+    INKSCAPE: [INKSCAPE, "--pipe", "--export-type=png", "--export-filename=-",
+               "-w", "{width}", "-h", "{height}"],
+}
+
+# 外部工具單次執行的逾時（秒）、失敗後的重試次數與第一次重試前的等待（秒，之後逐次加倍）
+RENDER_TIMEOUT = 60
+RENDER_RETRIES = 2
+RENDER_RETRY_DELAY = 0.5
+
+# 內建點陣化（沒有外部工具時使用）；繪製結果改變時遞增版本讓快取失效
+NUMPY_RENDERER = "numpy"
+NUMPY_RENDERER_VERSION = 3
+RENDERERS = (RSVG_CONVERT, RESVG, INKSCAPE, NUMPY_RENDERER)
+
+# 低畫質預覽（LQIP）：縮圖寬度（高度依 main.png 比例）；產生方式改變時遞增版本
+PLACEHOLDER_WIDTH = 16
+PLACEHOLDER_VERSION = 2
+
+# 指紋檔名：雜湊長度、舊指紋保留的寬限期（秒），以及記錄本工具寫出的指紋檔與
+# 被取代時間的檔案（格式改變時遞增版本）
+FINGERPRINT_LENGTH = 10
+FINGERPRINT_GRACE = 7 * 24 * 3600
+FINGERPRINT_STATE_NAME = ".fingerprints.json"
+FINGERPRINT_STATE_VERSION = 2
+
+# 調色盤量化：有序抖色強度、可接受的平均 ΔE、k-means 迭代次數與距離計算的分塊大小；
+# 量化結果改變時遞增版本讓快取失效
+QUANTIZE_DITHER = 0.5
+QUANTIZE_MAX_ERROR = 1.5
+QUANTIZE_ITERATIONS = 4
+QUANTIZE_CHUNK = 16384
+QUANTIZE_VERSION = 1
+
+# 視覺差異閘門：探針解析度、視為「沒有變化」的最大單一通道差異（0–255）；
+# 探針繪製方式改變時遞增版本，讓舊指紋失效
+PROBE_WIDTH = 80
+PROBE_HEIGHT = 60
+PROBE_MAX_DIFF = 2
+PROBE_VERSION = 1
+
+# 響應式圖片：寬度階梯與輸出格式（同一次解析產生所有尺寸）
+RESPONSIVE_WIDTHS = (400, 800, 1600)
+RESPONSIVE_FORMATS = ("png", "webp", "avif")
+RASTER_FORMATS = {
+    "png": {"mime": "image/png", "pillow": "PNG", "options": {"optimize": True}},
+    "webp": {"mime": "image/webp", "pillow": "WEBP", "options": {"quality": 85, "method": 6}},
+    "avif": {"mime": "image/avif", "pillow": "AVIF", "options": {"quality": 60}},
+}
+
+# 網站上的圖片路徑前綴（對應 aquarium.json 的 images.main）
+URL_PREFIX = "/images/aquarium"
+
+# 建置快取清單：記錄每隻動物上次建置的輸入雜湊與輸出檔案
+MANIFEST_NAME = ".build-manifest.json"
+
+# 分片建置：每個分片輸出目錄中記錄分到的場景、建置設定與量測報告的檔案
+SHARD_RECORD_NAME = ".shard.json"
+
+# 點陣圖快取：跨建置、跨分支共用的內容定址儲存（SQLite），容量上限與淘汰後保留的比例；
+# 快取內容的格式或鍵的組成改變時遞增版本
+RASTER_CACHE_PATH = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "storybook", "rasters.sqlite",
+)
+RASTER_CACHE_MAX_BYTES = 512 * 1024 * 1024
+RASTER_CACHE_LOW_WATER = 0.9
+RASTER_CACHE_VERSION = 1
+
+# 響應式圖片清單：供網站組成 srcset
+VARIANTS_NAME = "variants.json"
+
+# 預先壓縮：為 SVG 與 JSON 輸出產生 .gz／.br 副本，讓伺服器直接送出壓縮後的檔案
+PRECOMPRESS_ENCODINGS = ("gz", "br")
+
+# 雪碧圖：所有動物合併為一個 <symbol> SVG，以及 id → 片段對照表
+SPRITE_NAME = "sprite.svg"
+SPRITE_MAP_NAME = "sprite.json"
+
+# 紋理圖集：縮圖與動畫影格合併後的檔名前綴、座標表、單張圖集的邊長上限、
+# 影格間距與縮圖寬度（像素）
+ATLAS_NAME = "atlas"
+ATLAS_MAP_NAME = "atlas.json"
+ATLAS_MAX_SIZE = 2048
+ATLAS_PADDING = 2
+ATLAS_THUMB_WIDTH = 160
+
+# 監看模式：產生器本身的原始檔（本套件各模組與命令列入口，改變時重新啟動）、
+# 輪詢間隔與連續存檔的合併時間（秒）
+GENERATOR_SOURCES = tuple(sorted(
+    os.path.join(PACKAGE_DIR, name) for name in os.listdir(PACKAGE_DIR) if name.endswith(".py")
+)) + (os.path.join(ROOT_DIR, "generate_aquarium_images.py"),)
+WATCH_POLL_INTERVAL = 0.05
+WATCH_DEBOUNCE = 0.1
+
+# 場景目錄：每個收藏一個子目錄，內含索引與各場景的前景 SVG
+SCENES_DIR = os.path.join(ROOT_DIR, "scenes")
+CATALOG_INDEX_NAME = "index.json"
+
+# 故事插圖變體：預設種子、每個工作批次的張數，以及記錄參數的索引檔
+STORY_VARIANT_SEED = 20240316
+STORY_VARIANT_BATCH = 50
+STORY_VARIANTS_DIR = os.path.join(IMAGES_DIR, "aquarium-stories")
+STORY_VARIANTS_INDEX = "index.json"
+
+# 串流寫出大型場景時的檔案緩衝區大小（bytes）
+STREAM_BUFFER_SIZE = 64 * 1024
+
+# 量測報告：Prometheus 指標名稱前綴與剖析結果列出的函式數
+METRICS_PREFIX = "storybook_aquarium"
+PROFILE_TOP = 15
+
+
+def write_if_changed(path, data):
+    """只在內容不同時寫入檔案，保留相同檔案的修改時間；回傳是否有寫入"""
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return True
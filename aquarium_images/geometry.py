@@ -0,0 +1,242 @@
+"""路徑、變換與顏色的解析：SVG 路徑展平為折線、transform 轉為矩陣
+
+內建點陣化、幾何最佳化與繪製成本分析共用同一套解析，三者對路徑的理解才會一致。
+"""
+
+import math
+import re
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 為選用套件，缺少時 parse_transform 無法使用
+    np = None
+
+from .svg import NAMED_COLORS, NUMBER_RE
+
+PATH_COMMAND_RE = re.compile(r"[MmLlHhVvCcSsQqTtAaZz]")
+PATH_ARITY = {"M": 2, "L": 2, "H": 1, "V": 1, "C": 6, "S": 4, "Q": 4, "T": 2, "A": 7, "Z": 0}
+SEPARATOR_RE = re.compile(r"[\s,]*")
+FLAG_RE = re.compile(r"[01]")
+TRANSFORM_RE = re.compile(r"(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)")
+
+
+def _affine(a, b, c, d, e, f):
+    return np.array([[a, c, e], [b, d, f], [0.0, 0.0, 1.0]])
+
+
+def parse_transform(value):
+    """把 transform 屬性轉為 3×3 矩陣"""
+    matrix = np.eye(3)
+    for name, args in TRANSFORM_RE.findall(value or ""):
+        v = [float(n) for n in NUMBER_RE.findall(args)]
+        if name == "matrix" and len(v) == 6:
+            step = _affine(*v)
+        elif name == "translate" and v:
+            step = _affine(1, 0, 0, 1, v[0], v[1] if len(v) > 1 else 0)
+        elif name == "scale" and v:
+            step = _affine(v[0], 0, 0, v[1] if len(v) > 1 else v[0], 0, 0)
+        elif name == "rotate" and v:
+            angle = math.radians(v[0])
+            step = _affine(math.cos(angle), math.sin(angle), -math.sin(angle), math.cos(angle), 0, 0)
+            if len(v) == 3:
+                step = _affine(1, 0, 0, 1, v[1], v[2]) @ step @ _affine(1, 0, 0, 1, -v[1], -v[2])
+        elif name == "skewX" and v:
+            step = _affine(1, 0, math.tan(math.radians(v[0])), 1, 0, 0)
+        elif name == "skewY" and v:
+            step = _affine(1, math.tan(math.radians(v[0])), 0, 1, 0, 0)
+        else:
+            continue
+        matrix = matrix @ step
+    return matrix
+
+
+def parse_color(value):
+    """解析顏色為 (r, g, b, a)（0–1）；none、currentColor 等無法繪製的值回傳 None"""
+    value = value.strip().lower()
+    value = NAMED_COLORS.get(value, value)
+    if value == "transparent":
+        return (0.0, 0.0, 0.0, 0.0)
+    if value.startswith("#"):
+        digits = value[1:]
+        if len(digits) in (3, 4):
+            digits = "".join(digit * 2 for digit in digits)
+        if len(digits) in (6, 8):
+            channels = [int(digits[i:i + 2], 16) / 255 for i in range(0, len(digits), 2)]
+            return tuple(channels) + (1.0,) * (4 - len(channels))
+        return None
+    match = re.fullmatch(r"rgba?\(([^)]*)\)", value)
+    if match:
+        parts = [part.strip() for part in match.group(1).split(",")]
+        rgb = [float(p[:-1]) / 100 if p.endswith("%") else float(p) / 255 for p in parts[:3]]
+        return (*rgb, float(parts[3]) if len(parts) > 3 else 1.0)
+    return None
+
+
+def _length(value, reference=0.0):
+    """解析長度；百分比相對於 reference"""
+    if isinstance(value, str):
+        value = value.strip()
+        if value.endswith("%"):
+            return float(value[:-1]) * reference / 100
+        try:
+            return float(value)
+        except ValueError:
+            return 0.0
+    return float(value)
+
+
+def _steps(count):
+    """曲線展平的參數 t（不含起點）"""
+    count = max(1, count)
+    return [i / count for i in range(1, count + 1)]
+
+
+def _quadratic(p0, p1, p2, tolerance):
+    deviation = math.hypot(p0[0] - 2 * p1[0] + p2[0], p0[1] - 2 * p1[1] + p2[1])
+    return [[(1 - t) ** 2 * p0[0] + 2 * (1 - t) * t * p1[0] + t * t * p2[0],
+             (1 - t) ** 2 * p0[1] + 2 * (1 - t) * t * p1[1] + t * t * p2[1]]
+            for t in _steps(math.ceil(math.sqrt(deviation / tolerance)))]
+
+
+def _cubic(p0, p1, p2, p3, tolerance):
+    deviation = max(math.hypot(p0[0] - 2 * p1[0] + p2[0], p0[1] - 2 * p1[1] + p2[1]),
+                    math.hypot(p1[0] - 2 * p2[0] + p3[0], p1[1] - 2 * p2[1] + p3[1]))
+    return [[(1 - t) ** 3 * p0[0] + 3 * (1 - t) ** 2 * t * p1[0]
+             + 3 * (1 - t) * t * t * p2[0] + t ** 3 * p3[0],
+             (1 - t) ** 3 * p0[1] + 3 * (1 - t) ** 2 * t * p1[1]
+             + 3 * (1 - t) * t * t * p2[1] + t ** 3 * p3[1]]
+            for t in _steps(math.ceil(math.sqrt(1.5 * deviation / tolerance)))]
+
+
+def _arc(p0, rx, ry, angle, large, sweep, p1, tolerance):
+    """以中心參數法展平橢圓弧（SVG 規格 F.6.5）"""
+    rx, ry = abs(rx), abs(ry)
+    if not rx or not ry or p0 == p1:
+        return [p1]
+    phi = math.radians(angle)
+    cos, sin = math.cos(phi), math.sin(phi)
+    dx, dy = (p0[0] - p1[0]) / 2, (p0[1] - p1[1]) / 2
+    x1, y1 = cos * dx + sin * dy, -sin * dx + cos * dy
+    scale = (x1 / rx) ** 2 + (y1 / ry) ** 2
+    if scale > 1:
+        rx, ry = rx * math.sqrt(scale), ry * math.sqrt(scale)
+    numerator = max(0.0, rx * rx * ry * ry - rx * rx * y1 * y1 - ry * ry * x1 * x1)
+    factor = math.sqrt(numerator / (rx * rx * y1 * y1 + ry * ry * x1 * x1))
+    if large == sweep:
+        factor = -factor
+    cx1, cy1 = factor * rx * y1 / ry, -factor * ry * x1 / rx
+    cx = cos * cx1 - sin * cy1 + (p0[0] + p1[0]) / 2
+    cy = sin * cx1 + cos * cy1 + (p0[1] + p1[1]) / 2
+    start = math.atan2((y1 - cy1) / ry, (x1 - cx1) / rx)
+    delta = math.atan2((-y1 - cy1) / ry, (-x1 - cx1) / rx) - start
+    if sweep and delta < 0:
+        delta += 2 * math.pi
+    elif not sweep and delta > 0:
+        delta -= 2 * math.pi
+    # 頂點放在放大後的橢圓上，讓每段弦在真實曲線內外各偏離弦高的一半（不超過
+    # tolerance），面積才不會系統性變小；兩端以徑向短線接回真實端點，路徑仍然相連
+    step = 2 * math.acos(max(-1.0, 1 - 2 * tolerance / max(rx, ry)))
+    count = math.ceil(abs(delta) / max(step, 1e-3))
+    outward = 2 / (1 + math.cos(abs(delta) / count / 2))
+    points = []
+    for t in [0.0] + _steps(count):
+        x = outward * rx * math.cos(start + t * delta)
+        y = outward * ry * math.sin(start + t * delta)
+        points.append([cos * x - sin * y + cx, sin * x + cos * y + cy])
+    points.append(list(p1))
+    return points
+
+
+def _path_commands(d):
+    """逐一取出路徑指令與參數（旗標參數可不加分隔，例如 a5 5 0 011 1）"""
+    pos, command = 0, None
+    while True:
+        pos = SEPARATOR_RE.match(d, pos).end()
+        if pos >= len(d):
+            return
+        match = PATH_COMMAND_RE.match(d, pos)
+        if match:
+            command = match.group()
+            pos = match.end()
+            if command in "Zz":
+                yield command, []
+                continue
+        elif command is None or command in "Zz":
+            raise ValueError(f"invalid path data: {d[pos:pos + 20]!r}")
+        args = []
+        for index in range(PATH_ARITY[command.upper()]):
+            pos = SEPARATOR_RE.match(d, pos).end()
+            pattern = FLAG_RE if command in "Aa" and index in (3, 4) else NUMBER_RE
+            number = pattern.match(d, pos)
+            if not number:
+                raise ValueError(f"invalid path data: {d[pos:pos + 20]!r}")
+            args.append(float(number.group()))
+            pos = number.end()
+        yield command, args
+        if command == "M":
+            command = "L"
+        elif command == "m":
+            command = "l"
+
+
+def flatten_path(d, tolerance):
+    """把路徑展平為 [([[x, y], ...], 是否封閉)]（純 Python，成本分析也會用到）"""
+    subpaths, points = [], []
+    current = start = (0.0, 0.0)
+    control, previous = None, ""
+    for command, args in _path_commands(d):
+        upper = command.upper()
+        relative = command != upper and upper not in ("Z", "A")
+        ox, oy = current if relative else (0.0, 0.0)
+        if upper == "M":
+            if len(points) > 1:
+                subpaths.append((points, False))
+            current = start = (args[0] + ox, args[1] + oy)
+            points = [list(current)]
+        elif upper == "Z":
+            if points:
+                subpaths.append((points, True))
+            points = [list(start)]
+            current = start
+        else:
+            if not points:
+                points = [list(current)]
+            if upper == "L":
+                target = (args[0] + ox, args[1] + oy)
+                points.append(list(target))
+            elif upper == "H":
+                target = (args[0] + ox, current[1])
+                points.append(list(target))
+            elif upper == "V":
+                target = (current[0], args[0] + (current[1] if command == "v" else 0.0))
+                points.append(list(target))
+            elif upper in ("Q", "T"):
+                if upper == "Q":
+                    control = (args[0] + ox, args[1] + oy)
+                    target = (args[2] + ox, args[3] + oy)
+                else:
+                    control = (2 * current[0] - control[0], 2 * current[1] - control[1]) \
+                        if previous in "QT" and control else current
+                    target = (args[0] + ox, args[1] + oy)
+                points.extend(_quadratic(current, control, target, tolerance))
+            elif upper in ("C", "S"):
+                if upper == "C":
+                    first = (args[0] + ox, args[1] + oy)
+                    control = (args[2] + ox, args[3] + oy)
+                    target = (args[4] + ox, args[5] + oy)
+                else:
+                    first = (2 * current[0] - control[0], 2 * current[1] - control[1]) \
+                        if previous in "CS" and control else current
+                    control = (args[0] + ox, args[1] + oy)
+                    target = (args[2] + ox, args[3] + oy)
+                points.extend(_cubic(current, first, control, target, tolerance))
+            elif upper == "A":
+                ax, ay = current if command == "a" else (0.0, 0.0)
+                target = (args[5] + ax, args[6] + ay)
+                points.extend(_arc(current, args[0], args[1], args[2], bool(args[3]),
+                                   bool(args[4]), target, tolerance))
+            current = target
+        previous = upper
+    if len(points) > 1:
+        subpaths.append((points, False))
+    return subpaths
@@ -0,0 +1,140 @@
+"""建置量測：各階段的耗時、CPU 時間與寫出的位元組，彙整成 JSON 報告與 Prometheus 指標
+
+build_animal 以 measure 包住每個階段，記錄實際耗時、CPU 時間（含 rsvg-convert
+等子行程）與寫出的位元組；generate_images 再彙整成 JSON 報告與 Prometheus 指標。
+"""
+
+import contextlib
+import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows 沒有 resource 模組，量測報告不含記憶體峰值
+    resource = None
+
+from .common import METRICS_PREFIX
+
+
+def cpu_time():
+    """目前行程與已結束子行程的 CPU 時間總和（秒）"""
+    times = os.times()
+    return time.process_time() + times.children_user + times.children_system
+
+
+def peak_rss_bytes():
+    """目前行程（與子行程）的記憶體峰值，無法取得時回傳 None
+
+    工作行程會被重複使用，因此數值是該行程到目前為止的峰值。
+    """
+    if resource is None:
+        return None
+    # Linux 的 ru_maxrss 單位為 KB，macOS 為 bytes
+    scale = 1 if sys.platform == "darwin" else 1024
+    return max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) * scale
+
+
+@contextlib.contextmanager
+def measure(stages, name):
+    """量測一個階段的實際與 CPU 耗時，寫入 stages[name]；可在區塊內補上 bytes 等欄位"""
+    record = {"bytes": 0}
+    wall_started, cpu_started = time.perf_counter(), cpu_time()
+    try:
+        yield record
+    finally:
+        record["wall_seconds"] = time.perf_counter() - wall_started
+        record["cpu_seconds"] = cpu_time() - cpu_started
+        stages[name] = record
+
+
+def dominant_stage(result):
+    """耗時最長的階段名稱"""
+    stages = result.get("stages") or {}
+    return max(stages, key=lambda name: stages[name]["wall_seconds"], default="-")
+
+
+def make_report(results, settings, output_dir, jobs, elapsed, aggregate):
+    """彙整整次建置的量測報告（可序列化為 JSON）"""
+    built = [r for r in results if "wall_seconds" in r]
+    stages = {}
+    for result in built:
+        for name, stage in result["stages"].items():
+            total = stages.setdefault(name, {"wall_seconds": 0.0, "cpu_seconds": 0.0, "bytes": 0})
+            for key in total:
+                total[key] += stage[key]
+    peaks = [r["peak_rss_bytes"] for r in built if r.get("peak_rss_bytes")]
+    reused = [r["visual_gate"] for r in built if (r.get("visual_gate") or {}).get("reused")]
+    cache_stats = [r["raster_cache"] for r in built if r.get("raster_cache")]
+    animals = []
+    for result in results:
+        record = {key: value for key, value in result.items()
+                  if key not in ("variants", "compression", "outputs", "written", "probe")}
+        record["status"] = "failed" if "error" in result else "cached" if result.get("cached") else "built"
+        record["files_written"] = len(result.get("written", []))
+        animals.append(record)
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "output_dir": output_dir,
+        "jobs": jobs,
+        "settings": settings,
+        "summary": {
+            "animals": len(results),
+            "built": len(built),
+            "cached": sum(1 for r in results if r.get("cached")),
+            "failed": sum(1 for r in results if "error" in r),
+            "wall_seconds": elapsed,
+            "cpu_seconds": sum(r["cpu_seconds"] for r in built),
+            "bytes_written": sum(r["bytes_written"] for r in built),
+            "elements": sum(r["elements"] for r in built),
+            "peak_rss_bytes": max(peaks, default=None),
+            "stages": stages,
+            "aggregate": aggregate["aggregate"],
+            "visual_gate": {
+                "probed": sum(1 for r in built if r.get("visual_gate")),
+                "reused": len(reused),
+                "files_skipped": sum(gate["files"] for gate in reused),
+                "bytes_not_rewritten": sum(gate["bytes"] for gate in reused),
+                "raster_seconds_saved": sum(gate["seconds"] for gate in reused),
+            },
+            "raster_cache": {key: sum(stats[key] for stats in cache_stats)
+                             for key in ("hits", "misses", "evicted")},
+        },
+        "animals": animals,
+    }
+
+
+def prometheus_metrics(report):
+    """把量測報告轉為 node_exporter textfile collector 格式"""
+    lines = []
+
+    def metric(name, help_text, samples):
+        lines.append(f"# HELP {METRICS_PREFIX}_{name} {help_text}")
+        lines.append(f"# TYPE {METRICS_PREFIX}_{name} gauge")
+        for labels, value in samples:
+            label_text = ",".join(f'{key}="{val}"' for key, val in labels.items())
+            lines.append(f"{METRICS_PREFIX}_{name}{{{label_text}}} {value}" if label_text
+                         else f"{METRICS_PREFIX}_{name} {value}")
+
+    summary = report["summary"]
+    built = [a for a in report["animals"] if a["status"] == "built"]
+    metric("build_seconds", "Wall-clock time of the last build.", [({}, summary["wall_seconds"])])
+    metric("build_timestamp_seconds", "Unix time when the last build finished.",
+           [({}, f"{time.time():.3f}")])
+    metric("animals", "Animals in the last build by status.",
+           [({"status": status}, summary[status]) for status in ("built", "cached", "failed")])
+    metric("stage_seconds", "Time spent per animal and stage.",
+           [({"animal": a["id"], "stage": stage, "kind": kind}, record[f"{kind}_seconds"])
+            for a in built for stage, record in a["stages"].items() for kind in ("wall", "cpu")])
+    metric("stage_bytes", "Bytes produced per animal and stage.",
+           [({"animal": a["id"], "stage": stage}, record["bytes"])
+            for a in built for stage, record in a["stages"].items()])
+    metric("bytes_written", "Bytes actually written per animal.",
+           [({"animal": a["id"]}, a["bytes_written"]) for a in built])
+    metric("elements", "SVG element count per animal.",
+           [({"animal": a["id"]}, a["elements"]) for a in built])
+    if summary["peak_rss_bytes"] is not None:
+        metric("peak_rss_bytes", "Peak resident set size of the build workers.",
+               [({}, summary["peak_rss_bytes"])])
+    return "\n".join(lines) + "\n"
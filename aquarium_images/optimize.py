@@ -0,0 +1,556 @@
+"""SVG 最佳化：壓縮數字與顏色、刪除預設值與未引用的定義、合併圖形並依輸出尺寸降低座標精度"""
+
+import math
+import os
+import re
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+
+from .common import (
+    IMAGES_DIR, PNG_WIDTH, PRECOMPRESS_ENCODINGS, RESPONSIVE_WIDTHS, write_if_changed,
+)
+from .svg import (
+    NAMED_COLORS, NUMBER_RE, SHORT_COLOR_NAMES, SVG_NS, TEXT_ELEMENTS, URL_REF_RE, XLINK_NS,
+    collapse_text, escape_xml, local_name,
+)
+from .geometry import _path_commands, flatten_path, parse_color
+from .web import precompress_file
+
+
+# 值為顏色的屬性
+COLOR_ATTRS = {"fill", "stroke", "stop-color", "flood-color", "lighting-color", "color"}
+
+# 值為數字或數字串列的屬性
+NUMBER_ATTRS = {
+    "x", "y", "x1", "y1", "x2", "y2", "cx", "cy", "r", "rx", "ry", "fx", "fy",
+    "width", "height", "opacity", "fill-opacity", "stroke-opacity", "stop-opacity",
+    "stroke-width", "stroke-miterlimit", "stroke-dashoffset", "stroke-dasharray",
+    "offset", "font-size", "points", "viewBox", "transform", "gradientTransform", "d",
+}
+
+# 可由 style 搬到屬性上的呈現屬性（屬性較短且易於後續處理）
+PRESENTATION_ATTRS = COLOR_ATTRS | {
+    "opacity", "fill-opacity", "fill-rule", "stroke-opacity", "stroke-width",
+    "stroke-linecap", "stroke-linejoin", "stroke-miterlimit", "stroke-dasharray",
+    "stroke-dashoffset", "stop-opacity", "font-family", "font-size", "font-weight",
+    "text-anchor", "display", "visibility",
+}
+
+# 可繼承屬性的預設值：只有祖先元素沒有設定其他值時才能刪除
+INHERITED_DEFAULTS = {
+    "fill": "#000", "fill-opacity": "1", "fill-rule": "nonzero",
+    "stroke": "none", "stroke-width": "1", "stroke-opacity": "1",
+    "stroke-linecap": "butt", "stroke-linejoin": "miter", "stroke-miterlimit": "4",
+    "stroke-dasharray": "none", "stroke-dashoffset": "0",
+    "text-anchor": "start", "font-weight": "normal", "visibility": "visible",
+}
+
+# 不可繼承屬性的預設值：可直接刪除
+ELEMENT_DEFAULTS = {
+    "*": {"opacity": "1"},
+    "stop": {"offset": "0", "stop-color": "#000", "stop-opacity": "1"},
+    "rect": {"x": "0", "y": "0"},
+    "circle": {"cx": "0", "cy": "0"},
+    "ellipse": {"cx": "0", "cy": "0"},
+    "line": {"x1": "0", "y1": "0", "x2": "0", "y2": "0"},
+    "linearGradient": {"x1": "0", "y1": "0", "x2": "100%", "y2": "0",
+                       "gradientUnits": "objectBoundingBox", "spreadMethod": "pad"},
+    "radialGradient": {"cx": "50%", "cy": "50%", "r": "50%",
+                       "gradientUnits": "objectBoundingBox", "spreadMethod": "pad"},
+}
+
+# 幾何最佳化：各基本圖形描述幾何的屬性（其餘屬性相同才可合併為一個 path）
+GEOMETRY_ATTRS = {
+    "path": ("d",), "line": ("x1", "y1", "x2", "y2"), "circle": ("cx", "cy", "r"),
+    "ellipse": ("cx", "cy", "rx", "ry"), "rect": ("x", "y", "width", "height"),
+    "polygon": ("points",), "polyline": ("points",),
+}
+
+# 合併後會改變外觀或引用關係的屬性：有這些屬性的圖形維持原樣
+UNMERGEABLE_ATTRS = {
+    "id", "class", "style", "filter", "mask", "clip-path", "rx", "ry",
+    "marker-start", "marker-mid", "marker-end", "pathLength",
+}
+
+# 可以在其中合併圖形、降低座標精度的容器（defs、clipPath、symbol 等另有座標系或引用規則）
+GEOMETRY_CONTAINERS = {"svg", "g", "a"}
+
+# 座標精度：以最大輸出尺寸計算，捨入誤差不超過此像素數；最大輸出尺寸至少以
+# 預設的寬度階梯計算（SVG 本身也會在網頁上放大顯示）
+GEOMETRY_TOLERANCE = 0.1
+GEOMETRY_MAX_WIDTH = max(RESPONSIVE_WIDTHS + (PNG_WIDTH,))
+
+# 最佳化規則改變時遞增，讓建置快取失效
+OPTIMIZER_VERSION = 2
+
+PATH_TOKEN_RE = re.compile(r"[MmLlHhVvCcSsQqTtZz]|" + NUMBER_RE.pattern)
+ELEMENT_RE = re.compile(r"<[A-Za-z]")
+
+
+def short_number(text):
+    """以最短且不失真的方式表示數字：去掉多餘的 0 與小數點前的 0"""
+    value = float(text)
+    if value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    result = repr(value)
+    if result.startswith("0."):
+        return result[1:]
+    if result.startswith("-0."):
+        return "-" + result[2:]
+    return result
+
+
+def short_numbers(value):
+    """壓縮數字串列（points、viewBox、transform 等），分隔符一律改為空白"""
+    value = NUMBER_RE.sub(lambda m: short_number(m.group(0)), value)
+    value = re.sub(r"\s*,\s*|\s+", " ", value.strip())
+    return re.sub(r"\s*([()])\s*", r"\1", value)
+
+
+def short_path(d):
+    """壓縮路徑資料：指令字母與數字之間不留空白，負號可直接作為分隔符"""
+    if re.search(r"[Aa]", d):
+        # 弧線旗標可以省略分隔符，逐一解析風險較高，只壓縮數字與空白（負號前的空白一律可省）
+        return short_numbers(d).replace(" -", "-")
+    parts = []
+    previous_is_number = False
+    for token in PATH_TOKEN_RE.findall(d):
+        if token[0].isalpha():
+            parts.append(token)
+            previous_is_number = False
+            continue
+        token = short_number(token)
+        if previous_is_number and not token.startswith("-"):
+            parts.append(" ")
+        parts.append(token)
+        previous_is_number = True
+    return "".join(parts)
+
+
+def short_color(value):
+    """統一顏色寫法：16 進位小寫、可縮寫時縮寫，並選用較短的顏色名稱"""
+    color = value.strip().lower()
+    color = NAMED_COLORS.get(color, color)
+    if re.fullmatch(r"#[0-9a-f]{6}", color) and color[1] == color[2] and color[3] == color[4] \
+            and color[5] == color[6]:
+        color = "#" + color[1] + color[3] + color[5]
+    if not color.startswith("#"):
+        return value.strip()
+    return SHORT_COLOR_NAMES.get(color, color)
+
+
+def normalize_attr(tag, name, value):
+    """正規化單一屬性值"""
+    if name in COLOR_ATTRS and not value.lstrip().startswith("url("):
+        return short_color(value)
+    if name == "offset" and value.strip().endswith("%"):
+        return short_number(str(float(value.strip()[:-1]) / 100))
+    if name == "d":
+        return short_path(value)
+    if name in NUMBER_ATTRS:
+        if re.fullmatch(r"\s*[-+]?0*\.?0*%\s*", value):
+            return "0"
+        return short_numbers(value)
+    return value.strip()
+
+
+def optimize_element(element, inherited):
+    """遞迴最佳化元素：style 轉屬性、正規化數值與顏色、刪除預設值屬性"""
+    tag = local_name(element.tag)
+    if tag is None:
+        raise ValueError(f"unsupported namespace: {element.tag}")
+
+    attrs = {}
+    for key, value in element.attrib.items():
+        name = local_name(key)
+        if name is None:
+            raise ValueError(f"unsupported namespace: {key}")
+        attrs[name] = value
+
+    # style 優先權高於屬性，搬移時直接覆寫同名屬性
+    if "style" in attrs:
+        remaining = []
+        for declaration in attrs.pop("style").split(";"):
+            prop, _, value = declaration.partition(":")
+            prop, value = prop.strip(), value.strip()
+            if not prop:
+                continue
+            if prop in PRESENTATION_ATTRS and "!" not in value:
+                attrs[prop] = value
+            else:
+                remaining.append(f"{prop}:{value}")
+        if remaining:
+            attrs["style"] = ";".join(remaining)
+
+    attrs = {name: normalize_attr(tag, name, value) for name, value in attrs.items()}
+
+    defaults = dict(ELEMENT_DEFAULTS["*"])
+    if "href" not in attrs and "xlink:href" not in attrs:
+        defaults.update(ELEMENT_DEFAULTS.get(tag, {}))
+    for name, default in defaults.items():
+        if attrs.get(name) == default:
+            del attrs[name]
+    for name, default in INHERITED_DEFAULTS.items():
+        if attrs.get(name) == default and inherited.get(name, default) == default:
+            del attrs[name]
+
+    child_inherited = dict(inherited)
+    child_inherited.update((name, attrs[name]) for name in INHERITED_DEFAULTS if name in attrs)
+
+    children = [optimize_element(child, child_inherited) for child in element]
+    node = {"tag": tag, "attrs": attrs, "children": children, "text": "", "tail": ""}
+    if tag in TEXT_ELEMENTS:
+        node["text"] = collapse_text(element.text)
+        for child_node, child in zip(children, element):
+            child_node["tail"] = collapse_text(child.tail)
+    return node
+
+
+def referenced_ids(node, found=None):
+    """收集所有以 url(#id) 或 href="#id" 引用的 id"""
+    found = set() if found is None else found
+    for name, value in node["attrs"].items():
+        found.update(URL_REF_RE.findall(value))
+        if name in ("href", "xlink:href") and value.startswith("#"):
+            found.add(value[1:])
+    for child in node["children"]:
+        referenced_ids(child, found)
+    return found
+
+
+def collapse_defs(root):
+    """合併根層的多個 <defs>、移除未被引用的漸層與空的 <defs>"""
+    used = referenced_ids(root)
+    defs = [child for child in root["children"] if child["tag"] == "defs"]
+    if defs:
+        merged = defs[0]
+        for extra in defs[1:]:
+            merged["children"].extend(extra["children"])
+            merged["attrs"].update(extra["attrs"])
+        merged["children"] = [
+            child for child in merged["children"]
+            if child["tag"] not in ("linearGradient", "radialGradient")
+            or child["attrs"].get("id") in used
+        ]
+        root["children"] = [
+            child for child in root["children"] if child["tag"] != "defs" or child is merged
+        ]
+        if not merged["children"]:
+            root["children"].remove(merged)
+
+
+def coordinate_decimals(viewbox, max_width=GEOMETRY_MAX_WIDTH):
+    """座標可以保留到小數第幾位：捨入誤差在最大輸出寬度下不超過 GEOMETRY_TOLERANCE 像素"""
+    numbers = [float(n) for n in NUMBER_RE.findall(viewbox or "")]
+    if len(numbers) != 4 or numbers[2] <= 0:
+        return None
+    tolerance = GEOMETRY_TOLERANCE * numbers[2] / max_width
+    return max(0, math.ceil(-math.log10(2 * tolerance)))
+
+
+def round_path(d, decimals):
+    """降低路徑資料的精度
+
+    相對指令（m、l、c、a…）的每一段都接在前一段的終點上，各自捨入會沿路累積誤差；
+    因此先換算成絕對座標捨入，再以「捨入後的前一點」為起點寫回相對座標，
+    每個點的誤差都不超過單次捨入。無法解析時原樣回傳。
+    """
+    r = lambda value: round(value, decimals)
+    n = lambda value: short_number(repr(r(value) + 0.0))
+    out = []
+    current = start = (0.0, 0.0)  # 原始的絕對座標
+    pen = pen_start = (0.0, 0.0)  # 捨入後的絕對座標
+    previous = None
+    try:
+        for command, args in _path_commands(d):
+            upper = command.upper()
+            relative = command != upper
+            # 重複的指令與 M 之後隱含的 L 可以省略字母
+            if upper == "M" or command != previous and (previous, command) not in (("M", "L"), ("m", "l")):
+                out.append(command)
+            previous = command
+            if upper == "Z":
+                current, pen = start, pen_start
+                continue
+            base = current if relative else (0.0, 0.0)
+            origin = pen if relative else (0.0, 0.0)
+            if upper == "H":
+                x = args[0] + base[0]
+                out.append(n(r(x) - origin[0]))
+                current, pen = (x, current[1]), (r(x), pen[1])
+                continue
+            if upper == "V":
+                y = args[0] + base[1]
+                out.append(n(r(y) - origin[1]))
+                current, pen = (current[0], y), (pen[0], r(y))
+                continue
+            if upper == "A":
+                out.extend([n(args[0]), n(args[1]), n(args[2]), str(int(args[3])), str(int(args[4]))])
+                args = args[5:]
+            for i in range(0, len(args), 2):
+                x, y = args[i] + base[0], args[i + 1] + base[1]
+                out.extend([n(r(x) - origin[0]), n(r(y) - origin[1])])
+            current, pen = (x, y), (r(x), r(y))
+            if upper == "M":
+                start, pen_start = current, pen
+    except ValueError:
+        return d
+    # 數字之間才需要分隔，負號本身就能分隔
+    return "".join(token if i == 0 or token[0].isalpha() or token.startswith("-")
+                   or out[i - 1][0].isalpha() else " " + token
+                   for i, token in enumerate(out))
+
+
+def round_geometry(node, decimals):
+    """降低圖形座標的精度；遇到帶 transform 或另有座標系的元素時略過（縮放會放大誤差）"""
+    for child in node["children"]:
+        if "transform" in child["attrs"]:
+            continue
+        if child["tag"] in GEOMETRY_ATTRS:
+            for name in GEOMETRY_ATTRS[child["tag"]]:
+                if name == "d" and name in child["attrs"]:
+                    rounded = round_path(child["attrs"][name], decimals)
+                    child["attrs"][name] = normalize_attr(child["tag"], name, rounded)
+                elif name in child["attrs"] and "%" not in child["attrs"][name]:
+                    rounded = NUMBER_RE.sub(
+                        lambda m: short_number(repr(round(float(m.group()), decimals))),
+                        child["attrs"][name])
+                    child["attrs"][name] = normalize_attr(child["tag"], name, rounded)
+        elif child["tag"] in GEOMETRY_CONTAINERS and "viewBox" not in child["attrs"]:
+            round_geometry(child, decimals)
+
+
+def shape_path(tag, attrs):
+    """把基本圖形轉為等價的路徑資料；無法轉換時回傳 None
+
+    圓與橢圓轉為兩段弧線，內建點陣化畫出的結果與原圖形相差不超過 1/255
+    （benchmark_aquarium_images.py --arc-check）。
+    """
+    if tag == "path":
+        d = attrs.get("d", "").lstrip()
+        # 以相對座標 m 開頭的路徑接在其他路徑後面時起點會跟著位移
+        return d if d.startswith("M") else None
+    if tag in ("polygon", "polyline"):
+        numbers = NUMBER_RE.findall(attrs.get("points", ""))
+        if len(numbers) < 4 or len(numbers) % 2:
+            return None
+        return "M" + " ".join(numbers) + ("z" if tag == "polygon" else "")
+    try:
+        v = {name: float(attrs.get(name, "0")) for name in GEOMETRY_ATTRS[tag]}
+    except ValueError:  # 百分比等需要依視埠換算的長度
+        return None
+    n = lambda value: short_number(repr(value))
+    if tag == "line":
+        return f"M{n(v['x1'])} {n(v['y1'])} {n(v['x2'])} {n(v['y2'])}"
+    if tag == "rect":
+        if v["width"] <= 0 or v["height"] <= 0:
+            return None
+        return f"M{n(v['x'])} {n(v['y'])}h{n(v['width'])}v{n(v['height'])}h{n(-v['width'])}z"
+    rx, ry = (v["r"], v["r"]) if tag == "circle" else (v["rx"], v["ry"])
+    if rx <= 0 or ry <= 0:
+        return None
+    return (f"M{n(v['cx'] - rx)} {n(v['cy'])}a{n(rx)} {n(ry)} 0 1 0 {n(2 * rx)} 0"
+            f"a{n(rx)} {n(ry)} 0 1 0 {n(-2 * rx)} 0z")
+
+
+def _opaque(value):
+    color = parse_color(value) if value != "none" else None
+    return color is not None and color[3] >= 1
+
+
+def mergeable_shape(node, inherited):
+    """判斷圖形能否參與合併
+
+    Returns:
+        (樣式鍵, 路徑資料, 外框, 重疊時是否仍可合併)；不可合併時回傳 None
+    """
+    tag, attrs = node["tag"], node["attrs"]
+    if tag not in GEOMETRY_ATTRS or node["children"] or UNMERGEABLE_ATTRS & attrs.keys():
+        return None
+    style = {name: value for name, value in attrs.items() if name not in GEOMETRY_ATTRS[tag]}
+    # objectBoundingBox 的漸層與圖樣依各自的外框計算，合併後外框改變
+    if any(value.startswith("url(") for value in style.values()):
+        return None
+    d = shape_path(tag, attrs)
+    if d is None:
+        return None
+    effective = {**INHERITED_DEFAULTS, **inherited, **style}
+    try:
+        points = [point for subpath, _ in flatten_path(d, 1.0) for point in subpath]
+        stroke_width = float(effective["stroke-width"]) if effective["stroke"] != "none" else 0.0
+        miter = float(effective["stroke-miterlimit"]) if effective["stroke-linejoin"] == "miter" else 1
+    except ValueError:
+        return None
+    if not points:
+        return None
+    # 外框加上筆畫、尖角與抗鋸齒可能延伸的範圍
+    pad = stroke_width / 2 * max(miter, math.sqrt(2)) + 1
+    xs, ys = [x for x, _ in points], [y for _, y in points]
+    box = (min(xs) - pad, min(ys) - pad, max(xs) + pad, max(ys) + pad)
+    # 只有不透明的筆畫（沒有填色）時，重疊部分重畫一次或兩次的結果相同；
+    # 有填色時，重疊的子路徑方向相反會在 nonzero 規則下挖出空洞
+    overlap = (
+        (effective["fill"] == "none" or tag == "line")
+        and _opaque(effective["stroke"])
+        and float(effective["stroke-opacity"]) >= 1
+        and float(style.get("opacity", "1")) >= 1
+    )
+    return tuple(sorted(style.items())), d, box, overlap
+
+
+def _boxes_overlap(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def merged_node(run):
+    """把一組可合併的圖形組成一個 path 節點；單獨一個時只在轉為 path 較短時替換"""
+    first = run[0][0]
+    d = short_path("".join(shape[1] for _, shape in run))
+    style = {name: value for name, value in first["attrs"].items()
+             if name not in GEOMETRY_ATTRS[first["tag"]]}
+    node = {"tag": "path", "attrs": {"d": d, **style}, "children": [], "text": "",
+            "tail": first["tail"]}
+    if len(run) == 1:
+        before, after = [], []
+        serialize_node(first, before)
+        serialize_node(node, after)
+        return node if len("".join(after)) < len("".join(before)) else first
+    return node
+
+
+def merge_shapes(node, inherited):
+    """把相鄰、樣式相同的基本圖形合併為一個複合 path（不改變繪製順序與外觀）
+
+    彼此重疊時合併可能改變外觀（半透明的重疊處、填色方向、筆畫疊在填色上），
+    因此只合併外框互不相交的圖形，或是重疊也不影響結果的不透明純筆畫。
+    """
+    child_inherited = dict(inherited)
+    child_inherited.update((name, node["attrs"][name]) for name in INHERITED_DEFAULTS
+                           if name in node["attrs"])
+    for child in node["children"]:
+        if child["tag"] in GEOMETRY_CONTAINERS:
+            merge_shapes(child, child_inherited)
+    if node["tag"] not in GEOMETRY_CONTAINERS:
+        return
+
+    children, run = [], []
+    for child in node["children"]:
+        shape = mergeable_shape(child, child_inherited)
+        if run and shape and shape[0] == run[0][1][0] and (
+                shape[3] and run[0][1][3]
+                or not any(_boxes_overlap(shape[2], other[2]) for _, other in run)):
+            run.append((child, shape))
+            continue
+        if run:
+            children.append(merged_node(run))
+        run = [(child, shape)] if shape else []
+        if not shape:
+            children.append(child)
+    if run:
+        children.append(merged_node(run))
+    node["children"] = children
+
+
+def simplify_geometry(root, max_width=GEOMETRY_MAX_WIDTH):
+    """幾何最佳化：降低在 max_width 寬的輸出上看不出差異的座標精度，再合併相鄰的同樣式圖形"""
+    decimals = coordinate_decimals(root["attrs"].get("viewBox"), max_width)
+    if decimals is not None:
+        round_geometry(root, decimals)
+    merge_shapes(root, {})
+
+
+def serialize_node(node, out):
+    out.append("<" + node["tag"])
+    for name, value in node["attrs"].items():
+        out.append(f' {name}="{escape_xml(value, quote=True)}"')
+    if not node["children"] and not node["text"]:
+        out.append("/>")
+    else:
+        out.append(">" + escape_xml(node["text"]))
+        for child in node["children"]:
+            serialize_node(child, out)
+            out.append(escape_xml(child["tail"]))
+        out.append(f"</{node['tag']}>")
+
+
+def optimized_tree(svg, max_width=GEOMETRY_MAX_WIDTH):
+    """解析並最佳化 SVG，回傳節點樹（無法安全處理時拋出 ValueError 或 ParseError）"""
+    tree = optimize_element(ET.fromstring(svg), {})
+    collapse_defs(tree)
+    simplify_geometry(tree, max_width)
+    return tree
+
+
+def optimize_svg(svg, max_width=GEOMETRY_MAX_WIDTH):
+    """最佳化 SVG 字串：移除註解與空白、正規化顏色與數字、刪除預設值屬性、合併 <defs>，
+    並合併相鄰的同樣式圖形、降低看不出差異的座標精度（依最大輸出寬度 max_width 計算）
+
+    遇到無法安全處理的內容（例如編輯器專用命名空間）時原樣回傳。
+    """
+    try:
+        tree = optimized_tree(svg, max_width)
+    except (ET.ParseError, ValueError):
+        return svg
+
+    namespaces = {"xmlns": SVG_NS}
+    if re.search(r'\sxlink:', svg):
+        namespaces["xmlns:xlink"] = XLINK_NS
+    tree["attrs"] = {**namespaces, **tree["attrs"]}
+
+    out = []
+    serialize_node(tree, out)
+    return "".join(out)
+
+
+def optimize_svg_file(path):
+    """就地最佳化單一 SVG 檔（只在變小時寫回），回傳前後大小與元素數"""
+    with open(path, encoding='utf-8') as f:
+        original = f.read()
+    optimized = optimize_svg(original)
+    before = len(original.encode('utf-8'))
+    after = len(optimized.encode('utf-8'))
+    if after < before:
+        if write_if_changed(path, optimized.encode('utf-8')):
+            # 已有預先壓縮副本時一併更新，避免伺服器送出舊內容
+            existing = [e for e in PRECOMPRESS_ENCODINGS if os.path.exists(f"{path}.{e}")]
+            if existing:
+                precompress_file(path, existing)
+    else:
+        after, optimized = before, original
+    return {"path": path, "before": before, "after": after,
+            "nodes_before": count_elements(original), "nodes_after": count_elements(optimized)}
+
+
+def format_saving(before, after):
+    """格式化位元組節省量，例如「2,065 → 1,234 bytes（-40.2%）」"""
+    ratio = (1 - after / before) * 100 if before else 0
+    return f"{before:,} → {after:,} bytes（-{ratio:.1f}%）"
+
+
+def optimize_tree(root_dir=IMAGES_DIR, jobs=None):
+    """平行最佳化目錄下所有 SVG 檔，並列出每個檔案的前後大小"""
+    paths = sorted(
+        os.path.join(dirpath, name)
+        for dirpath, _, names in os.walk(root_dir)
+        for name in names
+        if name.endswith(".svg")
+    )
+    print(f"🧹 開始最佳化 {root_dir} 下的 {len(paths)} 個 SVG 檔...")
+
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        reports = list(pool.map(optimize_svg_file, paths))
+    for report in reports:
+        print(f"  {os.path.relpath(report['path'], root_dir)}: "
+              f"{format_saving(report['before'], report['after'])}，"
+              f"節點 {report['nodes_before']} → {report['nodes_after']}")
+
+    before = sum(report["before"] for report in reports)
+    after = sum(report["after"] for report in reports)
+    print(f"\n🎉 完成！總計 {format_saving(before, after)}，節點 "
+          f"{sum(r['nodes_before'] for r in reports)} → {sum(r['nodes_after'] for r in reports)}")
+    return reports
+
+
+def count_elements(svg):
+    """計算 SVG 中的元素數量"""
+    return len(ELEMENT_RE.findall(svg))
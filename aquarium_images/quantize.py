@@ -0,0 +1,203 @@
+"""調色盤量化：把 PNG 轉成 8 位元索引色，失真過大時維持全彩
+
+卡通風格的圖只用到少數顏色（加上抗鋸齒與漸層），轉成 8 位元索引色 PNG
+通常能省下一半以上的大小。調色盤以加權 k-means 在「不重複的顏色」上計算，
+對應與誤差估計都以 NumPy 向量化；失真超過門檻時維持全彩。
+"""
+
+import functools
+import io
+import os
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 為選用套件，缺少時不做調色盤量化
+    np = None
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow 為選用套件，缺少時不做調色盤量化
+    Image = None
+
+from .common import (
+    IMAGES_DIR, QUANTIZE_CHUNK, QUANTIZE_DITHER, QUANTIZE_ITERATIONS, QUANTIZE_MAX_ERROR,
+    write_if_changed,
+)
+from .optimize import format_saving
+from .raster import _png_chunk
+
+
+# 8×8 Bayer 有序抖色矩陣（0–1），可向量化套用，不像誤差擴散需要逐點處理
+BAYER_8 = None if np is None else (np.array([
+    [0, 32, 8, 40, 2, 34, 10, 42], [48, 16, 56, 24, 50, 18, 58, 26],
+    [12, 44, 4, 36, 14, 46, 6, 38], [60, 28, 52, 20, 62, 30, 54, 22],
+    [3, 35, 11, 43, 1, 33, 9, 41], [51, 19, 59, 27, 49, 17, 57, 25],
+    [15, 47, 7, 39, 13, 45, 5, 37], [63, 31, 55, 23, 61, 29, 53, 21],
+], dtype=np.float32) + 0.5) / 64
+
+
+def _nearest(colors, palette, chunk=QUANTIZE_CHUNK):
+    """每個顏色最接近的調色盤索引（分塊計算距離，避免一次配置過大的矩陣）"""
+    result = np.empty(len(colors), dtype=np.intp)
+    palette_norm = (palette * palette).sum(axis=1)
+    for start in range(0, len(colors), chunk):
+        block = colors[start:start + chunk]
+        distance = palette_norm[None, :] - 2 * block @ palette.T
+        result[start:start + chunk] = distance.argmin(axis=1)
+    return result
+
+
+def build_palette(pixels, colors=256, iterations=QUANTIZE_ITERATIONS):
+    """以加權 k-means 從 RGBA 像素（N×4 uint8）計算調色盤
+
+    Returns:
+        (調色盤 K×4 float32, 每個像素的索引)；不重複的顏色不超過 colors 時調色盤即為原色
+    """
+    keys = pixels.astype(np.uint32)
+    keys = keys[:, 0] << 24 | keys[:, 1] << 16 | keys[:, 2] << 8 | keys[:, 3]
+    unique, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    values = np.stack([(unique >> shift) & 0xFF for shift in (24, 16, 8, 0)], axis=1).astype(np.float32)
+    if len(unique) <= colors:
+        return values, inverse.reshape(-1)
+
+    # 初始中心：以每色 4 位元分組，取像素最多的 colors 組的加權平均
+    buckets = ((values.astype(np.uint32) >> 4) * np.array([4096, 256, 16, 1], dtype=np.uint32)).sum(axis=1)
+    bucket_ids, bucket_of = np.unique(buckets, return_inverse=True)
+    bucket_of = bucket_of.reshape(-1)
+    weight = np.bincount(bucket_of, weights=counts, minlength=len(bucket_ids))
+    sums = np.stack([np.bincount(bucket_of, weights=values[:, c] * counts, minlength=len(bucket_ids))
+                     for c in range(4)], axis=1)
+    top = np.argsort(weight)[::-1][:colors]
+    palette = (sums[top] / weight[top, None]).astype(np.float32)
+
+    for _ in range(iterations):
+        nearest = _nearest(values, palette)
+        weight = np.bincount(nearest, weights=counts, minlength=len(palette))
+        sums = np.stack([np.bincount(nearest, weights=values[:, c] * counts, minlength=len(palette))
+                         for c in range(4)], axis=1)
+        used = weight > 0
+        palette[used] = (sums[used] / weight[used, None]).astype(np.float32)
+    palette = np.clip(np.round(palette), 0, 255)
+    return palette, _nearest(values, palette)[inverse.reshape(-1)]
+
+
+def _srgb_to_lab(rgb):
+    """sRGB（0–255，最後一維為通道）轉 CIELAB（D65）"""
+    c = rgb / 255.0
+    c = np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+    xyz = c @ np.array([[0.4124, 0.2126, 0.0193], [0.3576, 0.7152, 0.1192],
+                        [0.1805, 0.0722, 0.9505]], dtype=np.float32)
+    xyz /= np.array([0.95047, 1.0, 1.08883], dtype=np.float32)
+    f = np.where(xyz > 216 / 24389, np.cbrt(xyz), (24389 / 27 * xyz + 16) / 116)
+    return np.stack([116 * f[..., 1] - 16, 500 * (f[..., 0] - f[..., 1]),
+                     200 * (f[..., 1] - f[..., 2])], axis=-1)
+
+
+def perceptual_error(original, quantized):
+    """兩張 RGBA 圖的知覺誤差：疊在白底、2×2 平均（模擬抖色在視覺上的混合）後的平均 ΔE"""
+    def prepare(image):
+        image = image.astype(np.float32)
+        rgb = image[..., :3] * (image[..., 3:] / 255) + 255 * (1 - image[..., 3:] / 255)
+        height, width = (rgb.shape[0] // 2) * 2, (rgb.shape[1] // 2) * 2
+        rgb = rgb[:height, :width].reshape(height // 2, 2, width // 2, 2, 3).mean(axis=(1, 3))
+        return _srgb_to_lab(rgb)
+    return float(np.sqrt(((prepare(original) - prepare(quantized)) ** 2).sum(axis=-1)).mean())
+
+
+def quantize_pixels(pixels, colors=256, dither=QUANTIZE_DITHER):
+    """把 RGBA 陣列（高×寬×4）量化為索引色
+
+    Args:
+        dither: 有序抖色強度（0 表示不抖色，1 約為調色盤平均間距）
+
+    Returns:
+        (索引陣列 高×寬 uint8, 調色盤 K×4 uint8)
+    """
+    height, width, _ = pixels.shape
+    flat = pixels.reshape(-1, 4)
+    palette, indices = build_palette(flat, colors)
+    if dither > 0 and len(palette) > 1:
+        # 抖色幅度依調色盤相鄰顏色的平均距離決定；透明度不抖色
+        spacing = np.sqrt(((palette[:, None, :3] - palette[None, :, :3]) ** 2).sum(axis=-1))
+        np.fill_diagonal(spacing, np.inf)
+        amplitude = dither * float(np.median(spacing.min(axis=1)))
+        threshold = np.tile(BAYER_8, (height // 8 + 1, width // 8 + 1))[:height, :width] - 0.5
+        shifted = pixels.astype(np.float32)
+        shifted[..., :3] += amplitude * threshold[..., None]
+        indices = _nearest(shifted.reshape(-1, 4), palette)
+    return indices.reshape(height, width).astype(np.uint8), palette.astype(np.uint8)
+
+
+def encode_indexed_png(indices, palette):
+    """把索引陣列與調色盤編碼為 8 位元索引色 PNG（含 tRNS 透明度）"""
+    height, width = indices.shape
+    raw = np.hstack([np.zeros((height, 1), dtype=np.uint8), indices])
+    alpha = palette[:, 3].tobytes().rstrip(b"\xff")
+    return (b"\x89PNG\r\n\x1a\n"
+            + _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 3, 0, 0, 0))
+            + _png_chunk(b"PLTE", palette[:, :3].tobytes())
+            + (_png_chunk(b"tRNS", alpha) if alpha else b"")
+            + _png_chunk(b"IDAT", zlib.compress(raw.tobytes(), 9))
+            + _png_chunk(b"IEND", b""))
+
+
+def quantize_png(data, dither=QUANTIZE_DITHER, max_error=QUANTIZE_MAX_ERROR):
+    """嘗試把 PNG 轉為索引色，回傳 (PNG 位元組, 統計)
+
+    誤差超過 max_error、原本就是索引色，或轉換後沒有變小時，原樣回傳 data。
+    統計含 before、after、error（平均 ΔE）與 indexed（是否採用索引色）。
+    """
+    with Image.open(io.BytesIO(data)) as image:
+        if image.mode in ("P", "L", "1"):
+            return data, {"before": len(data), "after": len(data), "error": 0.0, "indexed": False}
+        pixels = np.asarray(image.convert("RGBA"))
+    indices, palette = quantize_pixels(pixels, dither=dither)
+    error = perceptual_error(pixels, palette[indices])
+    quantized = encode_indexed_png(indices, palette)
+    indexed = error <= max_error and len(quantized) < len(data)
+    result = quantized if indexed else data
+    return result, {"before": len(data), "after": len(result), "error": error, "indexed": indexed}
+
+
+def quantize_png_file(path, dither=QUANTIZE_DITHER, max_error=QUANTIZE_MAX_ERROR):
+    """就地量化單一 PNG 檔（只在採用索引色時寫回），回傳統計"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    result, stats = quantize_png(data, dither, max_error)
+    if stats["indexed"]:
+        write_if_changed(path, result)
+    return {"path": path, **stats}
+
+
+def quantize_tree(root_dir=IMAGES_DIR, jobs=None, dither=QUANTIZE_DITHER, max_error=QUANTIZE_MAX_ERROR):
+    """平行量化目錄下所有 PNG，依動物（所在目錄）列出節省的大小；缺少 NumPy 或 Pillow 時回傳 None"""
+    if np is None or Image is None:
+        print("❌ 調色盤量化需要 NumPy 與 Pillow（pip install numpy pillow）")
+        return None
+    paths = sorted(
+        os.path.join(dirpath, name)
+        for dirpath, _, names in os.walk(root_dir)
+        for name in names
+        if name.endswith(".png")
+    )
+    print(f"🎨 開始量化 {root_dir} 下的 {len(paths)} 個 PNG 檔"
+          f"（抖色 {dither:g}，ΔE 上限 {max_error:g}）...")
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        reports = list(pool.map(functools.partial(quantize_png_file, dither=dither, max_error=max_error),
+                                paths))
+
+    groups = {}
+    for report in reports:
+        groups.setdefault(os.path.relpath(os.path.dirname(report["path"]), root_dir), []).append(report)
+    for group, items in groups.items():
+        indexed = sum(item["indexed"] for item in items)
+        worst = max(item["error"] for item in items)
+        print(f"  {group}: {format_saving(sum(i['before'] for i in items), sum(i['after'] for i in items))}"
+              f"（索引色 {indexed}/{len(items)}，最大 ΔE {worst:.2f}）")
+    before = sum(report["before"] for report in reports)
+    after = sum(report["after"] for report in reports)
+    print(f"\n🎉 完成！總計 {format_saving(before, after)}")
+    return reports
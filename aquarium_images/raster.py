@@ -0,0 +1,609 @@
+"""內建點陣化（NumPy）與視覺差異閘門：沒有外部工具時在行程內繪製 PNG"""
+
+import base64
+import io
+import itertools
+import math
+import os
+import struct
+import xml.etree.ElementTree as ET
+import zlib
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 為選用套件，缺少時只能以外部工具點陣化
+    np = None
+
+from .common import PROBE_HEIGHT, PROBE_WIDTH, RASTER_FORMATS
+from .svg import NUMBER_RE, URL_REF_RE
+from .geometry import _affine, _length, flatten_path, parse_color, parse_transform
+from .scene import (
+    Circle, Element, Ellipse, Group, Line, LinearGradient, Path, Polygon, RadialGradient, Rect,
+    Text, _load_node, _load_points, _split_style, _stop_from_attrs, load_scene,
+)
+
+
+# ── 內建點陣化（NumPy） ────────────────────────────────────────
+#
+# 建置容器裡沒有 rsvg-convert 時，改用 NumPy 在行程內繪製。每個圖形只在自己
+# 的外框範圍內計算「有號距離」：橢圓與矩形直接用解析式，路徑與多邊形先展平
+# 成折線再求到各邊的距離；距離換算成 0–1 的覆蓋率即為抗鋸齒。
+# 場景只解析、展平一次，之後可以繪製任意多個尺寸（見 rasterize_scenes）。
+#
+# 支援本專案圖片用到的功能：circle、ellipse、rect、line、polygon、polyline、
+# path（M/L/H/V/Q/T/C/S/A/Z）、transform、填色與筆畫（round／butt 端點）、
+# 線性與放射漸層、opacity 系列屬性。<text> 與濾鏡不繪製。群組的 opacity 與瀏覽器
+# 相同：子元素先畫到只涵蓋群組範圍的透明圖層，再以 opacity 一次合成（見 LayerOp），
+# 子元素重疊處不會變深；只有單一圖形時結果相同，直接把 opacity 乘進去。
+
+# 曲線展平的容許誤差（輸出像素）與漸層查表的階數；覆蓋率直接取自到邊的距離，
+# 誤差要小於 1/255 像素，圓與展平後的弧線路徑在 8 位元輸出上才看不出差別
+CURVE_TOLERANCE = 0.003
+GRADIENT_STEPS = 1024
+SHAPE_TAGS = {"circle", "ellipse", "rect", "line", "path", "polygon", "polyline"}
+
+
+class DrawOp:
+    """一個要繪製的圖形：幾何（區域座標）、區域 → 使用者座標矩陣與填色／筆畫設定"""
+    __slots__ = ("kind", "geometry", "bbox", "matrix", "fill", "fill_alpha", "evenodd",
+                 "stroke", "stroke_alpha", "stroke_width", "butt")
+
+    def __init__(self, kind, geometry, bbox, matrix, style):
+        self.kind, self.geometry, self.bbox, self.matrix = kind, geometry, bbox, matrix
+        self.fill = style["fill"]
+        self.fill_alpha = float(style["fill-opacity"])
+        self.evenodd = style["fill-rule"] == "evenodd"
+        self.stroke = style["stroke"]
+        self.stroke_alpha = float(style["stroke-opacity"])
+        self.stroke_width = float(style["stroke-width"])
+        self.butt = style["stroke-linecap"] == "butt"
+
+
+class LayerOp:
+    """離屏圖層：ops 先畫到透明圖層，再以 opacity 一次合成到下層"""
+    __slots__ = ("opacity", "ops")
+
+    def __init__(self, opacity, ops):
+        self.opacity, self.ops = opacity, ops
+
+
+def _rounded_rect_path(x, y, width, height, rx, ry):
+    rx, ry = min(rx or ry, width / 2), min(ry or rx, height / 2)
+    return (f"M{x + rx},{y} H{x + width - rx} A{rx},{ry} 0 0 1 {x + width},{y + ry} "
+            f"V{y + height - ry} A{rx},{ry} 0 0 1 {x + width - rx},{y + height} "
+            f"H{x + rx} A{rx},{ry} 0 0 1 {x},{y + height - ry} V{y + ry} "
+            f"A{rx},{ry} 0 0 1 {x + rx},{y} Z")
+
+
+def _gradient_table(stops):
+    """把漸層色標預先內插成 GRADIENT_STEPS × RGBA 的查表"""
+    offsets = np.maximum.accumulate(np.clip([stop.offset for stop in stops], 0, 1))
+    colors = []
+    for stop in stops:
+        rgba = parse_color(stop.color) or (0.0, 0.0, 0.0, 0.0)
+        colors.append((*rgba[:3], rgba[3] * stop.opacity))
+    colors = np.array(colors)
+    t = np.linspace(0, 1, GRADIENT_STEPS)
+    return np.stack([np.interp(t, offsets, colors[:, channel]) for channel in range(4)],
+                    axis=-1).astype(np.float32)
+
+
+def collect_gradients(scene):
+    """整理場景中的漸層定義（含 href 繼承），回傳 {id: 漸層設定}"""
+    raw = {}
+    for node in itertools.chain(scene.defs, scene.iter_shapes()):
+        if isinstance(node, LinearGradient):
+            attrs = {"x1": node.x1, "y1": node.y1, "x2": node.x2, "y2": node.y2, **node.attrs}
+            raw[node.id] = ("linear", attrs, node.stops)
+        elif isinstance(node, RadialGradient):
+            attrs = {"cx": node.cx, "cy": node.cy, "r": node.r, **node.attrs}
+            raw[node.id] = ("radial", attrs, node.stops)
+        elif isinstance(node, Element) and node.tag in ("linearGradient", "radialGradient") \
+                and "id" in node.attrs:
+            stops = [_stop_from_attrs(dict(child.attrs)) for child in node.children
+                     if isinstance(child, Element) and child.tag == "stop"]
+            raw[node.attrs["id"]] = (node.tag[:-len("Gradient")], node.attrs, stops)
+
+    defaults = {"linear": {"x1": "0", "y1": "0", "x2": "100%", "y2": "0"},
+                "radial": {"cx": "50%", "cy": "50%", "r": "50%"}}
+    gradients = {}
+    for gradient_id, (kind, attrs, stops) in raw.items():
+        merged, seen = dict(attrs), {gradient_id}
+        href = attrs.get("href") or attrs.get("xlink:href")
+        while href and href.startswith("#") and href[1:] in raw and href[1:] not in seen:
+            seen.add(href[1:])
+            _, parent_attrs, parent_stops = raw[href[1:]]
+            merged = {**parent_attrs, **merged}
+            stops = stops or parent_stops
+            href = parent_attrs.get("href") or parent_attrs.get("xlink:href")
+        if not stops:
+            continue
+        merged = {**defaults[kind], **merged}
+        gradients[gradient_id] = {
+            "kind": kind,
+            "attrs": merged,
+            "user_space": merged.get("gradientUnits") == "userSpaceOnUse",
+            "transform": parse_transform(merged.get("gradientTransform")),
+            "table": _gradient_table(stops),
+        }
+    return gradients
+
+
+def _resolve_paint(value, gradients):
+    """填色或筆畫值 → 顏色 tuple、漸層設定或 None"""
+    if value is None:
+        return None
+    match = URL_REF_RE.search(value)
+    if match:
+        return gradients.get(match.group(1))
+    return parse_color(value)
+
+
+def _node_geometry(node, viewbox, tolerance):
+    """回傳 (種類, 幾何, 區域座標外框)；無法繪製時回傳 None"""
+    _, _, view_width, view_height = viewbox
+    if isinstance(node, Circle):
+        r = _length(node.r, math.hypot(view_width, view_height) / math.sqrt(2))
+        cx, cy = _length(node.cx, view_width), _length(node.cy, view_height)
+        return "ellipse", (cx, cy, r, r), (cx - r, cy - r, 2 * r, 2 * r)
+    if isinstance(node, Ellipse):
+        rx, ry = _length(node.rx, view_width), _length(node.ry, view_height)
+        cx, cy = _length(node.cx, view_width), _length(node.cy, view_height)
+        return "ellipse", (cx, cy, rx, ry), (cx - rx, cy - ry, 2 * rx, 2 * ry)
+    if isinstance(node, Rect):
+        x, y = _length(node.x, view_width), _length(node.y, view_height)
+        width, height = _length(node.width, view_width), _length(node.height, view_height)
+        return "rect", (x, y, width, height), (x, y, width, height)
+
+    if isinstance(node, Line):
+        subpaths = [(np.array([[node.x1, node.y1], [node.x2, node.y2]], dtype=float), False)]
+        fillable = False
+    elif isinstance(node, Polygon):
+        subpaths = [(np.array(node.points, dtype=float).reshape(-1, 2), True)]
+        fillable = True
+    elif isinstance(node, Path):
+        subpaths = [(np.array(points, dtype=float), closed)
+                    for points, closed in flatten_path(node.d, tolerance)]
+        fillable = True
+    elif isinstance(node, Element) and node.tag == "rect":  # 圓角矩形
+        attrs = node.attrs
+        x, y = _length(attrs.get("x", 0), view_width), _length(attrs.get("y", 0), view_height)
+        width = _length(attrs.get("width", 0), view_width)
+        height = _length(attrs.get("height", 0), view_height)
+        if width <= 0 or height <= 0:
+            return None
+        d = _rounded_rect_path(x, y, width, height, _length(attrs.get("rx", 0), view_width),
+                               _length(attrs.get("ry", 0), view_height))
+        subpaths = [(np.array(points, dtype=float), closed)
+                    for points, closed in flatten_path(d, tolerance)]
+        fillable = True
+    elif isinstance(node, Element) and node.tag == "polyline":
+        subpaths = [(np.array(_load_points(node.attrs.get("points", "")), dtype=float).reshape(-1, 2),
+                     False)]
+        fillable = True
+    else:
+        return None
+
+    subpaths = [(points, closed) for points, closed in subpaths if len(points)]
+    if not subpaths:
+        return None
+    allpoints = np.concatenate([points for points, _ in subpaths])
+    low, high = allpoints.min(axis=0), allpoints.max(axis=0)
+    return ("path" if fillable else "line"), subpaths, (*low, *(high - low))
+
+
+INHERITED_STYLE = {
+    "fill": "#000", "fill-opacity": "1", "fill-rule": "nonzero", "stroke": "none",
+    "stroke-opacity": "1", "stroke-width": "1", "stroke-linecap": "butt", "visibility": "visible",
+}
+
+
+def _push_layer(ops, layer, opacity):
+    """把以 opacity 合成的 layer 加入 ops
+
+    圖層只有一個不會自我重疊的繪製（只有填色或只有筆畫的圖形、或另一個圖層）時，
+    直接把 opacity 乘進去，結果與離屏合成相同，省下圖層緩衝區。
+    """
+    if not layer:
+        return
+    if opacity >= 1:
+        ops.extend(layer)
+        return
+    if len(layer) == 1:
+        [op] = layer
+        if isinstance(op, LayerOp):
+            op.opacity *= opacity
+            ops.append(op)
+            return
+        if op.fill is None or op.stroke is None:
+            op.fill_alpha *= opacity
+            op.stroke_alpha *= opacity
+            ops.append(op)
+            return
+    ops.append(LayerOp(opacity, layer))
+
+
+def _compile_nodes(nodes, style, matrix, viewbox, gradients, tolerance, ops):
+    for node in nodes:
+        if isinstance(node, (LinearGradient, RadialGradient, Text)):
+            continue
+        attrs = _split_style(dict(node.attrs))
+        if attrs.get("display") == "none":
+            continue
+        node_style = {**style, **{key: attrs[key] for key in INHERITED_STYLE if key in attrs}}
+        node_matrix = matrix @ parse_transform(attrs["transform"]) if "transform" in attrs else matrix
+        opacity = min(max(float(attrs.get("opacity", 1)), 0.0), 1.0)
+        if opacity <= 0:
+            continue
+
+        if isinstance(node, Element) and node.tag in SHAPE_TAGS and node.tag not in ("rect", "polyline"):
+            # 帶 <animate> 等子元素的圖形：以靜態屬性繪製
+            node = _load_node(ET.Element(node.tag, node.attrs))
+        if isinstance(node, (Group, Element)) and not (isinstance(node, Element)
+                                                      and node.tag in SHAPE_TAGS):
+            if getattr(node, "tag", "g") not in ("defs", "clipPath", "mask", "pattern", "symbol", "marker"):
+                layer = []
+                _compile_nodes(node.children, node_style, node_matrix,
+                               viewbox, gradients, tolerance, layer)
+                _push_layer(ops, layer, opacity)
+            continue
+        if node_style["visibility"] != "visible":
+            continue
+
+        geometry = _node_geometry(node, viewbox, tolerance)
+        if geometry is None:
+            continue
+        kind, shape, bbox = geometry
+        op = DrawOp(kind, shape, bbox, node_matrix, node_style)
+        op.fill = None if kind == "line" else _resolve_paint(op.fill, gradients)
+        op.stroke = _resolve_paint(op.stroke, gradients) if op.stroke_width > 0 else None
+        if op.fill is not None or op.stroke is not None:
+            # 圖形本身的 opacity 同樣作用在填色與筆畫合成後的結果
+            _push_layer(ops, [op], opacity)
+
+
+def _viewbox(attrs, default=(0.0, 0.0, 400.0, 300.0)):
+    numbers = [float(n) for n in NUMBER_RE.findall(attrs.get("viewBox", ""))]
+    if len(numbers) == 4 and numbers[2] > 0 and numbers[3] > 0:
+        return tuple(numbers)
+    width, height = _length(attrs.get("width", default[2])), _length(attrs.get("height", default[3]))
+    return (0.0, 0.0, width or default[2], height or default[3])
+
+
+def compile_scene(scene, tolerance):
+    """把場景整理成繪製清單：(viewBox, preserveAspectRatio, [DrawOp 或 LayerOp])"""
+    viewbox = _viewbox(scene.attrs)
+    ops = []
+    _compile_nodes(scene.children, INHERITED_STYLE, np.eye(3), viewbox,
+                   collect_gradients(scene), tolerance, ops)
+    return viewbox, scene.attrs.get("preserveAspectRatio", "xMidYMid meet"), ops
+
+
+def _viewport_matrix(viewbox, preserve, width, height):
+    """viewBox → 輸出像素的矩陣（支援 none 與預設的置中 meet）"""
+    x, y, view_width, view_height = viewbox
+    sx, sy = width / view_width, height / view_height
+    if not preserve.startswith("none"):
+        sx = sy = min(sx, sy) if "slice" not in preserve else max(sx, sy)
+    tx = (width - view_width * sx) / 2 - x * sx
+    ty = (height - view_height * sy) / 2 - y * sy
+    return _affine(sx, 0, 0, sy, tx, ty)
+
+
+def _window(sorted_centers, low, high):
+    return np.searchsorted(sorted_centers, low), np.searchsorted(sorted_centers, high, "right")
+
+
+def _segment_distance(px, py, edges, margin, caps=None):
+    """各像素到線段集合的最短距離（只計算各線段外框 + margin 內的像素）"""
+    dist = np.full((len(py), len(px)), np.inf, dtype=np.float32)
+    for index, (x0, y0, x1, y1) in enumerate(edges.tolist()):
+        c0, c1 = _window(px, min(x0, x1) - margin, max(x0, x1) + margin)
+        r0, r1 = _window(py, min(y0, y1) - margin, max(y0, y1) + margin)
+        if c0 >= c1 or r0 >= r1:
+            continue
+        dx, dy = x1 - x0, y1 - y0
+        X = px[None, c0:c1] - x0
+        Y = py[r0:r1, None] - y0
+        length2 = dx * dx + dy * dy
+        t = (X * dx + Y * dy) / length2 if length2 else np.zeros_like(X * Y)
+        clamped = np.clip(t, 0.0, 1.0)
+        d = np.hypot(X - clamped * dx, Y - clamped * dy)
+        if caps is not None:
+            butt_start, butt_end = caps[index]
+            if butt_start:
+                d[t < 0] = np.inf
+            if butt_end:
+                d[t > 1] = np.inf
+        window = dist[r0:r1, c0:c1]
+        np.minimum(window, d, out=window)
+    return dist
+
+
+def _fill_coverage(px, py, edges, evenodd):
+    """以掃描線計算環繞數（nonzero／evenodd），再以到邊的距離做抗鋸齒"""
+    winding = np.zeros((len(py), len(px)), dtype=np.int32)
+    for x0, y0, x1, y1 in edges.tolist():
+        if y0 == y1:
+            continue
+        r0, r1 = np.searchsorted(py, min(y0, y1)), np.searchsorted(py, max(y0, y1))
+        if r0 == r1:
+            continue
+        crossing = x0 + (py[r0:r1] - y0) * (x1 - x0) / (y1 - y0)
+        winding[r0:r1] += np.where(px[None, :] < crossing[:, None], 1 if y1 > y0 else -1, 0)
+    inside = (winding % 2 == 1) if evenodd else (winding != 0)
+    dist = _segment_distance(px, py, edges, 1.0)
+    return np.clip(0.5 + np.where(inside, dist, -dist), 0.0, 1.0)
+
+
+def _path_edges(subpaths, device, close):
+    """把子路徑轉到輸出像素座標，回傳線段陣列與每段的端點是否為 butt"""
+    edges, caps = [], []
+    for points, closed in subpaths:
+        points = points @ device[:2, :2].T + device[:2, 2]
+        if close or closed:
+            points = np.vstack([points, points[:1]])
+        if len(points) == 1:
+            points = np.vstack([points, points])
+        segments = np.hstack([points[:-1], points[1:]])
+        edges.append(segments)
+        open_path = not (close or closed)
+        caps.extend((open_path and i == 0, open_path and i == len(segments) - 1)
+                    for i in range(len(segments)))
+    return np.vstack(edges), caps
+
+
+def _paint_rgba(paint, alpha, px, py, inverse, bbox, viewbox):
+    """回傳 (R, G, B 三個純量或平面, alpha)"""
+    if not isinstance(paint, dict):
+        return paint[:3], paint[3] * alpha
+
+    # 像素中心 → 圖形的區域座標 → 漸層座標（objectBoundingBox 時正規化到外框）
+    x = inverse[0][0] * px[None, :] + inverse[0][1] * py[:, None] + inverse[0][2]
+    y = inverse[1][0] * px[None, :] + inverse[1][1] * py[:, None] + inverse[1][2]
+    attrs = paint["attrs"]
+    if paint["user_space"]:
+        width, height = viewbox[2], viewbox[3]
+    else:
+        width, height = 1.0, 1.0
+        x = (x - bbox[0]) / (bbox[2] or 1.0)
+        y = (y - bbox[1]) / (bbox[3] or 1.0)
+    if not np.array_equal(paint["transform"], np.eye(3)):
+        g = np.linalg.inv(paint["transform"]).tolist()
+        x, y = g[0][0] * x + g[0][1] * y + g[0][2], g[1][0] * x + g[1][1] * y + g[1][2]
+
+    if paint["kind"] == "linear":
+        x1, x2 = _length(attrs["x1"], width), _length(attrs["x2"], width)
+        y1, y2 = _length(attrs["y1"], height), _length(attrs["y2"], height)
+        dx, dy = x2 - x1, y2 - y1
+        length2 = dx * dx + dy * dy or 1.0
+        t = ((x - x1) * dx + (y - y1) * dy) / length2
+    else:
+        cx, cy = _length(attrs["cx"], width), _length(attrs["cy"], height)
+        r = _length(attrs["r"], math.hypot(width, height) / math.sqrt(2)) or 1e-9
+        t = np.hypot(x - cx, y - cy) / r
+    index = (np.clip(t, 0.0, 1.0) * (GRADIENT_STEPS - 1) + 0.5).astype(np.intp)
+    red, green, blue, opacity = paint["table"].T[:, index]
+    return (red, green, blue), opacity * alpha
+
+
+def _composite(region, coverage, rgb, alpha):
+    """source-over 合成到（預乘 alpha、依色版分開存放的）畫布區域"""
+    source = coverage * alpha
+    for plane, color in zip(region, (*rgb, 1.0)):
+        plane += (color - plane) * source
+
+
+def _op_bounds(op, view):
+    """繪製在輸出像素上可能影響的範圍 (x0, y0, x1, y1)（含筆畫寬度與抗鋸齒），
+    圖層為所有子繪製的聯集；不會畫出任何東西時回傳 None"""
+    if isinstance(op, LayerOp):
+        bounds = [b for b in (_op_bounds(child, view) for child in op.ops) if b is not None]
+        if not bounds:
+            return None
+        x0, y0, x1, y1 = zip(*bounds)
+        return min(x0), min(y0), max(x1), max(y1)
+    device = view @ op.matrix
+    determinant = abs(np.linalg.det(device[:2, :2]))
+    if not determinant:
+        return None
+    half = op.stroke_width * math.sqrt(determinant) / 2 if op.stroke is not None else 0.0
+    bx, by, bw, bh = op.bbox
+    corners = np.array([[bx, by, 1], [bx + bw, by, 1], [bx, by + bh, 1], [bx + bw, by + bh, 1]])
+    corners = corners @ device.T
+    return (corners[:, 0].min() - half - 1, corners[:, 1].min() - half - 1,
+            corners[:, 0].max() + half + 1, corners[:, 1].max() + half + 1)
+
+
+def render_ops(compiled, width, height):
+    """把繪製清單畫成 width × height 的 RGBA 陣列（uint8）"""
+    viewbox, preserve, ops = compiled
+    view = _viewport_matrix(viewbox, preserve, width, height)
+    canvas = np.zeros((4, height, width), dtype=np.float32)
+    centers_x = np.arange(width, dtype=np.float32) + 0.5
+    centers_y = np.arange(height, dtype=np.float32) + 0.5
+    _draw_ops(canvas, ops, view, viewbox, centers_x, centers_y)
+
+    alpha = canvas[3]
+    canvas[:3] = np.divide(canvas[:3], alpha, out=np.zeros_like(canvas[:3]), where=alpha > 0)
+    return (np.clip(canvas, 0, 1) * 255 + 0.5).astype(np.uint8).transpose(1, 2, 0)
+
+
+def _draw_ops(canvas, ops, view, viewbox, centers_x, centers_y):
+    """依序把 ops 合成到 canvas（預乘 alpha 的 4 × 高 × 寬 區域，像素中心為 centers_x／y）"""
+    for op in ops:
+        # 只處理圖形外框（加上筆畫寬度）範圍內的像素
+        bounds = _op_bounds(op, view)
+        if bounds is None:
+            continue
+        c0, c1 = _window(centers_x, bounds[0], bounds[2])
+        r0, r1 = _window(centers_y, bounds[1], bounds[3])
+        if c0 >= c1 or r0 >= r1:
+            continue
+        px, py = centers_x[c0:c1], centers_y[r0:r1]
+        region = canvas[:, r0:r1, c0:c1]
+
+        if isinstance(op, LayerOp):
+            # 離屏圖層只配置到子繪製的範圍，畫完以 opacity 做一次 source-over
+            layer = np.zeros_like(region)
+            _draw_ops(layer, op.ops, view, viewbox, px, py)
+            region *= 1 - op.opacity * layer[3]
+            region += op.opacity * layer
+            continue
+
+        device = view @ op.matrix
+        inverse = np.linalg.inv(device).tolist()  # 純量運算保持 float32
+        scale = math.sqrt(abs(np.linalg.det(device[:2, :2])))
+        half = op.stroke_width * scale / 2 if op.stroke is not None else 0.0
+
+        fill = stroke = None
+        if op.kind in ("ellipse", "rect"):
+            # 解析式的有號距離（像素，內部為負）
+            lx = inverse[0][0] * px[None, :] + inverse[0][1] * py[:, None] + inverse[0][2]
+            ly = inverse[1][0] * px[None, :] + inverse[1][1] * py[:, None] + inverse[1][2]
+            if op.kind == "ellipse":
+                cx, cy, rx, ry = op.geometry
+                if rx <= 0 or ry <= 0:
+                    continue
+                ux, uy = (lx - cx) / rx, (ly - cy) / ry
+                k0 = np.maximum(np.hypot(ux, uy), 1e-12)
+                gx, gy = ux / (rx * k0), uy / (ry * k0)
+                gradient = np.hypot(gx * inverse[0][0] + gy * inverse[1][0],
+                                    gx * inverse[0][1] + gy * inverse[1][1])
+                distance = (k0 - 1) / np.maximum(gradient, 1e-12)
+            else:
+                x, y, w, h = op.geometry
+                if w <= 0 or h <= 0:
+                    continue
+                dx = np.maximum(x - lx, lx - x - w)
+                dy = np.maximum(y - ly, ly - y - h)
+                distance = (np.hypot(np.maximum(dx, 0), np.maximum(dy, 0))
+                            + np.minimum(np.maximum(dx, dy), 0)) * scale
+            if op.fill is not None:
+                fill = np.clip(0.5 - distance, 0.0, 1.0)
+            if op.stroke is not None:
+                stroke = np.clip(half + 0.5 - np.abs(distance), 0.0, 1.0)
+        else:
+            if op.fill is not None:
+                edges, _ = _path_edges(op.geometry, device, close=True)
+                fill = _fill_coverage(px, py, edges, op.evenodd)
+            if op.stroke is not None:
+                edges, caps = _path_edges(op.geometry, device, close=False)
+                distance = _segment_distance(px, py, edges, half + 1.0,
+                                             caps if op.butt else None)
+                stroke = np.clip(half + 0.5 - distance, 0.0, 1.0)
+
+        for coverage, paint, alpha in ((fill, op.fill, op.fill_alpha),
+                                       (stroke, op.stroke, op.stroke_alpha)):
+            if coverage is not None:
+                rgb, paint_alpha = _paint_rgba(paint, alpha, px, py, inverse, op.bbox, viewbox)
+                _composite(region, coverage, rgb, paint_alpha)
+
+
+def _png_chunk(kind, data):
+    return (struct.pack(">I", len(data)) + kind + data
+            + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+
+def encode_png(pixels):
+    """把 RGBA 陣列編碼為 PNG（只用標準函式庫，不需要 Pillow）"""
+    height, width, _ = pixels.shape
+    raw = np.hstack([np.zeros((height, 1), dtype=np.uint8), pixels.reshape(height, width * 4)])
+    return (b"\x89PNG\r\n\x1a\n"
+            + _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0))
+            + _png_chunk(b"IDAT", zlib.compress(raw.tobytes(), 6))
+            + _png_chunk(b"IEND", b""))
+
+
+def encode_raster(image, fmt):
+    """以 Pillow 將點陣圖編碼為指定格式"""
+    spec = RASTER_FORMATS[fmt]
+    buffer = io.BytesIO()
+    image.save(buffer, spec["pillow"], **spec["options"])
+    return buffer.getvalue()
+
+
+def rasterize_scenes(jobs):
+    """批次繪製：jobs 為 [(SVG 字串, [(寬, 高), ...])]，回傳對應的 [[RGBA 陣列, ...]]
+
+    每張場景只解析、展平一次（依最大尺寸決定曲線精細度），再繪製所有尺寸。
+    """
+    if np is None:
+        raise RuntimeError("內建點陣化需要 NumPy（pip install numpy）")
+    results = []
+    for svg, sizes in jobs:
+        scene = load_scene(svg)
+        viewbox = _viewbox(scene.attrs)
+        max_scale = max((max(w / viewbox[2], h / viewbox[3]) for w, h in sizes), default=1.0)
+        compiled = compile_scene(scene, CURVE_TOLERANCE / max_scale)
+        results.append([render_ops(compiled, width, height) for width, height in sizes])
+    return results
+
+
+def render_png_numpy(svg, sizes):
+    """以內建點陣化繪製多個尺寸，回傳 {(寬, 高): PNG 位元組}"""
+    [images] = rasterize_scenes([(svg, sizes)])
+    return {size: encode_png(image) for size, image in zip(sizes, images)}
+
+
+# ── 視覺差異閘門 ───────────────────────────────────────────────
+#
+# SVG 的雜湊變了不代表畫面變了：調整註解、屬性順序或肉眼看不出的座標
+# 都會讓整組點陣圖重新產生、重新上傳。建置時先以內建點陣化繪製一張
+# 低解析度探針，和上次保存在建置清單中的探針逐像素比較，差異在門檻內
+# 就保留舊的點陣圖檔案（位元組完全不變），只更新 SVG。
+
+def raster_settings(settings):
+    """點陣圖輸出所依據的設定；和上次不同時不可沿用舊的點陣圖"""
+    return {key: settings[key] for key in ("png", "quantize", "placeholder", "responsive")
+            if key in settings}
+
+
+def render_probe(svg, width=PROBE_WIDTH, height=PROBE_HEIGHT):
+    """繪製低解析度探針：疊在白底上的 RGB 陣列（透明區域的顏色不影響比較）"""
+    [[pixels]] = rasterize_scenes([(svg, [(width, height)])])
+    alpha = pixels[..., 3:].astype(np.float32) / 255
+    rgb = pixels[..., :3].astype(np.float32) * alpha + 255 * (1 - alpha)
+    return np.round(rgb).astype(np.uint8)
+
+
+def encode_probe(probe):
+    """把探針壓縮成可存入建置清單的 JSON 物件"""
+    height, width = probe.shape[:2]
+    data = base64.b64encode(zlib.compress(probe.tobytes(), 9)).decode('ascii')
+    return {"width": width, "height": height, "data": data}
+
+
+def decode_probe(record):
+    """還原 encode_probe 的結果；格式不符時回傳 None"""
+    try:
+        raw = zlib.decompress(base64.b64decode(record["data"]))
+        return np.frombuffer(raw, dtype=np.uint8).reshape(record["height"], record["width"], 3)
+    except (KeyError, TypeError, ValueError, zlib.error):
+        return None
+
+
+def probe_difference(old, new):
+    """逐像素比較兩張探針，回傳 (最大單一通道差異, 平均差異)"""
+    diff = np.abs(old.astype(np.int16) - new.astype(np.int16))
+    return int(diff.max()), float(diff.mean())
+
+
+def reusable_rasters(previous, probe, settings, animal_dir):
+    """判斷上次的點陣圖能否沿用
+
+    Returns:
+        (可沿用的點陣圖檔名, 最大差異, 平均差異)；無法比較時差異為 None，
+        超過門檻或條件不符時檔名為空串列
+    """
+    if not previous or previous.get("raster_settings") != raster_settings(settings):
+        return [], None, None
+    old = decode_probe(previous.get("probe") or {})
+    if old is None or old.shape != probe.shape:
+        return [], None, None
+    max_diff, mean_diff = probe_difference(old, probe)
+    rasters = [name for name in previous.get("outputs", []) if not name.startswith("main.svg")]
+    if (max_diff > settings["probe"]["max_diff"] or not rasters
+            or not all(os.path.isfile(os.path.join(animal_dir, name)) for name in rasters)):
+        return [], max_diff, mean_diff
+    return rasters, max_diff, mean_diff
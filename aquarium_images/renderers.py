@@ -0,0 +1,220 @@
+"""點陣化工具：選擇可用的工具，並以 asyncio 子行程平行執行外部工具"""
+
+import asyncio
+import contextlib
+import functools
+import itertools
+import os
+import re
+import shutil
+import signal
+import subprocess
+import time
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 為選用套件，缺少時不提供內建點陣化
+    np = None
+
+from .common import (
+    EXTERNAL_RENDERERS, IMAGES_DIR, NUMPY_RENDERER, NUMPY_RENDERER_VERSION, PNG_HEIGHT, PNG_WIDTH,
+    RENDERERS, RENDER_RETRIES, RENDER_RETRY_DELAY, RENDER_TIMEOUT, RSVG_CONVERT, write_if_changed,
+)
+
+
+# ── 外部點陣化工具（asyncio） ──────────────────────────────────
+#
+# 外部工具以 asyncio 子行程執行：SVG 經由 stdin 串流進去、PNG 從 stdout
+# 讀回，不落地暫存檔。工作放進有界佇列，由固定數量的消費者取出執行，
+# 佇列滿時生產者會等待（背壓），同時執行的行程數不會超過上限；
+# 單次執行逾時就終止該行程並重試，不會讓一個卡住的工具拖住整批建置。
+
+@functools.lru_cache(maxsize=None)
+def renderer_version(renderer):
+    """點陣化工具的版本：內建點陣化為 NUMPY_RENDERER_VERSION，外部工具取 --version 輸出的
+    第一行（每個行程只執行一次）；無法取得時回傳 None"""
+    if renderer == NUMPY_RENDERER:
+        return NUMPY_RENDERER_VERSION
+    try:
+        completed = subprocess.run([renderer, "--version"], stdin=subprocess.DEVNULL,
+                                   capture_output=True, timeout=RENDER_TIMEOUT, check=True)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    output = (completed.stdout or completed.stderr).decode("utf-8", "replace").strip()
+    return output.splitlines()[0] if output else None
+
+
+def select_renderer(requested="auto"):
+    """決定點陣化工具：auto 時依 RENDERERS 的順序選擇第一個可用的工具
+    （rsvg-convert、resvg、Inkscape，最後是內建的 NumPy 點陣化），並記下所選工具的版本
+
+    Returns:
+        RENDERERS 其中之一；指定的工具無法使用時回傳 None
+    """
+    for renderer in RENDERERS:
+        if requested not in ("auto", renderer):
+            continue
+        if renderer == NUMPY_RENDERER:
+            if np is not None:
+                return renderer
+        elif shutil.which(renderer):
+            renderer_version(renderer)
+            return renderer
+    return None
+
+
+def svg_aspect_ratio(svg):
+    """從 viewBox 取得高寬比，找不到時沿用 main.png 的比例"""
+    match = re.search(r'viewBox="[-\d.]+[ ,]+[-\d.]+[ ,]+([\d.]+)[ ,]+([\d.]+)"', svg)
+    if not match or not float(match.group(1)):
+        return PNG_HEIGHT / PNG_WIDTH
+    return float(match.group(2)) / float(match.group(1))
+
+
+def renderer_command(renderer, width, height):
+    """組出外部工具的命令列"""
+    return [arg.format(width=width, height=height) for arg in EXTERNAL_RENDERERS[renderer]]
+
+
+async def run_renderer(renderer, svg, width, height, timeout=RENDER_TIMEOUT):
+    """執行一次外部工具，回傳 PNG 位元組
+
+    Raises:
+        subprocess.TimeoutExpired: 超過 timeout 秒（行程已被終止）
+        subprocess.CalledProcessError: 結束碼非 0 或輸出不是 PNG
+    """
+    command = renderer_command(renderer, width, height)
+    process = await asyncio.create_subprocess_exec(
+        *command,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        start_new_session=hasattr(os, "killpg"),
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(svg), timeout)
+    except asyncio.TimeoutError:
+        # 連同工具自己產生的子行程一起終止，否則它們會佔住管線
+        if hasattr(os, "killpg"):
+            with contextlib.suppress(ProcessLookupError):
+                os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+        await process.wait()
+        raise subprocess.TimeoutExpired(command, timeout) from None
+    if process.returncode or not stdout.startswith(b"\x89PNG\r\n\x1a\n"):
+        raise subprocess.CalledProcessError(process.returncode or 1, command, stdout,
+                                            stderr or "輸出不是 PNG".encode('utf-8'))
+    return stdout
+
+
+async def render_with_retries(renderer, svg, width, height, timeout=RENDER_TIMEOUT,
+                              retries=RENDER_RETRIES, delay=RENDER_RETRY_DELAY):
+    """執行外部工具，逾時或失敗時等待後重試（等待時間逐次加倍）；找不到工具時不重試"""
+    for attempt in itertools.count():
+        try:
+            return await run_renderer(renderer, svg, width, height, timeout)
+        except FileNotFoundError:
+            raise
+        except (OSError, subprocess.SubprocessError):
+            if attempt >= retries:
+                raise
+            await asyncio.sleep(delay * 2 ** attempt)
+
+
+async def render_queue(jobs, renderer, concurrency=1, handle=None, timeout=RENDER_TIMEOUT,
+                       retries=RENDER_RETRIES):
+    """以有界佇列平行執行外部工具
+
+    Args:
+        jobs: 可迭代的 (鍵, SVG 位元組, 寬, 高)，可以是逐一讀檔的產生器
+        renderer: EXTERNAL_RENDERERS 其中之一
+        concurrency: 同時執行的外部行程數
+        handle: 每完成一筆就呼叫 handle(鍵, PNG 位元組)，回傳值取代 PNG 存入結果
+            （例如直接寫檔，不在記憶體中累積整批 PNG）
+
+    Returns:
+        {鍵: PNG 位元組或 handle 的回傳值}；失敗的工作為對應的例外
+    """
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+    results = {}
+
+    async def consume():
+        while True:
+            job = await queue.get()
+            try:
+                if job is None:
+                    return
+                key, svg, width, height = job
+                try:
+                    data = await render_with_retries(renderer, svg, width, height, timeout, retries)
+                    results[key] = handle(key, data) if handle else data
+                except (OSError, subprocess.SubprocessError) as e:
+                    results[key] = e
+            finally:
+                queue.task_done()
+
+    consumers = [asyncio.create_task(consume()) for _ in range(max(1, concurrency))]
+    for job in jobs:
+        await queue.put(job)
+    for _ in consumers:
+        await queue.put(None)
+    await asyncio.gather(*consumers)
+    return results
+
+
+def render_external(jobs, renderer, concurrency=1, handle=None, timeout=RENDER_TIMEOUT,
+                    retries=RENDER_RETRIES):
+    """render_queue 的同步版本，參數與回傳值相同"""
+    return asyncio.run(render_queue(jobs, renderer, concurrency, handle, timeout, retries))
+
+
+def render_png(svg, width, height, renderer=RSVG_CONVERT):
+    """以外部工具把 SVG（字串或位元組）轉換為 PNG 位元組"""
+    data = svg.encode('utf-8') if isinstance(svg, str) else svg
+    return asyncio.run(render_with_retries(renderer, data, width, height))
+
+
+def render_tree(root_dir=IMAGES_DIR, renderer="auto", jobs=None):
+    """把目錄下所有 main.svg 重新點陣化為同目錄的 main.png
+
+    SVG 在佇列有空位時才逐一讀入，PNG 完成後立即寫檔，記憶體用量與檔案數無關。
+
+    Returns:
+        {SVG 路徑: 是否改寫了 main.png 或失敗的例外}；找不到外部工具時回傳 None
+    """
+    renderer = select_renderer(renderer)
+    if renderer not in EXTERNAL_RENDERERS:
+        print(f"❌ 找不到外部點陣化工具（{'、'.join(EXTERNAL_RENDERERS)}）")
+        return None
+    concurrency = jobs or os.cpu_count() or 1
+    paths = sorted(
+        os.path.join(dirpath, "main.svg")
+        for dirpath, _, names in os.walk(root_dir)
+        if "main.svg" in names
+    )
+    print(f"🖨️  以 {renderer} 點陣化 {root_dir} 下的 {len(paths)} 張 SVG"
+          f"（同時 {concurrency} 個行程，逾時 {RENDER_TIMEOUT} 秒，重試 {RENDER_RETRIES} 次）...")
+
+    def read_jobs():
+        for path in paths:
+            with open(path, encoding='utf-8') as f:
+                svg = f.read()
+            yield path, svg.encode('utf-8'), PNG_WIDTH, round(PNG_WIDTH * svg_aspect_ratio(svg))
+
+    def save(path, data):
+        return write_if_changed(os.path.join(os.path.dirname(path), "main.png"), data)
+
+    started = time.perf_counter()
+    results = render_external(read_jobs(), renderer, concurrency, save)
+    elapsed = time.perf_counter() - started
+    failed = {path: e for path, e in results.items() if isinstance(e, Exception)}
+    for path, e in failed.items():
+        detail = getattr(e, "stderr", None) or str(e)
+        if isinstance(detail, bytes):
+            detail = detail.decode("utf-8", "replace").strip()
+        print(f"❌ 點陣化失敗: {os.path.relpath(path, root_dir)} - {detail}")
+    written = sum(1 for result in results.values() if result is True)
+    print(f"\n🎉 完成！{len(paths) - len(failed)}/{len(paths)} 張，實際寫入 {written} 個檔案，"
+          f"{elapsed:.2f} 秒（{len(paths) / elapsed if elapsed else 0:.1f} 張/秒）")
+    return results
@@ -0,0 +1,616 @@
+"""場景：磁碟上的場景目錄、SVG 物件模型、串流寫出與共用的背景／裝飾圖層"""
+
+import functools
+import hashlib
+import io
+import itertools
+import json
+import os
+import xml.etree.ElementTree as ET
+from collections.abc import Mapping
+
+from .common import CATALOG_INDEX_NAME, SCENES_DIR, STREAM_BUFFER_SIZE
+from .svg import NUMBER_RE, SVG_NS, TEXT_ELEMENTS, collapse_text, escape_xml, local_name
+
+
+# ── 場景目錄 ───────────────────────────────────────────────────
+#
+# 場景定義存放在 scenes/<收藏>/：index.json 依順序列出每個場景的 id、檔案與
+# layers（疊在前景下方的共用背景與裝飾，見 LAYERS），前景 SVG 各自一個檔案。
+# 匯入時只讀索引，場景內容在第一次存取時才讀取。
+
+class SceneCatalog(Mapping):
+    """磁碟上的場景目錄：{場景 id: {"layers": [...], "svg": 前景 SVG}}
+
+    索引在建立時讀入，前景 SVG 在第一次存取該場景時才讀取並快取。
+    """
+
+    __slots__ = ("directory", "index", "_scenes")
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, CATALOG_INDEX_NAME), encoding='utf-8') as f:
+            self.index = {entry["id"]: entry for entry in json.load(f)["scenes"]}
+        self._scenes = {}
+
+    def __getitem__(self, scene_id):
+        scene = self._scenes.get(scene_id)
+        if scene is None:
+            entry = self.index[scene_id]
+            with open(self.path(scene_id), encoding='utf-8', newline='') as f:
+                # 檔尾換行只是方便編輯，不屬於場景內容
+                svg = f.read().rstrip("\n")
+            scene = self._scenes[scene_id] = {"layers": list(entry.get("layers", ())), "svg": svg}
+        return scene
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+    def path(self, scene_id):
+        """場景前景 SVG 的檔案路徑"""
+        return os.path.join(self.directory, self.index[scene_id].get("file", f"{scene_id}.svg"))
+
+    def files(self):
+        """索引與所有場景檔的路徑（監看模式使用）"""
+        return [os.path.join(self.directory, CATALOG_INDEX_NAME)] + [self.path(i) for i in self.index]
+
+
+# 15 隻水族館動物（可愛童話風格）
+ANIMALS = SceneCatalog(os.path.join(SCENES_DIR, "aquarium"))
+
+
+# ── 場景物件模型 ───────────────────────────────────────────────
+#
+# 把 SVG 字串載入成以 __slots__ 組成的輕量物件，後續的變換（縮放、換色、
+# 合併、分析）直接操作物件，不必每次重新解析 XML。序列化時每個元素
+# 直接寫入檔案 handle，不經過 ElementTree 或字串串接。
+
+def fmt_number(value):
+    """輸出數字：整數不帶小數點，其餘使用最短的 repr；非數字原樣輸出"""
+    if value.__class__ is float:
+        integer = int(value)
+        return str(integer) if integer == value else repr(value)
+    return str(value)
+
+
+def parse_number(value, default=0.0):
+    """解析數字屬性；百分比等非純數字值保留原字串"""
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return value.strip()
+
+
+def attr_text(attrs):
+    """序列化其餘屬性（呈現屬性、transform 等）"""
+    if not attrs:
+        return ""
+    parts = []
+    for name, value in attrs.items():
+        if '"' in value or "&" in value or "<" in value:
+            value = escape_xml(value, quote=True)
+        parts.append(f' {name}="{value}"')
+    return "".join(parts)
+
+
+class Element:
+    """通用元素：保留模型沒有特別對應的標籤（g 以外的容器、animate 等）"""
+    __slots__ = ("tag", "attrs", "children", "text", "tail")
+
+    def __init__(self, tag, attrs=None, children=None, text="", tail=""):
+        self.tag = tag
+        self.attrs = attrs or {}
+        self.children = children or []
+        self.text = text
+        self.tail = tail
+
+    def write(self, write):
+        if not self.children and not self.text:
+            write(f"<{self.tag}{attr_text(self.attrs)}/>{escape_xml(self.tail)}")
+            return
+        write(f"<{self.tag}{attr_text(self.attrs)}>{escape_xml(self.text)}")
+        for child in self.children:
+            child.write(write)
+        write(f"</{self.tag}>{escape_xml(self.tail)}")
+
+
+class Shape:
+    """基本圖形；attrs 存放幾何以外的屬性（fill、stroke、opacity、transform…）"""
+    __slots__ = ("attrs",)
+    TAG = ""
+
+
+class Group(Shape):
+    __slots__ = ("children",)
+    TAG = "g"
+
+    def __init__(self, children=None, attrs=None):
+        self.children = children or []
+        self.attrs = attrs or {}
+
+    def write(self, write):
+        write(f"<g{attr_text(self.attrs)}>")
+        for child in self.children:
+            child.write(write)
+        write("</g>")
+
+
+class Circle(Shape):
+    __slots__ = ("cx", "cy", "r")
+    TAG = "circle"
+
+    def __init__(self, cx, cy, r, attrs=None):
+        self.cx, self.cy, self.r = cx, cy, r
+        self.attrs = attrs or {}
+
+    def write(self, write):
+        write(f'<circle cx="{fmt_number(self.cx)}" cy="{fmt_number(self.cy)}" '
+              f'r="{fmt_number(self.r)}"{attr_text(self.attrs)}/>')
+
+
+class Ellipse(Shape):
+    __slots__ = ("cx", "cy", "rx", "ry")
+    TAG = "ellipse"
+
+    def __init__(self, cx, cy, rx, ry, attrs=None):
+        self.cx, self.cy, self.rx, self.ry = cx, cy, rx, ry
+        self.attrs = attrs or {}
+
+    def write(self, write):
+        write(f'<ellipse cx="{fmt_number(self.cx)}" cy="{fmt_number(self.cy)}" '
+              f'rx="{fmt_number(self.rx)}" ry="{fmt_number(self.ry)}"{attr_text(self.attrs)}/>')
+
+
+class Rect(Shape):
+    __slots__ = ("x", "y", "width", "height")
+    TAG = "rect"
+
+    def __init__(self, x, y, width, height, attrs=None):
+        self.x, self.y, self.width, self.height = x, y, width, height
+        self.attrs = attrs or {}
+
+    def write(self, write):
+        position = ""
+        if self.x:
+            position += f' x="{fmt_number(self.x)}"'
+        if self.y:
+            position += f' y="{fmt_number(self.y)}"'
+        write(f'<rect{position} width="{fmt_number(self.width)}" '
+              f'height="{fmt_number(self.height)}"{attr_text(self.attrs)}/>')
+
+
+class Line(Shape):
+    __slots__ = ("x1", "y1", "x2", "y2")
+    TAG = "line"
+
+    def __init__(self, x1, y1, x2, y2, attrs=None):
+        self.x1, self.y1, self.x2, self.y2 = x1, y1, x2, y2
+        self.attrs = attrs or {}
+
+    def write(self, write):
+        write(f'<line x1="{fmt_number(self.x1)}" y1="{fmt_number(self.y1)}" '
+              f'x2="{fmt_number(self.x2)}" y2="{fmt_number(self.y2)}"{attr_text(self.attrs)}/>')
+
+
+class Path(Shape):
+    __slots__ = ("d",)
+    TAG = "path"
+
+    def __init__(self, d, attrs=None):
+        self.d = d
+        self.attrs = attrs or {}
+
+    def write(self, write):
+        write(f'<path d="{self.d}"{attr_text(self.attrs)}/>')
+
+
+class Polygon(Shape):
+    __slots__ = ("points",)
+    TAG = "polygon"
+
+    def __init__(self, points, attrs=None):
+        self.points = points
+        self.attrs = attrs or {}
+
+    def write(self, write):
+        points = " ".join(f"{fmt_number(x)},{fmt_number(y)}" for x, y in self.points)
+        write(f'<polygon points="{points}"{attr_text(self.attrs)}/>')
+
+
+class Text(Shape):
+    __slots__ = ("x", "y", "content")
+    TAG = "text"
+
+    def __init__(self, x, y, content, attrs=None):
+        self.x, self.y, self.content = x, y, content
+        self.attrs = attrs or {}
+
+    def write(self, write):
+        write(f'<text x="{fmt_number(self.x)}" y="{fmt_number(self.y)}"{attr_text(self.attrs)}>'
+              f'{escape_xml(self.content)}</text>')
+
+
+class Stop:
+    __slots__ = ("offset", "color", "opacity", "attrs")
+
+    def __init__(self, offset, color, opacity=1.0, attrs=None):
+        self.offset, self.color, self.opacity = offset, color, opacity
+        self.attrs = attrs or {}
+
+    def write(self, write):
+        opacity = "" if self.opacity == 1 else f' stop-opacity="{fmt_number(self.opacity)}"'
+        write(f'<stop offset="{fmt_number(self.offset)}" stop-color="{self.color}"{opacity}'
+              f'{attr_text(self.attrs)}/>')
+
+
+class LinearGradient:
+    __slots__ = ("id", "x1", "y1", "x2", "y2", "stops", "attrs")
+    TAG = "linearGradient"
+
+    def __init__(self, id, x1="0", y1="0", x2="100%", y2="0", stops=None, attrs=None):
+        self.id, self.x1, self.y1, self.x2, self.y2 = id, x1, y1, x2, y2
+        self.stops = stops or []
+        self.attrs = attrs or {}
+
+    def write(self, write):
+        write(f'<linearGradient id="{self.id}" x1="{fmt_number(self.x1)}" y1="{fmt_number(self.y1)}" '
+              f'x2="{fmt_number(self.x2)}" y2="{fmt_number(self.y2)}"{attr_text(self.attrs)}>')
+        for stop in self.stops:
+            stop.write(write)
+        write("</linearGradient>")
+
+
+class RadialGradient:
+    __slots__ = ("id", "cx", "cy", "r", "stops", "attrs")
+    TAG = "radialGradient"
+
+    def __init__(self, id, cx="50%", cy="50%", r="50%", stops=None, attrs=None):
+        self.id, self.cx, self.cy, self.r = id, cx, cy, r
+        self.stops = stops or []
+        self.attrs = attrs or {}
+
+    def write(self, write):
+        write(f'<radialGradient id="{self.id}" cx="{fmt_number(self.cx)}" cy="{fmt_number(self.cy)}" '
+              f'r="{fmt_number(self.r)}"{attr_text(self.attrs)}>')
+        for stop in self.stops:
+            stop.write(write)
+        write("</radialGradient>")
+
+
+class Scene:
+    """一張完整的圖：根元素屬性、<defs> 內的定義與依繪製順序排列的元素"""
+    __slots__ = ("attrs", "defs", "children")
+
+    def __init__(self, attrs=None, defs=None, children=None):
+        self.attrs = attrs if attrs is not None else {"viewBox": "0 0 400 300"}
+        self.defs = defs or []
+        self.children = children or []
+
+    def write(self, fh):
+        """單趟序列化，直接寫入檔案 handle（或任何有 write 方法的物件）"""
+        write = fh.write
+        write(f'<svg xmlns="{SVG_NS}"{attr_text(self.attrs)}>')
+        if self.defs:
+            write("<defs>")
+            for definition in self.defs:
+                definition.write(write)
+            write("</defs>")
+        for child in self.children:
+            child.write(write)
+        write("</svg>")
+
+    def to_svg(self):
+        buffer = io.StringIO()
+        self.write(buffer)
+        return buffer.getvalue()
+
+    def chunks(self):
+        """逐一產生 SVG 片段（與 write 的輸出相同），見 stream_svg"""
+        return stream_svg(self.children, self.attrs, self.defs)
+
+    def iter_shapes(self):
+        """依繪製順序逐一取出所有圖形（展開 <g>）"""
+        stack = list(reversed(self.children))
+        while stack:
+            node = stack.pop()
+            yield node
+            if isinstance(node, (Group, Element)):
+                stack.extend(reversed(node.children))
+
+
+def _split_style(attrs):
+    """把 style 內的宣告展開成屬性（style 優先權較高，直接覆寫）"""
+    style = attrs.pop("style", None)
+    if style:
+        for declaration in style.split(";"):
+            prop, _, value = declaration.partition(":")
+            if prop.strip():
+                attrs[prop.strip()] = value.strip()
+    return attrs
+
+
+def _load_points(value):
+    numbers = [float(n) for n in NUMBER_RE.findall(value)]
+    return list(zip(numbers[0::2], numbers[1::2]))
+
+
+def _load_stop(element):
+    return _stop_from_attrs(_element_attrs(element))
+
+
+def _stop_from_attrs(attrs):
+    """<stop> 的屬性 → Stop
+
+    offset、stop-color、stop-opacity 以外的屬性（id、class 等）原樣保留在 Stop.attrs，
+    style 中其餘的宣告也留在 style 裡，寫出時一併輸出。
+    """
+    attrs = dict(attrs)
+    style = {}
+    for declaration in attrs.pop("style", "").split(";"):
+        prop, _, value = declaration.partition(":")
+        if prop.strip():
+            style[prop.strip()] = value.strip()
+    offset = attrs.pop("offset", "0").strip()
+    offset = float(offset[:-1]) / 100 if offset.endswith("%") else float(offset)
+    # style 的宣告優先於同名屬性
+    color = style.pop("stop-color", attrs.pop("stop-color", "#000"))
+    opacity = float(style.pop("stop-opacity", attrs.pop("stop-opacity", "1")))
+    if style:
+        attrs["style"] = ";".join(f"{prop}:{value}" for prop, value in style.items())
+    return Stop(offset, color, opacity, attrs)
+
+
+def _element_attrs(element):
+    attrs = {}
+    for key, value in element.attrib.items():
+        name = local_name(key)
+        if name is None:
+            raise ValueError(f"unsupported namespace: {key}")
+        attrs[name] = value
+    return attrs
+
+
+def _load_node(element):
+    """把 ElementTree 元素轉成場景物件"""
+    tag = local_name(element.tag)
+    if tag is None:
+        raise ValueError(f"unsupported namespace: {element.tag}")
+    attrs = _element_attrs(element)
+    pop = attrs.pop
+
+    # 帶有子元素（例如 <animate>）的圖形保留為通用元素，避免遺失內容
+    shape = tag if len(element) == 0 else None
+
+    if shape == "circle":
+        return Circle(parse_number(pop("cx", None)), parse_number(pop("cy", None)),
+                      parse_number(pop("r", None)), attrs)
+    if shape == "ellipse":
+        return Ellipse(parse_number(pop("cx", None)), parse_number(pop("cy", None)),
+                       parse_number(pop("rx", None)), parse_number(pop("ry", None)), attrs)
+    if shape == "rect" and "rx" not in attrs and "ry" not in attrs:
+        return Rect(parse_number(pop("x", None)), parse_number(pop("y", None)),
+                    parse_number(pop("width", None)), parse_number(pop("height", None)), attrs)
+    if shape == "line":
+        return Line(parse_number(pop("x1", None)), parse_number(pop("y1", None)),
+                    parse_number(pop("x2", None)), parse_number(pop("y2", None)), attrs)
+    if shape == "path" and "d" in attrs:
+        return Path(pop("d").strip(), attrs)
+    if shape == "polygon" and "points" in attrs:
+        return Polygon(_load_points(pop("points")), attrs)
+    if shape == "text":
+        return Text(parse_number(pop("x", None)), parse_number(pop("y", None)),
+                    collapse_text(element.text), attrs)
+    if tag == "g":
+        return Group([_load_node(child) for child in element], attrs)
+    if tag in ("linearGradient", "radialGradient") and "href" not in attrs \
+            and "xlink:href" not in attrs and "id" in attrs \
+            and all(local_name(child.tag) == "stop" and len(child) == 0 for child in element):
+        # 含 <animate> 等其他子元素的漸層以通用 Element 原樣保留
+        stops = [_load_stop(child) for child in element if local_name(child.tag) == "stop"]
+        gradient_id = pop("id")
+        if tag == "linearGradient":
+            return LinearGradient(gradient_id, parse_number(pop("x1", "0")), parse_number(pop("y1", "0")),
+                                  parse_number(pop("x2", "100%")), parse_number(pop("y2", "0")),
+                                  stops, attrs)
+        return RadialGradient(gradient_id, parse_number(pop("cx", "50%")), parse_number(pop("cy", "50%")),
+                              parse_number(pop("r", "50%")), stops, attrs)
+
+    children = [_load_node(child) for child in element]
+    node = Element(tag, attrs, children, element.text.strip() if element.text else "")
+    if tag in TEXT_ELEMENTS:
+        node.text = collapse_text(element.text)
+        for child, source in zip(children, element):
+            child.tail = collapse_text(source.tail)
+    return node
+
+
+def load_scene(svg):
+    """從 SVG 字串載入場景（註解與縮排空白會被捨棄）"""
+    root = ET.fromstring(svg)
+    attrs = _element_attrs(root)
+    attrs.pop("xmlns", None)
+    defs = []
+    children = []
+    for child in root:
+        if local_name(child.tag) == "defs":
+            defs.extend(_load_node(definition) for definition in child)
+        else:
+            children.append(_load_node(child))
+    return Scene(attrs, defs, children)
+
+
+# ── 串流寫出 ───────────────────────────────────────────────────
+#
+# 大型程序化場景（整片珊瑚礁全景、成千上萬的泡泡與魚群）不先組成完整字串：
+# stream_svg 逐一元素產生片段，圖形本身也可以由產生器邊產生邊寫出，
+# write_stream 再經由緩衝 handle 寫入檔案，記憶體用量與場景大小無關。
+
+def iter_chunks(node):
+    """逐一產生元素的 SVG 片段；容器（<g> 與通用元素）的子元素逐一輸出，不先串接"""
+    if isinstance(node, Group):
+        yield f"<g{attr_text(node.attrs)}>"
+        for child in node.children:
+            yield from iter_chunks(child)
+        yield "</g>"
+    elif isinstance(node, Element) and (node.children or node.text):
+        yield f"<{node.tag}{attr_text(node.attrs)}>{escape_xml(node.text)}"
+        for child in node.children:
+            yield from iter_chunks(child)
+        yield f"</{node.tag}>{escape_xml(node.tail)}"
+    else:
+        out = []
+        node.write(out.append)
+        yield "".join(out)
+
+
+def stream_svg(shapes, attrs=None, defs=()):
+    """以產生器逐一輸出完整 SVG 的片段
+
+    Args:
+        shapes: 依繪製順序的圖形，可以是產生器（只會走訪一次）
+        attrs: 根元素屬性，預設 viewBox="0 0 400 300"
+        defs: <defs> 內的定義（漸層等）
+    """
+    attrs = {"viewBox": "0 0 400 300"} if attrs is None else attrs
+    yield f'<svg xmlns="{SVG_NS}"{attr_text(attrs)}>'
+    defs = iter(defs)
+    first = next(defs, None)
+    if first is not None:
+        yield "<defs>"
+        for definition in itertools.chain([first], defs):
+            yield from iter_chunks(definition)
+        yield "</defs>"
+    for shape in shapes:
+        yield from iter_chunks(shape)
+    yield "</svg>"
+
+
+def file_digest(path, block_size=STREAM_BUFFER_SIZE):
+    """逐塊計算檔案的 SHA-256，檔案不存在時回傳 None"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b""):
+                digest.update(block)
+    except FileNotFoundError:
+        return None
+    return digest.digest()
+
+
+def write_stream(path, chunks, buffer_size=STREAM_BUFFER_SIZE):
+    """把片段經由緩衝 handle 寫入檔案，回傳 (是否有寫入, 位元組數)
+
+    與 write_if_changed 相同：先寫暫存檔再以 os.replace 取代，內容與既有檔案
+    相同時保留原檔；比較以雜湊逐塊進行，不需要把任何一方整個讀進記憶體。
+    """
+    tmp_path = f"{path}.tmp"
+    digest = hashlib.sha256()
+    size = 0
+    with open(tmp_path, 'wb', buffering=buffer_size) as f:
+        for chunk in chunks:
+            data = chunk.encode('utf-8')
+            digest.update(data)
+            size += len(data)
+            f.write(data)
+    if os.path.exists(path) and os.path.getsize(path) == size \
+            and file_digest(path) == digest.digest():
+        os.remove(tmp_path)
+        return False, size
+    os.replace(tmp_path, path)
+    return True, size
+
+
+# ── 共用背景與裝飾圖層 ─────────────────────────────────────────
+#
+# ANIMALS 的 layers 依序疊在前景下方。每個圖層在一次建置中只渲染一次
+# （render_layer 會快取結果），組合場景時只需要處理前景本身。
+
+def _gradient_background(gradient_id, top, bottom):
+    """全畫面的上下漸層背景"""
+    gradient = LinearGradient(gradient_id, 0.0, 0.0, 0.0, "100%", [Stop(0.0, top), Stop(1.0, bottom)])
+    return [gradient], [Rect(0.0, 0.0, 400.0, 300.0, {"fill": f"url(#{gradient_id})"})]
+
+
+def _bubbles():
+    bubbles = [(50, 50, 8, "0.4"), (350, 100, 12, "0.3"), (100, 250, 6, "0.5")]
+    return [], [Circle(float(cx), float(cy), float(r), {"fill": "#fff", "opacity": opacity})
+                for cx, cy, r, opacity in bubbles]
+
+
+def _seaweed():
+    return [], [
+        Path("M80,280 Q90,200 85,150 Q80,100 90,50",
+             {"stroke": "#2E8B57", "stroke-width": "6", "fill": "none"}),
+        Path("M320,280 Q310,220 315,170 Q320,120 310,70",
+             {"stroke": "#3CB371", "stroke-width": "6", "fill": "none"}),
+    ]
+
+
+def _coral():
+    return [], [
+        Circle(80.0, 260.0, 25.0, {"fill": "#FF6B9D", "opacity": "0.4"}),
+        Circle(100.0, 240.0, 20.0, {"fill": "#FF6B9D", "opacity": "0.4"}),
+        Circle(320.0, 270.0, 30.0, {"fill": "#9370DB", "opacity": "0.4"}),
+    ]
+
+
+def _ice_floes():
+    return [], [
+        Polygon([(50.0, 40.0), (100.0, 30.0), (110.0, 50.0), (60.0, 55.0)],
+                {"fill": "#F0F8FF", "opacity": "0.7"}),
+        Polygon([(320.0, 60.0), (370.0, 50.0), (380.0, 70.0), (330.0, 75.0)],
+                {"fill": "#F0F8FF", "opacity": "0.7"}),
+    ]
+
+
+# 圖層名稱 → 產生 (defs, 圖形) 的函式
+LAYERS = {
+    # 背景
+    "ocean": lambda: _gradient_background("oceanBg", "#87CEEB", "#4682B4"),
+    "night-ocean": lambda: _gradient_background("nightOceanBg", "#191970", "#000080"),
+    "deep-sea": lambda: _gradient_background("deepseaBg", "#001F3F", "#000814"),
+    "arctic": lambda: _gradient_background("arcticBg", "#B0E0E6", "#87CEEB"),
+    "aquarium-tank": lambda: _gradient_background("aquariumBg", "#E0F7FA", "#B2EBF2"),
+    # 裝飾
+    "bubbles": _bubbles,
+    "seaweed": _seaweed,
+    "coral": _coral,
+    "ice-floes": _ice_floes,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def render_layer(name):
+    """渲染圖層並快取，回傳 (defs 片段, 圖形片段)"""
+    if name not in LAYERS:
+        raise ValueError(f"未知的圖層: {name}")
+    defs, shapes = LAYERS[name]()
+    defs_out, shapes_out = io.StringIO(), io.StringIO()
+    for definition in defs:
+        definition.write(defs_out.write)
+    for shape in shapes:
+        shape.write(shapes_out.write)
+    return defs_out.getvalue(), shapes_out.getvalue()
+
+
+def compose_svg(foreground, layers=()):
+    """把圖層依序疊在前景下方，組成完整的 SVG 字串"""
+    if not layers:
+        return foreground
+    rendered = [render_layer(name) for name in layers]
+    defs = "".join(layer_defs for layer_defs, _ in rendered)
+    shapes = "".join(layer_shapes for _, layer_shapes in rendered)
+    start = foreground.index(">", foreground.index("<svg")) + 1
+    if defs:
+        defs = f"<defs>{defs}</defs>"
+    return f"{foreground[:start]}{defs}{shapes}{foreground[start:]}"
+
+
+def scene_svg(data):
+    """取得 ANIMALS 項目的完整 SVG（圖層 + 前景）"""
+    return compose_svg(data['svg'], tuple(data.get('layers', ())))
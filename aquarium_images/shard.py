@@ -0,0 +1,115 @@
+"""分片建置：解析 --shard、依繪製成本分配場景，以及檢查、彙整各分片的紀錄
+
+完整重建分散到 N 台 CI 機器：每台以 --shard i/N 只建置分到的場景，
+再以 --merge 把各分片的輸出目錄、建置清單與量測報告合併回一個樹狀目錄。
+分配只依場景內容（繪製成本估算）決定，與機器或執行順序無關。
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+import xml.etree.ElementTree as ET
+
+from .common import SHARD_RECORD_NAME
+from .analysis import scene_cost
+
+
+def parse_shard(value):
+    """解析「i/N」（i 從 1 起算），供 argparse 使用"""
+    match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", value)
+    if not match or not 1 <= int(match.group(1)) <= int(match.group(2)):
+        raise argparse.ArgumentTypeError(f"分片必須是 i/N 且 1 ≤ i ≤ N: {value}")
+    return int(match.group(1)), int(match.group(2))
+
+
+def shard_costs(svgs):
+    """估算每張場景的繪製成本（無法分析時以 1 計），捨入後確保各平台的分配結果一致"""
+    costs = {}
+    for scene_id, svg in svgs.items():
+        try:
+            costs[scene_id] = round(scene_cost(svg)["score"], 6)
+        except (ET.ParseError, ValueError):
+            costs[scene_id] = 1.0
+    return costs
+
+
+def partition_scenes(costs, count):
+    """依成本把場景分成 count 片：由成本高到低，每次放進目前總成本最低的分片（LPT）
+
+    成本相同時依場景 id 排序、總成本相同時放進編號較小的分片，因此結果是確定的。
+
+    Returns:
+        count 個場景 id 集合
+    """
+    shards = [set() for _ in range(count)]
+    loads = [0.0] * count
+    for scene_id in sorted(costs, key=lambda scene_id: (-costs[scene_id], scene_id)):
+        target = min(range(count), key=lambda index: (loads[index], index))
+        shards[target].add(scene_id)
+        loads[target] += costs[scene_id]
+    return shards
+
+
+def merge_reports(reports, order):
+    """合併各分片的量測報告：數量與位元組相加，耗時另列各分片（分片平行執行，總耗時取最大值）"""
+    position = {scene_id: index for index, scene_id in enumerate(order)}
+    animals = sorted((animal for report in reports for animal in report["animals"]),
+                     key=lambda animal: position.get(animal["id"], len(position)))
+    summaries = [report["summary"] for report in reports]
+    stages = {}
+    for summary in summaries:
+        for name, stage in summary["stages"].items():
+            total = stages.setdefault(name, dict.fromkeys(stage, 0))
+            for key, value in stage.items():
+                total[key] += value
+    summary = {
+        key: sum(s[key] for s in summaries)
+        for key in ("animals", "built", "cached", "failed", "cpu_seconds", "bytes_written", "elements")
+    }
+    peaks = [s["peak_rss_bytes"] for s in summaries if s.get("peak_rss_bytes")]
+    summary.update(
+        wall_seconds=max((s["wall_seconds"] for s in summaries), default=0.0),
+        runner_seconds=sum(s["wall_seconds"] for s in summaries),
+        peak_rss_bytes=max(peaks, default=None),
+        stages=stages,
+    )
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "settings": reports[0]["settings"] if reports else {},
+        "summary": summary,
+        "animals": animals,
+    }
+
+
+def load_shard_records(shard_dirs):
+    """讀取並檢查各分片紀錄：總片數一致、每一片恰好一份、設定相同、場景不重複
+
+    Raises:
+        ValueError: 分片不完整或彼此不一致
+    """
+    records = []
+    for shard_dir in shard_dirs:
+        path = os.path.join(shard_dir, SHARD_RECORD_NAME)
+        try:
+            with open(path, encoding='utf-8') as f:
+                records.append((shard_dir, json.load(f)))
+        except (OSError, ValueError) as e:
+            raise ValueError(f"無法讀取分片紀錄 {path}: {e}") from None
+    counts = {record["shard"][1] for _, record in records}
+    if len(counts) != 1:
+        raise ValueError(f"分片的總片數不一致: {sorted(counts)}")
+    count = counts.pop()
+    indexes = sorted(record["shard"][0] for _, record in records)
+    if indexes != list(range(1, count + 1)):
+        raise ValueError(f"分片不完整: 需要 1–{count} 各一份，實際為 {indexes}")
+    if any(record["settings"] != records[0][1]["settings"] for _, record in records):
+        raise ValueError("各分片的建置設定不同，請以相同選項重新建置")
+    seen = {}
+    for shard_dir, record in records:
+        for scene_id in record["scenes"]:
+            if scene_id in seen:
+                raise ValueError(f"場景 {scene_id} 同時出現在 {seen[scene_id]} 與 {shard_dir}")
+            seen[scene_id] = shard_dir
+    return sorted(records, key=lambda item: item[1]["shard"][0])
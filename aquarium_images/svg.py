@@ -0,0 +1,55 @@
+"""SVG 共用常數與小工具：命名空間、顏色名稱、數字與 url(#id) 的規則式
+
+最佳化、場景物件模型、點陣化與繪製成本分析都會用到，因此獨立成不依賴其他模組的一層。
+"""
+
+import re
+
+SVG_NS = "http://www.w3.org/2000/svg"
+XLINK_NS = "http://www.w3.org/1999/xlink"
+XML_NS = "http://www.w3.org/XML/1998/namespace"
+NAMESPACE_PREFIXES = {SVG_NS: None, XLINK_NS: "xlink", XML_NS: "xml"}
+
+# 內容為文字的元素：保留文字（依 SVG 預設的 xml:space 規則壓縮空白）
+TEXT_ELEMENTS = {"text", "tspan", "textPath", "title", "desc", "style", "script"}
+
+# 比 16 進位表示更短的顏色名稱（以及反向）
+SHORT_COLOR_NAMES = {
+    "#f00": "red", "#c0c0c0": "silver", "#808080": "gray", "#800000": "maroon",
+    "#008000": "green", "#000080": "navy", "#808000": "olive", "#800080": "purple",
+    "#008080": "teal", "#ffa500": "orange", "#d2b48c": "tan", "#fa8072": "salmon",
+    "#ffd700": "gold", "#ffc0cb": "pink", "#f5deb3": "wheat", "#ee82ee": "violet",
+    "#ff6347": "tomato", "#a52a2a": "brown", "#fffafa": "snow", "#f0ffff": "azure",
+    "#f5f5dc": "beige", "#cd853f": "peru", "#dda0dd": "plum", "#ffe4c4": "bisque",
+    "#fffff0": "ivory", "#faf0e6": "linen", "#da70d6": "orchid", "#4b0082": "indigo",
+    "#ff7f50": "coral", "#f0e68c": "khaki",
+}
+NAMED_COLORS = {name: hex_value for hex_value, name in SHORT_COLOR_NAMES.items()}
+NAMED_COLORS.update({
+    "white": "#fff", "black": "#000", "yellow": "#ff0", "fuchsia": "#f0f",
+    "magenta": "#f0f", "aqua": "#0ff", "cyan": "#0ff", "blue": "#00f", "lime": "#0f0",
+})
+
+NUMBER_RE = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+URL_REF_RE = re.compile(r"url\(\s*#([^)\s]+)\s*\)")
+
+
+def local_name(name):
+    """去掉 ElementTree 的 {namespace} 前綴；無法辨識的命名空間回傳 None"""
+    if not name.startswith("{"):
+        return name
+    uri, local = name[1:].split("}", 1)
+    if uri not in NAMESPACE_PREFIXES:
+        return None
+    prefix = NAMESPACE_PREFIXES[uri]
+    return f"{prefix}:{local}" if prefix else local
+
+
+def collapse_text(text):
+    """依 SVG 預設 xml:space 規則壓縮文字空白"""
+    return re.sub(r"\s+", " ", text.replace("\n", "")).strip() if text else ""
+
+
+def escape_xml(text, quote=False):
+    text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return text.replace('"', "&quot;") if quote else text
@@ -0,0 +1,168 @@
+"""程序化故事插圖變體
+
+以固定種子為每隻動物產生 N 張變體：泡泡與珊瑚的位置、背景色調與左右翻轉
+都由 (種子, 動物 id, 編號) 決定，同樣的參數每次都產生相同的 SVG。
+工作行程負責組圖與計算雜湊，主行程依雜湊去除重複後寫出。
+"""
+
+import colorsys
+import hashlib
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .common import (
+    FINGERPRINT_LENGTH, STORY_VARIANTS_INDEX, STORY_VARIANT_BATCH, STORY_VARIANT_SEED,
+    write_if_changed,
+)
+from .geometry import parse_color
+from .scene import ANIMALS, LAYERS, Circle, Group, Scene, fmt_number, load_scene
+from .raster import _viewbox
+
+
+# 每次重新產生的裝飾圖層（其餘圖層原樣保留）與可以長出珊瑚的背景
+PROCEDURAL_LAYERS = {"bubbles", "coral"}
+CORAL_BACKGROUNDS = {"ocean", "aquarium-tank"}
+CORAL_COLORS = ("#FF6B9D", "#9370DB", "#FF7F50")
+
+
+def tint_color(color, hue, lightness):
+    """把顏色的色相旋轉 hue 度、亮度加上 lightness（-1～1），無法解析的顏色原樣回傳"""
+    rgba = parse_color(color)
+    if rgba is None:
+        return color
+    h, l, s = colorsys.rgb_to_hls(*rgba[:3])
+    r, g, b = colorsys.hls_to_rgb((h + hue / 360) % 1.0, min(1.0, max(0.0, l + lightness)), s)
+    return f"#{round(r * 255):02x}{round(g * 255):02x}{round(b * 255):02x}"
+
+
+def variant_params(animal_id, layers, seed, index):
+    """決定一張變體的參數；只依 (種子, 動物 id, 編號) 而定，與執行順序無關"""
+    rng = random.Random(f"{seed}:{animal_id}:{index}")
+    bubbles = [
+        (rng.randrange(20, 381), rng.randrange(20, 281), rng.randrange(4, 15), rng.choice((0.3, 0.4, 0.5)))
+        for _ in range(rng.randrange(0, 9))
+    ]
+    coral = []
+    if "coral" in layers or CORAL_BACKGROUNDS.intersection(layers):
+        coral = [
+            (rng.randrange(30, 371), rng.randrange(240, 291), rng.randrange(15, 31), rng.choice(CORAL_COLORS))
+            for _ in range(rng.randrange(1 if "coral" in layers else 0, 4))
+        ]
+    return {
+        "index": index,
+        "mirror": rng.random() < 0.5,
+        "hue": rng.randrange(-20, 21),
+        "lightness": rng.randrange(-8, 9) / 100,
+        "bubbles": bubbles,
+        "coral": coral,
+    }
+
+
+def build_variant(data, params):
+    """依參數組出變體場景的 SVG（原本的圖層 + 程序化裝飾 + 可翻轉的前景）"""
+    foreground = load_scene(data["svg"])
+    defs, background = [], []
+    for name in data.get("layers", ()):
+        if name in PROCEDURAL_LAYERS:
+            continue
+        layer_defs, shapes = LAYERS[name]()
+        for definition in layer_defs:
+            for stop in definition.stops:
+                stop.color = tint_color(stop.color, params["hue"], params["lightness"])
+        defs.extend(layer_defs)
+        background.extend(shapes)
+    background.extend(Circle(float(cx), float(cy), float(r), {"fill": color, "opacity": "0.4"})
+                      for cx, cy, r, color in params["coral"])
+    background.extend(Circle(float(cx), float(cy), float(r), {"fill": "#fff", "opacity": str(opacity)})
+                      for cx, cy, r, opacity in params["bubbles"])
+
+    children = foreground.children
+    if params["mirror"]:
+        x, _, width, _ = _viewbox(foreground.attrs)
+        children = [Group(children, {"transform": f"matrix(-1 0 0 1 {fmt_number(2 * x + width)} 0)"})]
+    return Scene(foreground.attrs, defs + foreground.defs, background + children).to_svg()
+
+
+def variant_batch(animal_id, data, seed, start, stop):
+    """在工作行程中產生編號 start～stop-1 的變體，回傳 [(參數, 雜湊, SVG)]"""
+    batch = []
+    for index in range(start, stop):
+        params = variant_params(animal_id, data.get("layers", ()), seed, index)
+        svg = build_variant(data, params)
+        batch.append((params, hashlib.sha256(svg.encode('utf-8')).hexdigest(), svg))
+    return batch
+
+
+def generate_story_variants(output_dir, count, seed=STORY_VARIANT_SEED, animals=None,
+                            jobs=None, batch_size=STORY_VARIANT_BATCH):
+    """為每隻動物產生 count 張程序化變體，以行程池平行組圖並依雜湊去除同一隻動物內的重複
+
+    輸出為 output_dir/<動物 id>/<雜湊>.svg 與記錄參數的 index.json；
+    內容相同的檔案不會重寫，這次沒有產生的舊變體會被移除。
+
+    Returns:
+        {"scenes", "unique", "duplicates", "written", "removed", "seconds", "scenes_per_second"}
+    """
+    animals = ANIMALS if animals is None else animals
+    started = time.perf_counter()
+    index, seen = {}, set()
+    duplicates = written = 0
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        futures = {
+            pool.submit(variant_batch, animal_id, dict(data), seed, start, min(start + batch_size, count)):
+                animal_id
+            for animal_id, data in animals.items()
+            for start in range(0, count, batch_size)
+        }
+        for future in as_completed(futures):
+            animal_id = futures[future]
+            animal_dir = os.path.join(output_dir, animal_id)
+            os.makedirs(animal_dir, exist_ok=True)
+            for params, digest, svg in future.result():
+                # 檔案寫在各動物自己的目錄，重複與否也只在同一隻動物內判斷
+                name = f"{digest[:FINGERPRINT_LENGTH]}.svg"
+                if (animal_id, digest) in seen:
+                    duplicates += 1
+                else:
+                    seen.add((animal_id, digest))
+                    written += write_if_changed(os.path.join(animal_dir, name), svg.encode('utf-8'))
+                index.setdefault(animal_id, []).append({**params, "file": f"{animal_id}/{name}"})
+    elapsed = time.perf_counter() - started
+
+    # 移除先前以其他種子或張數產生、這次沒有用到的變體
+    current = {entry["file"] for entries in index.values() for entry in entries}
+    removed = 0
+    for animal_id in animals:
+        animal_dir = os.path.join(output_dir, animal_id)
+        for name in os.listdir(animal_dir) if os.path.isdir(animal_dir) else ():
+            if name.endswith(".svg") and f"{animal_id}/{name}" not in current:
+                os.remove(os.path.join(animal_dir, name))
+                removed += 1
+
+    # 依編號排序後才標記重複，批次完成的先後不影響哪一張被視為重複
+    ordered = {}
+    for animal_id in animals:
+        if animal_id not in index:
+            continue
+        ordered[animal_id] = sorted(index[animal_id], key=lambda entry: entry["index"])
+        files = set()
+        for entry in ordered[animal_id]:
+            if entry["file"] in files:
+                entry["duplicate"] = True
+            files.add(entry["file"])
+    data = json.dumps({"seed": seed, "count": count, "variants": ordered},
+                      indent=2, ensure_ascii=False) + "\n"
+    write_if_changed(os.path.join(output_dir, STORY_VARIANTS_INDEX), data.encode('utf-8'))
+    scenes = count * len(animals)
+    return {
+        "scenes": scenes,
+        "unique": len(seen),
+        "duplicates": duplicates,
+        "written": written,
+        "removed": removed,
+        "seconds": elapsed,
+        "scenes_per_second": scenes / elapsed if elapsed else 0.0,
+    }
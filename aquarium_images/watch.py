@@ -0,0 +1,202 @@
+"""監看模式：常駐監看場景目錄與產生器原始碼，存檔後只重新產生改動的動物"""
+
+import os
+import select
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .common import GENERATOR_SOURCES, OUTPUT_DIR, WATCH_DEBOUNCE, WATCH_POLL_INTERVAL
+from .scene import ANIMALS, SceneCatalog, scene_svg
+from .build import generate_images
+
+
+class PollingWatcher:
+    """以修改時間輪詢檔案變更（各平台皆可用）"""
+
+    def __init__(self, paths, interval=WATCH_POLL_INTERVAL):
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.interval = interval
+        self.mtimes = {path: self._mtime(path) for path in self.paths}
+
+    @staticmethod
+    def _mtime(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def wait(self, timeout=None):
+        """等到有檔案變更或逾時，回傳變更的路徑集合"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = set()
+            for path in self.paths:
+                mtime = self._mtime(path)
+                if mtime != self.mtimes[path]:
+                    self.mtimes[path] = mtime
+                    changed.add(path)
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(self.interval)
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """以 Linux inotify 監看檔案所在目錄（編輯器常以改名方式存檔，因此監看目錄）"""
+
+    IN_MODIFY = 0x002
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, paths):
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self.paths = {os.path.abspath(path) for path in paths}
+        self.dirs = {}
+        mask = self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+        for directory in {os.path.dirname(path) for path in self.paths}:
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), mask)
+            if wd < 0:
+                os.close(self.fd)
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed: {directory}")
+            self.dirs[wd] = directory
+
+    def wait(self, timeout=None):
+        """等到有受監看的檔案變更或逾時，回傳變更的路徑集合"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self.fd], [], [], remaining)
+            if not ready:
+                return set()
+            changed = set()
+            try:
+                buffer = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            offset = 0
+            while offset < len(buffer):
+                wd, _, _, length = self.EVENT_HEADER.unpack_from(buffer, offset)
+                offset += self.EVENT_HEADER.size
+                name = buffer[offset:offset + length].rstrip(b"\0")
+                offset += length
+                path = os.path.join(self.dirs.get(wd, ""), os.fsdecode(name))
+                if path in self.paths:
+                    changed.add(path)
+            if changed:
+                return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+def create_watcher(paths, polling=False):
+    """優先使用 inotify，無法使用時退回輪詢"""
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(paths)
+        except OSError as e:
+            print(f"⚠️  無法使用 inotify（{e}），改用輪詢")
+    return PollingWatcher(paths)
+
+
+def wait_for_edits(watcher, debounce=WATCH_DEBOUNCE):
+    """等待一批編輯：收到第一個變更後，持續收集直到安靜 debounce 秒
+
+    Returns:
+        (變更的路徑, 最後一次存檔的時間 time.time())
+    """
+    changed = watcher.wait()
+    while True:
+        more = watcher.wait(timeout=debounce)
+        if not more:
+            break
+        changed |= more
+    edited_at = max((os.stat(path).st_mtime for path in changed if os.path.exists(path)),
+                    default=time.time())
+    return changed, edited_at
+
+
+def load_scene_sources(directory=ANIMALS.directory):
+    """重新讀取場景目錄（只讀 index.json 與場景檔，不重新執行程式），
+    回傳 ({動物 id: 完整 SVG}, 場景目錄的檔案)"""
+    animals = SceneCatalog(directory)
+    return {animal_id: scene_svg(data) for animal_id, data in animals.items()}, animals.files()
+
+
+def restart_watch():
+    """以相同的命令列重新啟動本程式：產生器原始碼改變後，主行程與工作行程都要載入新程式
+
+    --force 只套用在第一次啟動，重新啟動時拿掉，未變動的動物仍走建置快取。
+    """
+    argv = [arg for arg in sys.argv if arg != "--force"]
+    sys.stdout.flush()
+    os.execv(sys.executable, [sys.executable, *argv])
+
+
+def watch(output_dir=OUTPUT_DIR, jobs=None, polling=False, force=False, **options):
+    """常駐監看場景目錄與共用圖層，只重新產生內容有變動的動物
+
+    options 與 generate_images 相同；工作行程在整個監看期間保持常駐，
+    force 只套用在啟動時的第一次建置。索引新增或移除場景時會一併更新監看的檔案。
+    場景檔改變時只重新讀取場景目錄；產生器本身（圖層、繪製程式）改變時，
+    已載入的程式碼都過時了，因此結束行程池並以 restart_watch 重新啟動。
+    """
+    sources = [*GENERATOR_SOURCES, *ANIMALS.files()]
+    watcher = create_watcher(sources, polling)
+    mode = "inotify" if isinstance(watcher, InotifyWatcher) else "輪詢"
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        generate_images(output_dir, jobs=jobs, pool=pool, force=force, **options)
+        print(f"\n👀 監看中（{mode}）: 產生器的 {len(GENERATOR_SOURCES)} 個原始檔與 "
+              f"{os.path.relpath(ANIMALS.directory)} 的 {len(sources) - len(GENERATOR_SOURCES)} 個檔案，"
+              "按 Ctrl+C 結束")
+        restart = False
+        try:
+            while True:
+                changed, edited_at = wait_for_edits(watcher)
+                edited = sorted(changed.intersection(GENERATOR_SOURCES))
+                if edited:
+                    print(f"🔄 {', '.join(map(os.path.relpath, edited))} 已變更，重新啟動監看")
+                    restart = True
+                    break
+                try:
+                    svgs, files = load_scene_sources()
+                except Exception as e:  # 編輯到一半的場景檔或索引可能格式錯誤，等下一次存檔
+                    print(f"❌ 無法載入場景: {type(e).__name__}: {e}")
+                    continue
+                if [*GENERATOR_SOURCES, *files] != sources:
+                    sources = [*GENERATOR_SOURCES, *files]
+                    watcher.close()
+                    watcher = create_watcher(sources, polling)
+                results = generate_images(output_dir, jobs=jobs, pool=pool, svgs=svgs,
+                                          verbose=False, **options)
+                built = [r for r in results if "finished_at" in r]
+                if not built:
+                    print("💤 沒有動物的內容改變")
+                for result in built:
+                    latency = result["finished_at"] - edited_at
+                    print(f"⚡ {result['id']}: 編輯到輸出 {latency:.3f} 秒")
+        except KeyboardInterrupt:
+            print("\n👋 結束監看")
+        finally:
+            watcher.close()
+    if restart:
+        restart_watch()
@@ -0,0 +1,329 @@
+"""網站輸出：預先壓縮的 .gz／.br 副本、低畫質預覽、指紋網址與 aquarium.json 的更新"""
+
+import base64
+import contextlib
+import gzip
+import hashlib
+import io
+import json
+import os
+import posixpath
+import re
+import struct
+import time
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow 為選用套件，缺少時以內建點陣化產生預覽縮圖
+    Image = None
+
+try:
+    import brotli
+except ImportError:  # brotli 為選用套件，缺少時只輸出 .gz
+    brotli = None
+
+from .common import (
+    FINGERPRINT_GRACE, FINGERPRINT_LENGTH, FINGERPRINT_STATE_NAME, FINGERPRINT_STATE_VERSION,
+    PLACEHOLDER_WIDTH, PRECOMPRESS_ENCODINGS, SPRITE_NAME, URL_PREFIX, write_if_changed,
+)
+from .raster import encode_png, rasterize_scenes
+
+
+# ── 預先壓縮 ───────────────────────────────────────────────────
+
+def precompress_file(path, encodings=PRECOMPRESS_ENCODINGS):
+    """為文字檔產生最高壓縮等級的 .gz／.br 副本（內容未變時不更動），回傳各格式大小"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    sizes = {"original": len(data)}
+    for encoding in encodings:
+        if encoding == "gz":
+            compressed = gzip.compress(data, compresslevel=9, mtime=0)
+        elif encoding == "br" and brotli is not None:
+            compressed = brotli.compress(data, mode=brotli.MODE_TEXT, quality=11, lgwin=24)
+        else:
+            continue
+        write_if_changed(f"{path}.{encoding}", compressed)
+        sizes[encoding] = len(compressed)
+    return sizes
+
+
+def supported_encodings(encodings):
+    """過濾出目前環境能產生的壓縮格式（.br 需要 brotli 套件）"""
+    if "br" in encodings and brotli is None:
+        print("⚠️  未安裝 brotli 套件（pip install brotli），略過 .br 預先壓縮")
+        return tuple(encoding for encoding in encodings if encoding != "br")
+    return tuple(encodings)
+
+
+def format_compression(stats):
+    """格式化壓縮率報告，例如「24,543 → gz 6,120（24.9%）、br 5,010（20.4%）」"""
+    original = sum(sizes["original"] for sizes in stats)
+    parts = []
+    for encoding in PRECOMPRESS_ENCODINGS:
+        if stats and all(encoding in sizes for sizes in stats):
+            compressed = sum(sizes[encoding] for sizes in stats)
+            parts.append(f"{encoding} {compressed:,}（{compressed / original * 100 if original else 0:.1f}%）")
+    return f"{original:,} → " + "、".join(parts)
+
+
+# ── 低畫質預覽與網站資料 ───────────────────────────────────────
+#
+# 每隻動物產生主色與約 16px 寬的縮圖（data URI），寫入 aquarium.json 的
+# images.placeholder；卡片以與 main.png 同比例的外框預留版面，並把縮圖鋪滿外框當作
+# 背景，main.png 載入前就有畫面，載入後背景也不會露出在主圖之外。
+#
+# 圖片網址改為內容指紋檔名（main.<雜湊>.png），內容不變網址就不變，可設定
+# immutable 長期快取；重新繪製後網址隨之改變，舊指紋檔過了寬限期才刪除。
+
+ANIMAL_ID_RE = re.compile(r'"id"\s*:\s*')
+FINGERPRINT_RE = re.compile(
+    rf"^(?P<stem>.+)\.(?P<hash>[0-9a-f]{{{FINGERPRINT_LENGTH}}})(?P<ext>\.[^.]+)$")
+IMAGES_KEY_RE = re.compile(r'"images"\s*:\s*')
+
+
+def dominant_color(pixels):
+    """主色：以每色 4 位元分組，取像素最多的一組的平均色（忽略半透明以下的像素）
+
+    Args:
+        pixels: [(r, g, b, a), ...]
+
+    Returns:
+        #rrggbb 字串
+    """
+    buckets = {}
+    for r, g, b, a in [pixel for pixel in pixels if pixel[3] >= 128] or pixels:
+        bucket = buckets.setdefault((r >> 4, g >> 4, b >> 4), [0, 0, 0, 0])
+        bucket[0] += r
+        bucket[1] += g
+        bucket[2] += b
+        bucket[3] += 1
+    r, g, b, count = max(buckets.values(), key=lambda bucket: bucket[3])
+    return f"#{round(r / count):02x}{round(g / count):02x}{round(b / count):02x}"
+
+
+def png_dimensions(path):
+    """讀取 PNG 檔頭（IHDR）中的寬高"""
+    with open(path, 'rb') as f:
+        header = f.read(24)
+    if header[:8] != b"\x89PNG\r\n\x1a\n" or header[12:16] != b"IHDR":
+        raise ValueError(f"不是 PNG 檔: {path}")
+    return struct.unpack(">II", header[16:24])
+
+
+def make_placeholder(svg, png_file, width=PLACEHOLDER_WIDTH):
+    """產生低畫質預覽：主色、模糊縮圖（PNG data URI）與 main.png 的實際尺寸
+
+    縮圖與 main.png 同比例，網頁把它鋪滿與主圖同比例的外框，不會露出在主圖之外。
+    有 Pillow 時由 main.png 以區域平均縮小，否則以內建點陣化直接繪製縮圖。
+    """
+    png_width, png_height = png_dimensions(png_file)
+    height = max(1, round(width * png_height / png_width))
+    if Image is not None:
+        with Image.open(png_file) as image:
+            thumbnail = image.convert("RGBA").resize((width, height), Image.BOX)
+        raw = thumbnail.tobytes()
+        pixels = [tuple(raw[i:i + 4]) for i in range(0, len(raw), 4)]
+        if thumbnail.getextrema()[3] == (255, 255):
+            thumbnail = thumbnail.convert("RGB")
+        buffer = io.BytesIO()
+        thumbnail.save(buffer, "PNG", optimize=True)
+        data = buffer.getvalue()
+    else:
+        [[image]] = rasterize_scenes([(svg, [(width, height)])])
+        pixels = [tuple(pixel) for pixel in image.reshape(-1, 4).tolist()]
+        data = encode_png(image)
+    return {
+        "color": dominant_color(pixels),
+        "thumbnail": "data:image/png;base64," + base64.b64encode(data).decode('ascii'),
+        "width": png_width,
+        "height": png_height,
+    }
+
+
+def inline_json(value):
+    """單行 JSON，物件大括號內留空白（與 aquarium.json 手寫的排版一致）"""
+    if isinstance(value, dict):
+        if not value:
+            return "{}"
+        return "{ " + ", ".join(
+            f"{json.dumps(key, ensure_ascii=False)}: {inline_json(item)}"
+            for key, item in value.items()) + " }"
+    if isinstance(value, list):
+        return "[" + ", ".join(inline_json(item) for item in value) + "]"
+    return json.dumps(value, ensure_ascii=False)
+
+
+def update_animal_data(path, images):
+    """把 {動物 id: {欄位: 值}} 合併進 aquarium.json 各動物的 images 物件
+
+    只改寫 images 物件本身，其餘內容與排版保持原樣；改寫後的結果若與預期的
+    資料不符（排版超出預期），改以整份重新序列化。以暫存檔取代原檔，網站
+    不會讀到寫到一半的檔案。
+
+    Returns:
+        (路徑, 是否有寫入)
+    """
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    data = json.loads(text)
+    decoder = json.JSONDecoder()
+    pieces, pos = [], 0
+    for animal in data["animals"]:
+        fields = images.get(animal["id"])
+        if not fields:
+            continue
+        merged = {**animal["images"], **fields}
+        if merged == animal["images"]:
+            continue
+        animal["images"] = merged
+        for match in ANIMAL_ID_RE.finditer(text, pos):
+            value, end = decoder.raw_decode(text, match.end())
+            if value == animal["id"]:
+                break
+        else:
+            break
+        match = IMAGES_KEY_RE.search(text, end)
+        if match is None:
+            break
+        _, end = decoder.raw_decode(text, match.end())
+        pieces.extend([text[pos:match.end()], inline_json(merged)])
+        pos = end
+    pieces.append(text[pos:])
+    updated = "".join(pieces)
+    try:
+        if json.loads(updated) != data:
+            raise ValueError(path)
+    except ValueError:
+        updated = json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+    return path, write_if_changed(path, updated.encode('utf-8'))
+
+
+def fingerprint_url(url, output_dir, emitted=None):
+    """把 URL_PREFIX 下的圖片網址換成內容指紋檔名（main.png → main.<雜湊>.png）
+
+    指紋由未加指紋的原始檔計算，並在同目錄寫出一份指紋副本；網址已帶指紋時
+    依原始檔重新計算。不在 URL_PREFIX 下或找不到原始檔的網址原樣回傳。
+    emitted 為集合時加入寫出的指紋檔（相對於 output_dir，以 / 分隔）。
+    """
+    if not url.startswith(URL_PREFIX + "/"):
+        return url
+    directory, name = posixpath.split(url[len(URL_PREFIX) + 1:])
+    match = FINGERPRINT_RE.match(name)
+    source = match["stem"] + match["ext"] if match else name
+    source_dir = os.path.join(output_dir, *directory.split("/"))
+    try:
+        with open(os.path.join(source_dir, source), 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return url
+    stem, ext = os.path.splitext(source)
+    target = f"{stem}.{hashlib.sha256(data).hexdigest()[:FINGERPRINT_LENGTH]}{ext}"
+    write_if_changed(os.path.join(source_dir, target), data)
+    if emitted is not None:
+        emitted.add(posixpath.join(directory, target))
+    return posixpath.join(URL_PREFIX, directory, target)
+
+
+def fingerprint_images(output_dir, animals, emitted=None):
+    """為各動物的 images.main 與 images.story 產生指紋檔，回傳 {動物 id: 改變的欄位}
+
+    寫出的指紋檔會加入 emitted（見 fingerprint_url）。
+    """
+    updates = {}
+    for animal_id, images in animals.items():
+        fields = {"main": fingerprint_url(images["main"], output_dir, emitted)}
+        if images.get("story"):
+            fields["story"] = [fingerprint_url(url, output_dir, emitted) for url in images["story"]]
+        updates[animal_id] = {key: value for key, value in fields.items() if images.get(key) != value}
+    return updates
+
+
+def collect_fingerprints(output_dir, referenced, emitted, grace, now=None):
+    """刪除本工具寫出、不再被引用且已被取代超過 grace 秒的指紋檔（連同 .gz／.br 副本），回傳刪除的相對路徑
+
+    FINGERPRINT_STATE_NAME 記錄本工具寫出過的每個指紋檔，以及不再被引用的時間
+    （仍被引用時為 null）；只有記錄中的檔案會被清除，其他剛好符合指紋檔名格式的
+    檔案（手動放置或其他工具產生）一律不動。剛被取代的舊指紋會保留一段時間，
+    讓快取中的舊頁面仍能載入圖片。
+
+    Args:
+        output_dir: 輸出根目錄
+        referenced: 仍被 aquarium.json 引用的圖片（相對於 output_dir，以 / 分隔）
+        emitted: 這次寫出的指紋檔（同上）
+        grace: 寬限秒數
+        now: 目前時間（預設為 time.time()）
+    """
+    now = time.time() if now is None else now
+    state_path = os.path.join(output_dir, FINGERPRINT_STATE_NAME)
+    try:
+        with open(state_path, encoding='utf-8') as f:
+            state = json.load(f)
+        tracked = state["files"] if state.get("version") == FINGERPRINT_STATE_VERSION else {}
+    except (FileNotFoundError, ValueError, KeyError, AttributeError):
+        tracked = {}
+    files, removed = {}, []
+    for path in sorted(set(tracked) | set(emitted)):
+        if path in referenced:
+            files[path] = None
+            continue
+        since = tracked.get(path) or now
+        if now - since < grace:
+            files[path] = since
+            continue
+        target = os.path.join(output_dir, *path.split("/"))
+        try:
+            os.remove(target)
+            removed.append(path)
+        except FileNotFoundError:
+            pass
+        for encoding in PRECOMPRESS_ENCODINGS:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(f"{target}.{encoding}")
+    if files or os.path.exists(state_path):
+        data = json.dumps({"version": FINGERPRINT_STATE_VERSION, "files": files},
+                          indent=2, ensure_ascii=False) + "\n"
+        write_if_changed(state_path, data.encode('utf-8'))
+    return removed
+
+
+def publish_animal_data(data_file, output_dir, manifest, animal_ids, fingerprint=True,
+                        grace=FINGERPRINT_GRACE, sprite=None):
+    """把低畫質預覽、雪碧圖片段與指紋網址寫入 aquarium.json，並清除過期的指紋檔
+
+    Args:
+        sprite: generate_sprite 回傳的 {動物 id: {"href", "viewBox"}}；提供時寫入
+            各動物的 images.sprite，網頁以 <use href> 從同一份 sprite.svg 取用
+
+    Returns:
+        ((路徑, 是否有寫入), 刪除的指紋檔)
+    """
+    updates = {
+        animal_id: {"placeholder": manifest[animal_id]["placeholder"]}
+        for animal_id in animal_ids if "placeholder" in manifest.get(animal_id, {})
+    }
+    sprite_url = f"{URL_PREFIX}/{SPRITE_NAME}"
+    emitted = set()
+    if sprite and fingerprint:
+        sprite_url = fingerprint_url(sprite_url, output_dir, emitted)
+    for animal_id in sprite or ():
+        updates.setdefault(animal_id, {})["sprite"] = f"{sprite_url}#{animal_id}"
+    if not fingerprint:
+        return update_animal_data(data_file, updates), []
+
+    with open(data_file, encoding='utf-8') as f:
+        animals = {animal["id"]: animal["images"] for animal in json.load(f)["animals"]}
+    for animal_id, fields in fingerprint_images(output_dir, animals, emitted).items():
+        updates.setdefault(animal_id, {}).update(fields)
+    written = update_animal_data(data_file, updates)
+
+    referenced = set()
+    for animal_id, images in animals.items():
+        images = {**images, **updates.get(animal_id, {})}
+        urls = [images["main"], *images.get("story", [])]
+        if images.get("sprite"):
+            urls.append(images["sprite"].partition("#")[0])
+        for url in urls:
+            if url.startswith(URL_PREFIX + "/"):
+                referenced.add(url[len(URL_PREFIX) + 1:])
+    return written, collect_fingerprints(output_dir, referenced, emitted, grace)
@@ -0,0 +1,536 @@
+#!/usr/bin/env python3
+"""
+水族館動物圖片產生流程的效能基準測試
+
+逐一量測每個階段（組合、解析、序列化、最佳化、壓縮、各尺寸點陣化；
+點陣化同時比較 rsvg-convert 與內建的 NumPy 點陣化）
+在現有 15 隻動物與放大的合成場景集（例如 1k／10k 張）上的耗時，
+輸出吞吐量與每張場景的 p50／p95 延遲，並把結果存成 JSON，
+方便比較兩次執行是否有效能退步。
+
+用法:
+  python3 benchmark_aquarium_images.py                       # 水族館動物 + 1,000 張合成場景
+  python3 benchmark_aquarium_images.py --scales 1000,10000   # 指定合成場景數量
+  python3 benchmark_aquarium_images.py -o results.json       # 儲存結果
+  python3 benchmark_aquarium_images.py --baseline old.json   # 執行後與舊結果比較
+  python3 benchmark_aquarium_images.py --compare old.json new.json --threshold 0.1
+                                                             # 只比較兩份結果
+  python3 benchmark_aquarium_images.py --stream-check        # 確認串流寫出 10 萬個元素時記憶體固定
+  python3 benchmark_aquarium_images.py --arc-check           # 確認內建點陣化的圓與弧線路徑一致
+"""
+
+import argparse
+import gc
+import gzip
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 為選用套件，缺少時不量測內建點陣化
+    np = None
+
+try:
+    import PIL
+except ImportError:  # Pillow 為選用套件，只記錄在執行環境中
+    PIL = None
+
+try:
+    import brotli
+except ImportError:  # brotli 為選用套件，缺少時不量測 brotli 壓縮
+    brotli = None
+
+from aquarium_images.common import (
+    NUMPY_RENDERER, PNG_HEIGHT, PNG_WIDTH, RESPONSIVE_WIDTHS, RSVG_CONVERT,
+)
+from aquarium_images.scene import (
+    ANIMALS, Circle, Ellipse, Group, Path, Polygon, load_scene, render_layer, scene_svg, stream_svg,
+    write_stream,
+)
+from aquarium_images.optimize import optimize_svg, shape_path
+from aquarium_images.raster import rasterize_scenes, render_png_numpy
+from aquarium_images.renderers import render_png
+
+# 結果檔格式版本（欄位有不相容變更時遞增）
+RESULTS_VERSION = 1
+
+# 預設的合成場景數量與亂數種子（固定種子讓每次產生的場景集相同）
+DEFAULT_SCALES = (1000,)
+DEFAULT_SEED = 20240316
+
+# 點陣化很慢，預設只對前幾張場景量測
+DEFAULT_RASTER_LIMIT = 15
+
+# 比較兩次結果時，p50／p95 變慢超過此比例即視為退步
+DEFAULT_THRESHOLD = 0.10
+
+# 比較時忽略總耗時低於此值（秒）的階段，避免計時雜訊造成誤判
+MIN_COMPARE_SECONDS = 0.005
+
+# 串流寫出檢查：大場景的元素數、對照用的小場景元素數，以及記憶體峰值可容許的倍數
+STREAM_ELEMENTS = 100_000
+STREAM_BASELINE_ELEMENTS = 1_000
+STREAM_MEMORY_FACTOR = 1.5
+PANORAMA_WIDTH = 4000
+
+# 弧線檢查：圓／橢圓與轉成兩段弧線的路徑，在各輸出尺寸下的單一通道差異上限（0–255）
+ARC_CHECK_SHAPES = (("circle", {"cx": "200", "cy": "150", "r": "3"}),
+                    ("circle", {"cx": "200", "cy": "150", "r": "37.5"}),
+                    ("circle", {"cx": "131.7", "cy": "88.2", "r": "120"}),
+                    ("ellipse", {"cx": "200", "cy": "150", "rx": "90", "ry": "25"}))
+ARC_CHECK_SIZES = ((400, 300), (1600, 1200))
+ARC_CHECK_MAX_DIFF = 1
+
+# 合成場景時會微調的座標屬性
+JITTER_RE = re.compile(r'\b(cx|cy|x|y|r|rx|ry)="(-?\d+(?:\.\d+)?)"')
+
+
+# ── 測試資料 ───────────────────────────────────────────────────
+
+def aquarium_corpus():
+    """現有的水族館動物：回傳 [(id, ANIMALS 項目)]"""
+    return list(ANIMALS.items())
+
+
+def jitter_svg(svg, rng):
+    """把座標與半徑隨機偏移一點，產生結構相同但內容不同的場景"""
+    def shift(match):
+        value = float(match.group(2)) + rng.uniform(-3, 3)
+        if match.group(1).startswith("r"):
+            value = abs(value) + 1
+        return f'{match.group(1)}="{value:.1f}"'
+    return JITTER_RE.sub(shift, svg)
+
+
+def synthetic_corpus(count, seed=DEFAULT_SEED):
+    """以現有動物為範本產生 count 張合成場景（同一種子每次結果相同）"""
+    rng = random.Random(seed)
+    animals = aquarium_corpus()
+    corpus = []
+    for index in range(count):
+        animal_id, data = animals[index % len(animals)]
+        corpus.append((
+            f"{animal_id}-{index:05d}",
+            {"layers": data.get("layers", []), "svg": jitter_svg(data["svg"], rng)},
+        ))
+    return corpus
+
+
+# ── 統計 ───────────────────────────────────────────────────────
+
+def percentile(samples, q):
+    """線性內插的百分位數（samples 必須已排序）"""
+    if not samples:
+        return 0.0
+    position = (len(samples) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(samples) - 1)
+    return samples[lower] + (samples[upper] - samples[lower]) * (position - lower)
+
+
+def summarize(samples, input_bytes):
+    """彙整單一階段每張場景的耗時（秒）"""
+    ordered = sorted(samples)
+    total = sum(ordered)
+    return {
+        "count": len(ordered),
+        "total_seconds": total,
+        "scenes_per_second": len(ordered) / total if total else 0.0,
+        "mb_per_second": input_bytes / total / 1e6 if total else 0.0,
+        "p50_ms": percentile(ordered, 0.50) * 1000,
+        "p95_ms": percentile(ordered, 0.95) * 1000,
+        "max_ms": ordered[-1] * 1000 if ordered else 0.0,
+    }
+
+
+def timed(func, *args):
+    """執行一次並回傳 (結果, 耗時秒數)"""
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+# ── 各階段量測 ─────────────────────────────────────────────────
+
+def raster_targets():
+    """main.png 與響應式圖片的各個尺寸（寬度由小到大）"""
+    aspect = PNG_HEIGHT / PNG_WIDTH
+    sizes = {(PNG_WIDTH, PNG_HEIGHT)}
+    sizes.update((width, round(width * aspect)) for width in RESPONSIVE_WIDTHS)
+    return sorted(sizes)
+
+
+def bench_scene(data, stages, raster_sizes):
+    """量測單一場景的每個階段，把耗時附加到 stages[階段名稱]"""
+    svg, seconds = timed(scene_svg, data)
+    stages.setdefault("compose", []).append(seconds)
+
+    scene, seconds = timed(load_scene, svg)
+    stages.setdefault("parse", []).append(seconds)
+
+    _, seconds = timed(scene.to_svg)
+    stages.setdefault("serialize", []).append(seconds)
+
+    # 對照組：ElementTree 的解析 + 序列化
+    root, seconds = timed(ET.fromstring, svg)
+    stages.setdefault("parse_etree", []).append(seconds)
+    _, seconds = timed(ET.tostring, root, "unicode")
+    stages.setdefault("serialize_etree", []).append(seconds)
+
+    optimized, seconds = timed(optimize_svg, svg)
+    stages.setdefault("optimize", []).append(seconds)
+
+    data_bytes = optimized.encode("utf-8")
+    _, seconds = timed(lambda: gzip.compress(data_bytes, compresslevel=9, mtime=0))
+    stages.setdefault("gzip", []).append(seconds)
+    if brotli is not None:
+        _, seconds = timed(lambda: brotli.compress(
+            data_bytes, mode=brotli.MODE_TEXT, quality=11, lgwin=24))
+        stages.setdefault("brotli", []).append(seconds)
+
+    if raster_sizes and shutil.which(RSVG_CONVERT):
+        for width, height in raster_sizes:
+            _, seconds = timed(render_png, data_bytes, width, height)
+            stages.setdefault(f"rasterize_{width}w", []).append(seconds)
+    if raster_sizes and np is not None:
+        for width, height in raster_sizes:
+            _, seconds = timed(render_png_numpy, optimized, [(width, height)])
+            stages.setdefault(f"rasterize_numpy_{width}w", []).append(seconds)
+        # 批次：一次解析後繪製所有尺寸
+        _, seconds = timed(render_png_numpy, optimized, raster_sizes)
+        stages.setdefault("rasterize_numpy_batch", []).append(seconds)
+    return len(svg.encode("utf-8"))
+
+
+def bench_corpus(corpus, repeat=1, raster_limit=DEFAULT_RASTER_LIMIT, raster=True):
+    """量測整個場景集；重複多次時每張場景每個階段取最小值（降低雜訊）"""
+    raster_sizes = raster_targets() if raster and available_renderers() else []
+    best = {}
+    input_bytes = 0
+    for _ in range(repeat):
+        render_layer.cache_clear()
+        gc.collect()
+        runs = []
+        input_bytes = 0
+        for index, (_, data) in enumerate(corpus):
+            stages = {}
+            input_bytes += bench_scene(data, stages, raster_sizes if index < raster_limit else [])
+            runs.append(stages)
+        for index, stages in enumerate(runs):
+            for name, (seconds,) in stages.items():
+                key = (name, index)
+                best[key] = min(best.get(key, seconds), seconds)
+
+    samples = {}
+    for (name, _), seconds in best.items():
+        samples.setdefault(name, []).append(seconds)
+    stages = {}
+    for name, values in samples.items():
+        stages[name] = summarize(values, input_bytes * len(values) / len(corpus))
+    # 全流程：實際建置會經過的文字階段（不含 ElementTree 對照組與只抽樣的點陣化）
+    pipeline_stages = [name for name in samples
+                       if not name.endswith("_etree") and not name.startswith("rasterize_")]
+    pipeline = [sum(best[(name, index)] for name in pipeline_stages)
+                for index in range(len(corpus))]
+    return {
+        "scenes": len(corpus),
+        "input_bytes": input_bytes,
+        "raster_sizes": [f"{w}x{h}" for w, h in raster_sizes],
+        "stages": stages,
+        "pipeline": summarize(pipeline, input_bytes),
+    }
+
+
+def available_renderers():
+    """目前環境可用的點陣化工具"""
+    renderers = []
+    if shutil.which(RSVG_CONVERT):
+        renderers.append(RSVG_CONVERT)
+    if np is not None:
+        renderers.append(NUMPY_RENDERER)
+    return renderers
+
+
+def environment():
+    """記錄執行環境，比較結果時可看出差異是否來自不同機器"""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "pillow": PIL.__version__ if PIL is not None else None,
+        "brotli": brotli is not None,
+        "renderer": shutil.which(RSVG_CONVERT),
+        "numpy": np.__version__ if np is not None else None,
+    }
+
+
+def run_benchmarks(scales=DEFAULT_SCALES, repeat=1, seed=DEFAULT_SEED,
+                   raster=True, raster_limit=DEFAULT_RASTER_LIMIT):
+    """執行所有場景集的基準測試，回傳可存成 JSON 的結果"""
+    corpora = [("aquarium", aquarium_corpus())]
+    corpora.extend((f"synthetic-{count}", synthetic_corpus(count, seed)) for count in scales)
+    if raster and not shutil.which(RSVG_CONVERT):
+        print(f"⚠️  找不到 {RSVG_CONVERT}，只量測內建的 NumPy 點陣化" if np is not None
+              else f"⚠️  找不到 {RSVG_CONVERT} 也沒有 NumPy，略過點陣化階段")
+
+    results = {
+        "version": RESULTS_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "environment": environment(),
+        "settings": {
+            "scales": list(scales),
+            "repeat": repeat,
+            "seed": seed,
+            "raster_limit": raster_limit if raster else 0,
+        },
+        "corpora": {},
+    }
+    for name, corpus in corpora:
+        print(f"⏱️  {name}: {len(corpus):,} 張場景 × {repeat} 次...")
+        started = time.perf_counter()
+        results["corpora"][name] = bench_corpus(corpus, repeat, raster_limit, raster)
+        print_corpus(name, results["corpora"][name])
+        print(f"   （耗時 {time.perf_counter() - started:.1f} 秒）\n")
+    return results
+
+
+# ── 串流寫出 ───────────────────────────────────────────────────
+
+def reef_panorama(count, seed=DEFAULT_SEED):
+    """以產生器逐一產生恰好 count 個元素的珊瑚礁全景（泡泡、魚群與珊瑚）"""
+    rng = random.Random(seed)
+    produced = 0
+    while produced < count:
+        x, y = round(rng.uniform(0, PANORAMA_WIDTH), 1), round(rng.uniform(0, 300), 1)
+        kind = rng.random()
+        if kind < 0.3 and count - produced >= 3:
+            # 一條魚：<g> 內含身體與尾巴
+            yield Group([
+                Ellipse(x, y, 12.0, 6.0, {"fill": rng.choice(("#FF8C00", "#FFD700", "#87CEFA"))}),
+                Polygon([(x - 12, y), (x - 20, y - 6), (x - 20, y + 6)], {"fill": "#FFA500"}),
+            ], {"opacity": "0.9"})
+            produced += 3
+        elif kind < 0.5:
+            yield Path(f"M{x},300 Q{x + 10},{y} {x + 5},{y - 20}",
+                           {"stroke": "#FF6B9D", "stroke-width": "4", "fill": "none"})
+            produced += 1
+        else:
+            yield Circle(x, y, round(rng.uniform(2, 10), 1), {"fill": "#fff", "opacity": "0.4"})
+            produced += 1
+
+
+def stream_peak(count, path, seed=DEFAULT_SEED):
+    """以 stream_svg + write_stream 寫出 count 個元素的全景，回傳量測結果"""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    _, size = write_stream(path, stream_svg(
+        reef_panorama(count, seed), {"viewBox": f"0 0 {PANORAMA_WIDTH} 300"}))
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"elements": count, "bytes": size, "seconds": elapsed,
+            "elements_per_second": count / elapsed if elapsed else 0.0, "peak_bytes": peak}
+
+
+def string_peak(count, seed=DEFAULT_SEED):
+    """對照組：先組成完整字串再寫出時的記憶體峰值"""
+    gc.collect()
+    tracemalloc.start()
+    svg = "".join(stream_svg(reef_panorama(count, seed), {"viewBox": f"0 0 {PANORAMA_WIDTH} 300"}))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del svg
+    return peak
+
+
+def stream_check(count=STREAM_ELEMENTS, baseline=STREAM_BASELINE_ELEMENTS, seed=DEFAULT_SEED):
+    """確認串流寫出的記憶體用量與場景大小無關
+
+    分別寫出 baseline 與 count 個元素的全景，大場景的記憶體峰值不得超過
+    小場景的 STREAM_MEMORY_FACTOR 倍。
+
+    Returns:
+        (各場景的量測結果, 是否通過)
+    """
+    with tempfile.TemporaryDirectory() as workdir:
+        runs = [stream_peak(n, os.path.join(workdir, f"reef-{n}.svg"), seed) for n in (baseline, count)]
+    small, large = runs
+    limit = small["peak_bytes"] * STREAM_MEMORY_FACTOR
+    print(f"🌊 串流寫出（{baseline:,} 與 {count:,} 個元素的珊瑚礁全景）")
+    for run in runs:
+        print(f"   {run['elements']:>9,} 個元素: {run['bytes']:>12,} bytes，"
+              f"{run['elements_per_second']:,.0f} 元素/秒，記憶體峰值 {run['peak_bytes']:,} bytes")
+    print(f"   對照：先組成完整字串的記憶體峰值 {string_peak(count, seed):,} bytes")
+    passed = large["peak_bytes"] <= limit
+    print(f"{'✅' if passed else '❌'} 記憶體峰值 {large['peak_bytes']:,} bytes"
+          f"（上限 {limit:,.0f} = 小場景的 {STREAM_MEMORY_FACTOR} 倍）")
+    return runs, passed
+
+
+def arc_check(max_diff=ARC_CHECK_MAX_DIFF):
+    """確認內建點陣化把圓與等價的弧線路徑（最佳化器的轉換結果）畫得一樣
+
+    Returns:
+        ([(圖形, 尺寸, 最大差異)], 是否通過)
+    """
+    if np is None:
+        raise SystemExit("❌ 弧線檢查需要 NumPy")
+    # 白底讓每個像素都不透明，差異才反映覆蓋率（透明像素的顏色沒有意義）
+    wrap = ('<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 400 300">'
+            '<rect width="400" height="300" fill="#fff"/>{}</svg>')
+    jobs, labels = [], []
+    for tag, attrs in ARC_CHECK_SHAPES:
+        shape = " ".join(f'{name}="{value}"' for name, value in attrs.items())
+        jobs.append((wrap.format(f'<{tag} {shape} fill="#123"/>'), ARC_CHECK_SIZES))
+        jobs.append((wrap.format(f'<path d="{shape_path(tag, attrs)}" fill="#123"/>'),
+                     ARC_CHECK_SIZES))
+        labels.append(f"{tag} {shape}")
+    images = rasterize_scenes(jobs)
+    rows = []
+    print(f"⭕ 圓與弧線路徑的點陣化差異（上限 {max_diff}/255）")
+    for label, shape_images, path_images in zip(labels, images[::2], images[1::2]):
+        for size, a, b in zip(ARC_CHECK_SIZES, shape_images, path_images):
+            diff = int(np.abs(a.astype(int) - b.astype(int)).max())
+            rows.append((label, size, diff))
+            print(f" {'✅' if diff <= max_diff else '❌'} {label:<40}{size[0]:>5}×{size[1]:<5}"
+                  f"最大差異 {diff}")
+    return rows, all(diff <= max_diff for _, _, diff in rows)
+
+
+# ── 報告與比較 ─────────────────────────────────────────────────
+
+def print_corpus(name, report):
+    """以表格列出單一場景集各階段的吞吐量與延遲"""
+    print(f"   {'階段':<18}{'張/秒':>12}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    rows = list(report["stages"].items()) + [("（全流程）", report["pipeline"])]
+    for stage, stats in rows:
+        print(f"   {stage:<18}{stats['scenes_per_second']:>12,.1f}"
+              f"{stats['p50_ms']:>10.3f}{stats['p95_ms']:>10.3f}{stats['max_ms']:>10.3f}")
+
+
+def compare_results(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """比較兩份結果，回傳 [(場景集, 階段, 指標, 舊值, 新值, 變化比例, 是否退步)]"""
+    rows = []
+    for corpus, report in current["corpora"].items():
+        old_report = baseline.get("corpora", {}).get(corpus)
+        if old_report is None:
+            continue
+        old_stages = dict(old_report["stages"], **{"（全流程）": old_report["pipeline"]})
+        new_stages = dict(report["stages"], **{"（全流程）": report["pipeline"]})
+        for stage, stats in new_stages.items():
+            old = old_stages.get(stage)
+            if old is None:
+                continue
+            noisy = max(old["total_seconds"], stats["total_seconds"]) < MIN_COMPARE_SECONDS
+            for metric in ("p50_ms", "p95_ms"):
+                change = stats[metric] / old[metric] - 1 if old[metric] else 0.0
+                rows.append((corpus, stage, metric, old[metric], stats[metric], change,
+                             not noisy and change > threshold))
+    return rows
+
+
+def print_comparison(rows, threshold):
+    """列出比較結果，回傳是否有退步"""
+    print(f"📊 與基準比較（退步門檻 +{threshold * 100:.0f}%）:")
+    regressions = [row for row in rows if row[6]]
+    for corpus, stage, metric, old, new, change, regressed in rows:
+        mark = "❌" if regressed else "  "
+        print(f" {mark} {corpus:<18}{stage:<18}{metric:<8}"
+              f"{old:>10.3f} → {new:>10.3f}（{change * 100:+.1f}%）")
+    if regressions:
+        print(f"\n❌ {len(regressions)} 項指標退步超過 {threshold * 100:.0f}%")
+    else:
+        print("\n✅ 沒有退步")
+    return bool(regressions)
+
+
+def load_results(path):
+    with open(path, encoding="utf-8") as f:
+        results = json.load(f)
+    if results.get("version") != RESULTS_VERSION:
+        raise SystemExit(f"❌ {path} 的結果格式版本不符（{results.get('version')}）")
+    return results
+
+
+def parse_scales(value):
+    return tuple(int(item) for item in value.split(",") if item.strip())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="水族館動物圖片產生流程的效能基準測試")
+    parser.add_argument("--scales", default=",".join(map(str, DEFAULT_SCALES)),
+                        help="合成場景集的張數，以逗號分隔（預設 %(default)s，0 表示不產生）")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="重複次數，每張場景取最快的一次（預設 %(default)s）")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED,
+                        help="合成場景的亂數種子（預設 %(default)s）")
+    parser.add_argument("--raster-limit", type=int, default=DEFAULT_RASTER_LIMIT,
+                        help="每個場景集只對前幾張量測點陣化（預設 %(default)s）")
+    parser.add_argument("--no-raster", action="store_true",
+                        help="略過點陣化階段")
+    parser.add_argument("-o", "--output",
+                        help="把結果存成 JSON 檔")
+    parser.add_argument("--baseline",
+                        help="執行後與此 JSON 結果比較，退步時以狀態碼 1 結束")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"),
+                        help="不執行基準測試，只比較兩份 JSON 結果")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="p50／p95 變慢超過此比例視為退步（預設 %(default)s）")
+    parser.add_argument("--stream-check", nargs="?", type=int, const=STREAM_ELEMENTS, metavar="N",
+                        help="只檢查串流寫出 N 個元素的場景時記憶體峰值是否固定"
+                             f"（預設 {STREAM_ELEMENTS:,}），超出時以狀態碼 1 結束")
+    parser.add_argument("--arc-check", action="store_true",
+                        help="只檢查內建點陣化畫出的圓與弧線路徑差異不超過 "
+                             f"{ARC_CHECK_MAX_DIFF}/255，超出時以狀態碼 1 結束")
+    args = parser.parse_args(argv)
+
+    if args.arc_check:
+        _, passed = arc_check()
+        return 0 if passed else 1
+
+    if args.stream_check is not None:
+        if args.stream_check <= STREAM_BASELINE_ELEMENTS:
+            parser.error(f"--stream-check 必須大於 {STREAM_BASELINE_ELEMENTS}")
+        _, passed = stream_check(args.stream_check, seed=args.seed)
+        return 0 if passed else 1
+
+    if args.compare:
+        baseline, current = (load_results(path) for path in args.compare)
+        return 1 if print_comparison(compare_results(baseline, current, args.threshold),
+                                     args.threshold) else 0
+
+    try:
+        scales = tuple(count for count in parse_scales(args.scales) if count > 0)
+    except ValueError:
+        parser.error("--scales 必須是以逗號分隔的整數")
+    if args.repeat < 1:
+        parser.error("--repeat 必須大於 0")
+
+    results = run_benchmarks(scales, args.repeat, args.seed,
+                             raster=not args.no_raster, raster_limit=args.raster_limit)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"💾 結果已儲存到 {args.output}")
+
+    if args.baseline:
+        baseline = load_results(args.baseline)
+        return 1 if print_comparison(compare_results(baseline, results, args.threshold),
+                                     args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,882 +1,285 @@
 #!/usr/bin/env python3
 """
 生成可愛風格的水族館動物 SVG 圖片
-適用於童話故事書
+適用於童話故事書（實作位於 aquarium_images 套件，本檔只處理命令列）
+
+用法:
+  python3 generate_aquarium_images.py            # 產生 SVG 並平行轉換為 PNG
+  python3 generate_aquarium_images.py --jobs 4   # 指定平行工作數
+  python3 generate_aquarium_images.py --no-png   # 只產生 SVG
+  python3 generate_aquarium_images.py --force    # 忽略建置快取，全部重新產生
+  python3 generate_aquarium_images.py --widths 400,800 --formats png,webp
+                                                 # 指定響應式圖片的寬度與格式
+  python3 generate_aquarium_images.py --optimize-tree
+                                                 # 就地最佳化 wwwroot/images 下所有 SVG
+  python3 generate_aquarium_images.py --sprite   # 另外輸出合併所有動物的 sprite.svg
+  python3 generate_aquarium_images.py --atlas    # 另外把縮圖與動畫影格裝箱成紋理圖集
+  python3 generate_aquarium_images.py --quantize --dither 0.5
+                                                 # PNG 改用 8 位元索引色（失真過大時維持全彩）
+  python3 generate_aquarium_images.py --quantize-tree
+                                                 # 就地量化 wwwroot/images 下所有 PNG
+  python3 generate_aquarium_images.py --precompress
+                                                 # 另外輸出 .svg.gz／.svg.br 等預先壓縮檔
+  python3 generate_aquarium_images.py --watch    # 常駐監看，存檔後只重新產生改動的動物
+  python3 generate_aquarium_images.py --report build.json --metrics build.prom
+                                                 # 輸出各階段量測報告與 Prometheus 指標
+  python3 generate_aquarium_images.py --profile octopus
+                                                 # 以 cProfile 剖析單一動物的建置
+  python3 generate_aquarium_images.py --renderer numpy
+                                                 # 不用 rsvg-convert，改以內建的 NumPy 點陣化
+  python3 generate_aquarium_images.py --analyze  # 估算各場景的繪製成本，超出預算時失敗
+  python3 generate_aquarium_images.py --budget budget.json
+                                                 # 建置前先檢查繪製成本預算
+  python3 generate_aquarium_images.py --story-variants 100 --variant-seed 7
+                                                 # 每隻動物產生 100 張程序化故事插圖變體
+  python3 generate_aquarium_images.py --publish  # 部署前：把低畫質預覽、雪碧圖片段與指紋網址寫入 aquarium.json
+  python3 generate_aquarium_images.py -o /tmp/out --data /tmp/aquarium.json
+                                                 # 把低畫質預覽與指紋網址寫入指定的動物資料檔
 """
 
+import argparse
+import json
 import os
 
-# 輸出目錄
-OUTPUT_DIR = "/Users/qiuzili/StoryBook/StoryBook/wwwroot/images/aquarium"
+from aquarium_images.common import (
+    ANIMAL_DATA, ATLAS_MAP_NAME, ATLAS_MAX_SIZE, ATLAS_PADDING, ATLAS_THUMB_WIDTH,
+    FINGERPRINT_GRACE, IMAGES_DIR, OUTPUT_DIR, PROBE_MAX_DIFF, QUANTIZE_DITHER,
+    QUANTIZE_MAX_ERROR, RASTER_CACHE_MAX_BYTES, RASTER_CACHE_PATH, RASTER_FORMATS, RENDERERS,
+    RESPONSIVE_FORMATS, RESPONSIVE_WIDTHS, SPRITE_MAP_NAME, SPRITE_NAME, STORY_VARIANT_SEED,
+    STORY_VARIANTS_DIR, write_if_changed,
+)
+from aquarium_images.scene import ANIMALS, scene_svg
+from aquarium_images.optimize import optimize_tree
+from aquarium_images.quantize import quantize_tree
+from aquarium_images.renderers import render_tree
+from aquarium_images.cache import open_raster_cache
+from aquarium_images.analysis import COST_WEIGHTS, analysis_sources, analyze_costs, load_budget
+from aquarium_images.shard import parse_shard
+from aquarium_images.build import generate_images, merge_shards
+from aquarium_images.variants import generate_story_variants
+from aquarium_images.watch import watch
+
+
+def parse_list(value, item_type=str):
+    """解析以逗號分隔的命令列參數"""
+    return tuple(item_type(item.strip()) for item in value.split(",") if item.strip())
+
 
-# 15 隻水族館動物的 SVG 設計（可愛童話風格）
-ANIMALS = {
-    "clownfish": {
-        "svg": """<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 400 300">
-  <defs>
-    <linearGradient id="oceanBg" x1="0%" y1="0%" x2="0%" y2="100%">
-      <stop offset="0%" style="stop-color:#87CEEB;stop-opacity:1" />
-      <stop offset="100%" style="stop-color:#4682B4;stop-opacity:1" />
-    </linearGradient>
-  </defs>
-  
-  <!-- 背景 -->
-  <rect width="400" height="300" fill="url(#oceanBg)"/>
-  
-  <!-- 氣泡 -->
-  <circle cx="50" cy="50" r="8" fill="#fff" opacity="0.4"/>
-  <circle cx="350" cy="100" r="12" fill="#fff" opacity="0.3"/>
-  <circle cx="100" cy="250" r="6" fill="#fff" opacity="0.5"/>
-  
-  <!-- 海葵 -->
-  <ellipse cx="200" cy="280" rx="60" ry="20" fill="#9370DB" opacity="0.6"/>
-  <path d="M160,280 Q160,200 170,180" stroke="#DA70D6" stroke-width="8" fill="none" stroke-linecap="round"/>
-  <path d="M180,280 Q180,200 185,175" stroke="#DA70D6" stroke-width="8" fill="none" stroke-linecap="round"/>
-  <path d="M200,280 Q200,190 200,170" stroke="#DA70D6" stroke-width="8" fill="none" stroke-linecap="round"/>
-  <path d="M220,280 Q220,200 215,175" stroke="#DA70D6" stroke-width="8" fill="none" stroke-linecap="round"/>
-  <path d="M240,280 Q240,200 230,180" stroke="#DA70D6" stroke-width="8" fill="none" stroke-linecap="round"/>
-  
-  <!-- 小丑魚身體 -->
-  <ellipse cx="200" cy="150" rx="50" ry="35" fill="#FF6B35"/>
-  
-  <!-- 白色條紋 -->
-  <ellipse cx="170" cy="150" rx="12" ry="35" fill="#fff"/>
-  <ellipse cx="210" cy="150" rx="12" ry="35" fill="#fff"/>
-  
-  <!-- 尾巴 -->
-  <path d="M250,150 Q280,130 285,140 Q280,150 285,160 Q280,170 250,150" fill="#FF6B35"/>
-  
-  <!-- 背鰭 -->
-  <path d="M200,115 Q210,100 215,115" fill="#FF4500"/>
-  
-  <!-- 眼睛 -->
-  <circle cx="185" cy="145" r="8" fill="#fff"/>
-  <circle cx="185" cy="145" r="5" fill="#000"/>
-  <circle cx="187" cy="143" r="2" fill="#fff"/>
-  
-  <!-- 嘴巴（微笑）-->
-  <path d="M165,155 Q170,160 175,155" stroke="#000" stroke-width="2" fill="none" stroke-linecap="round"/>
-  
-  <!-- 胸鰭 -->
-  <ellipse cx="175" cy="165" rx="15" ry="8" fill="#FF8C66" opacity="0.8"/>
-</svg>"""
-    },
-    
-    "dolphin": {
-        "svg": """<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 400 300">
-  <defs>
-    <linearGradient id="oceanBg2" x1="0%" y1="0%" x2="0%" y2="100%">
-      <stop offset="0%" style="stop-color:#87CEEB;stop-opacity:1" />
-      <stop offset="100%" style="stop-color:#4682B4;stop-opacity:1" />
-    </linearGradient>
-  </defs>
-  
-  <!-- 背景 -->
-  <rect width="400" height="300" fill="url(#oceanBg2)"/>
-  
-  <!-- 氣泡 -->
-  <circle cx="60" cy="80" r="10" fill="#fff" opacity="0.4"/>
-  <circle cx="340" cy="120" r="8" fill="#fff" opacity="0.3"/>
-  <circle cx="150" cy="50" r="12" fill="#fff" opacity="0.5"/>
-  
-  <!-- 海豚身體 -->
-  <ellipse cx="200" cy="150" rx="70" ry="40" fill="#708090"/>
-  
-  <!-- 海豚頭部 -->
-  <ellipse cx="140" cy="145" rx="40" ry="35" fill="#778899"/>
-  
-  <!-- 嘴喙 -->
-  <ellipse cx="105" cy="148" rx="20" ry="12" fill="#778899"/>
-  
-  <!-- 背鰭 -->
-  <path d="M200,110 Q210,80 215,110" fill="#556B7D"/>
-  
-  <!-- 尾鰭 -->
-  <path d="M270,145 Q300,130 310,145 Q300,160 270,155 Z" fill="#556B7D"/>
-  
-  <!-- 胸鰭 -->
-  <ellipse cx="160" cy="170" rx="25" ry="12" fill="#556B7D" transform="rotate(-20 160 170)"/>
-  
-  <!-- 眼睛 -->
-  <circle cx="125" cy="140" r="6" fill="#fff"/>
-  <circle cx="125" cy="140" r="4" fill="#000"/>
-  <circle cx="126" cy="139" r="2" fill="#fff"/>
-  
-  <!-- 嘴巴（微笑）-->
-  <path d="M90,150 Q95,158 100,155" stroke="#000" stroke-width="2" fill="none" stroke-linecap="round"/>
-  
-  <!-- 肚子 -->
-  <ellipse cx="180" cy="165" rx="45" ry="25" fill="#D3D3D3" opacity="0.6"/>
-</svg>"""
-    },
-    
-    "sea-turtle": {
-        "svg": """<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 400 300">
-  <defs>
-    <linearGradient id="oceanBg3" x1="0%" y1="0%" x2="0%" y2="100%">
-      <stop offset="0%" style="stop-color:#87CEEB;stop-opacity:1" />
-      <stop offset="100%" style="stop-color:#4682B4;stop-opacity:1" />
-    </linearGradient>
-  </defs>
-  
-  <!-- 背景 -->
-  <rect width="400" height="300" fill="url(#oceanBg3)"/>
-  
-  <!-- 氣泡 -->
-  <circle cx="70" cy="60" r="10" fill="#fff" opacity="0.4"/>
-  <circle cx="330" cy="90" r="12" fill="#fff" opacity="0.3"/>
-  
-  <!-- 海龜殼（背甲）-->
-  <ellipse cx="200" cy="160" rx="80" ry="60" fill="#6B8E23"/>
-  
-  <!-- 龜殼花紋 -->
-  <circle cx="170" cy="140" r="15" fill="#556B2F"/>
-  <circle cx="210" cy="135" r="18" fill="#556B2F"/>
-  <circle cx="230" cy="160" r="16" fill="#556B2F"/>
-  <circle cx="200" cy="180" r="17" fill="#556B2F"/>
-  <circle cx="165" cy="175" r="14" fill="#556B2F"/>
-  
-  <!-- 龜殼邊緣 -->
-  <ellipse cx="200" cy="160" rx="80" ry="60" fill="none" stroke="#8FBC8F" stroke-width="4"/>
-  
-  <!-- 頭部 -->
-  <ellipse cx="110" cy="150" rx="25" ry="20" fill="#9ACD32"/>
-  
-  <!-- 眼睛 -->
-  <circle cx="105" cy="145" r="5" fill="#fff"/>
-  <circle cx="105" cy="145" r="3" fill="#000"/>
-  
-  <!-- 嘴巴（微笑）-->
-  <path d="M95,155 Q100,160 105,155" stroke="#000" stroke-width="2" fill="none" stroke-linecap="round"/>
-  
-  <!-- 前鰭 -->
-  <ellipse cx="140" cy="180" rx="35" ry="15" fill="#8FBC8F" transform="rotate(-30 140 180)"/>
-  <ellipse cx="140" cy="130" rx="35" ry="15" fill="#8FBC8F" transform="rotate(30 140 130)"/>
-  
-  <!-- 後鰭 -->
-  <ellipse cx="260" cy="180" rx="30" ry="12" fill="#8FBC8F" transform="rotate(30 260 180)"/>
-  <ellipse cx="260" cy="140" rx="30" ry="12" fill="#8FBC8F" transform="rotate(-30 260 140)"/>
-  
-  <!-- 尾巴 -->
-  <path d="M280,160 L300,155 L300,165 Z" fill="#8FBC8F"/>
-</svg>"""
-    },
-    
-    "jellyfish": {
-        "svg": """<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 400 300">
-  <defs>
-    <linearGradient id="oceanBg4" x1="0%" y1="0%" x2="0%" y2="100%">
-      <stop offset="0%" style="stop-color:#191970;stop-opacity:1" />
-      <stop offset="100%" style="stop-color:#000080;stop-opacity:1" />
-    </linearGradient>
-    <radialGradient id="jellyGlow">
-      <stop offset="0%" style="stop-color:#FFB6C1;stop-opacity:0.8" />
-      <stop offset="100%" style="stop-color:#FF69B4;stop-opacity:0.3" />
-    </radialGradient>
-  </defs>
-  
-  <!-- 深海背景 -->
-  <rect width="400" height="300" fill="url(#oceanBg4)"/>
-  
-  <!-- 發光水母頭部 -->
-  <ellipse cx="200" cy="120" rx="60" ry="50" fill="url(#jellyGlow)"/>
-  
-  <!-- 水母圓頂 -->
-  <path d="M140,120 Q200,60 260,120" fill="#FFB6C1" opacity="0.6"/>
-  
-  <!-- 水母內部花紋 -->
-  <ellipse cx="200" cy="110" rx="30" ry="25" fill="#FF1493" opacity="0.4"/>
-  <circle cx="200" cy="100" r="10" fill="#FF1493" opacity="0.6"/>
-  
-  <!-- 觸手 -->
-  <path d="M170,160 Q165,200 170,240" stroke="#FFB6C1" stroke-width="4" fill="none" opacity="0.7" stroke-linecap="round"/>
-  <path d="M185,165 Q180,210 185,260" stroke="#FFB6C1" stroke-width="4" fill="none" opacity="0.7" stroke-linecap="round"/>
-  <path d="M200,170 Q200,220 195,270" stroke="#FFB6C1" stroke-width="5" fill="none" opacity="0.7" stroke-linecap="round"/>
-  <path d="M215,165 Q220,210 215,260" stroke="#FFB6C1" stroke-width="4" fill="none" opacity="0.7" stroke-linecap="round"/>
-  <path d="M230,160 Q235,200 230,240" stroke="#FFB6C1" stroke-width="4" fill="none" opacity="0.7" stroke-linecap="round"/>
-  
-  <!-- 發光點 -->
-  <circle cx="180" cy="100" r="4" fill="#fff" opacity="0.9"/>
-  <circle cx="220" cy="105" r="3" fill="#fff" opacity="0.9"/>
-  <circle cx="200" cy="130" r="5" fill="#fff" opacity="0.8"/>
-  
-  <!-- 氣泡 -->
-  <circle cx="100" cy="100" r="8" fill="#fff" opacity="0.2"/>
-  <circle cx="300" cy="150" r="10" fill="#fff" opacity="0.2"/>
-</svg>"""
-    },
-    
-    "seahorse": {
-        "svg": """<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 400 300">
-  <defs>
-    <linearGradient id="oceanBg5" x1="0%" y1="0%" x2="0%" y2="100%">
-      <stop offset="0%" style="stop-color:#87CEEB;stop-opacity:1" />
-      <stop offset="100%" style="stop-color:#4682B4;stop-opacity:1" />
-    </linearGradient>
-  </defs>
-  
-  <!-- 背景 -->
-  <rect width="400" height="300" fill="url(#oceanBg5)"/>
-  
-  <!-- 海草 -->
-  <path d="M80,280 Q90,200 85,150 Q80,100 90,50" stroke="#2E8B57" stroke-width="6" fill="none"/>
-  <path d="M320,280 Q310,220 315,170 Q320,120 310,70" stroke="#3CB371" stroke-width="6" fill="none"/>
-  
-  <!-- 氣泡 -->
-  <circle cx="120" cy="80" r="8" fill="#fff" opacity="0.4"/>
-  <circle cx="280" cy="120" r="10" fill="#fff" opacity="0.3"/>
-  
-  <!-- 海馬身體 -->
-  <path d="M200,80 Q205,90 205,110 Q205,150 200,180 Q195,210 200,240" 
-        stroke="#FFD700" stroke-width="25" fill="none" stroke-linecap="round"/>
-  
-  <!-- 海馬頭部 -->
-  <circle cx="200" cy="75" r="18" fill="#FFD700"/>
-  
-  <!-- 海馬嘴部 -->
-  <ellipse cx="188" cy="75" rx="8" ry="5" fill="#FFA500"/>
-  
-  <!-- 海馬眼睛 -->
-  <circle cx="205" cy="72" r="5" fill="#fff"/>
-  <circle cx="205" cy="72" r="3" fill="#000"/>
-  
-  <!-- 海馬冠 -->
-  <path d="M200,57 Q205,50 208,57" fill="#FFA500"/>
-  <path d="M205,60 Q210,53 213,60" fill="#FFA500"/>
-  
-  <!-- 背鰭 -->
-  <path d="M205,100 Q220,105 205,110 Q220,115 205,120 Q220,125 205,130" 
-        stroke="#FFA500" stroke-width="3" fill="none"/>
-  
-  <!-- 尾巴（捲曲）-->
-  <path d="M200,240 Q210,250 215,260 Q218,270 210,275" 
-        stroke="#FFD700" stroke-width="20" fill="none" stroke-linecap="round"/>
-  
-  <!-- 腹部花紋 -->
-  <circle cx="200" cy="120" r="4" fill="#FFA500"/>
-  <circle cx="198" cy="150" r="4" fill="#FFA500"/>
-  <circle cx="200" cy="180" r="4" fill="#FFA500"/>
-  <circle cx="198" cy="210" r="4" fill="#FFA500"/>
-</svg>"""
-    },
-    
-    "octopus": {
-        "svg": """<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 400 300">
-  <defs>
-    <linearGradient id="oceanBg6" x1="0%" y1="0%" x2="0%" y2="100%">
-      <stop offset="0%" style="stop-color:#87CEEB;stop-opacity:1" />
-      <stop offset="100%" style="stop-color:#4682B4;stop-opacity:1" />
-    </linearGradient>
-  </defs>
-  
-  <!-- 背景 -->
-  <rect width="400" height="300" fill="url(#oceanBg6)"/>
-  
-  <!-- 氣泡 -->
-  <circle cx="80" cy="70" r="10" fill="#fff" opacity="0.4"/>
-  <circle cx="320" cy="100" r="12" fill="#fff" opacity="0.3"/>
-  
-  <!-- 章魚頭部 -->
-  <ellipse cx="200" cy="110" rx="55" ry="50" fill="#FF6347"/>
-  
-  <!-- 章魚眼睛 -->
-  <ellipse cx="180" cy="100" rx="12" ry="15" fill="#fff"/>
-  <ellipse cx="220" cy="100" rx="12" ry="15" fill="#fff"/>
-  <circle cx="180" cy="102" r="7" fill="#000"/>
-  <circle cx="220" cy="102" r="7" fill="#000"/>
-  <circle cx="182" cy="100" r="3" fill="#fff"/>
-  <circle cx="222" cy="100" r="3" fill="#fff"/>
-  
-  <!-- 章魚嘴巴（微笑）-->
-  <path d="M190,120 Q200,128 210,120" stroke="#000" stroke-width="2" fill="none" stroke-linecap="round"/>
-  
-  <!-- 8 隻腕足 -->
-  <!-- 左側 4 隻 -->
-  <path d="M160,140 Q140,180 130,220 Q125,240 135,250" 
-        stroke="#FF6347" stroke-width="18" fill="none" stroke-linecap="round"/>
-  <path d="M170,145 Q150,190 145,230 Q143,250 150,260" 
-        stroke="#FF6347" stroke-width="16" fill="none" stroke-linecap="round"/>
-  <path d="M180,150 Q165,200 165,240 Q165,260 170,270" 
-        stroke="#FF6347" stroke-width="16" fill="none" stroke-linecap="round"/>
-  <path d="M190,152 Q185,205 188,245 Q190,265 195,275" 
-        stroke="#FF6347" stroke-width="15" fill="none" stroke-linecap="round"/>
-  
-  <!-- 右側 4 隻 -->
-  <path d="M210,152 Q215,205 212,245 Q210,265 205,275" 
-        stroke="#FF6347" stroke-width="15" fill="none" stroke-linecap="round"/>
-  <path d="M220,150 Q235,200 235,240 Q235,260 230,270" 
-        stroke="#FF6347" stroke-width="16" fill="none" stroke-linecap="round"/>
-  <path d="M230,145 Q250,190 255,230 Q257,250 250,260" 
-        stroke="#FF6347" stroke-width="16" fill="none" stroke-linecap="round"/>
-  <path d="M240,140 Q260,180 270,220 Q275,240 265,250" 
-        stroke="#FF6347" stroke-width="18" fill="none" stroke-linecap="round"/>
-  
-  <!-- 吸盤（部分腕足上）-->
-  <circle cx="140" cy="200" r="4" fill="#FF4500" opacity="0.6"/>
-  <circle cx="135" cy="220" r="4" fill="#FF4500" opacity="0.6"/>
-  <circle cx="260" cy="200" r="4" fill="#FF4500" opacity="0.6"/>
-  <circle cx="265" cy="220" r="4" fill="#FF4500" opacity="0.6"/>
-</svg>"""
-    },
-    
-    "penguin": {
-        "svg": """<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 400 300">
-  <defs>
-    <linearGradient id="iceBg" x1="0%" y1="0%" x2="0%" y2="100%">
-      <stop offset="0%" style="stop-color:#B0E0E6;stop-opacity:1" />
-      <stop offset="100%" style="stop-color:#87CEEB;stop-opacity:1" />
-    </linearGradient>
-  </defs>
-  
-  <!-- 冰雪背景 -->
-  <rect width="400" height="300" fill="url(#iceBg)"/>
-  
-  <!-- 冰山 -->
-  <polygon points="50,250 120,180 190,250" fill="#F0F8FF" opacity="0.8"/>
-  <polygon points="280,250 330,200 380,250" fill="#F0F8FF" opacity="0.8"/>
-  
-  <!-- 雪花 -->
-  <text x="80" y="80" font-size="25" fill="#fff" opacity="0.6">❄</text>
-  <text x="300" y="120" font-size="20" fill="#fff" opacity="0.6">❄</text>
-  <text x="150" y="50" font-size="22" fill="#fff" opacity="0.6">❄</text>
-  
-  <!-- 企鵝身體 -->
-  <ellipse cx="200" cy="180" rx="50" ry="70" fill="#000"/>
-  
-  <!-- 企鵝肚子 -->
-  <ellipse cx="200" cy="190" rx="35" ry="55" fill="#fff"/>
-  
-  <!-- 企鵝頭部 -->
-  <ellipse cx="200" cy="110" rx="40" ry="45" fill="#000"/>
-  
-  <!-- 臉部 -->
-  <ellipse cx="200" cy="120" rx="28" ry="32" fill="#fff"/>
-  
-  <!-- 眼睛 -->
-  <circle cx="188" cy="110" r="6" fill="#000"/>
-  <circle cx="212" cy="110" r="6" fill="#000"/>
-  <circle cx="189" cy="109" r="2" fill="#fff"/>
-  <circle cx="213" cy="109" r="2" fill="#fff"/>
-  
-  <!-- 嘴巴 -->
-  <ellipse cx="200" cy="128" rx="8" ry="6" fill="#FFA500"/>
-  
-  <!-- 腮紅 -->
-  <ellipse cx="175" cy="125" rx="8" ry="5" fill="#FFB6C1" opacity="0.5"/>
-  <ellipse cx="225" cy="125" rx="8" ry="5" fill="#FFB6C1" opacity="0.5"/>
-  
-  <!-- 翅膀（鰭狀肢）-->
-  <ellipse cx="150" cy="160" rx="15" ry="50" fill="#000" transform="rotate(-20 150 160)"/>
-  <ellipse cx="250" cy="160" rx="15" ry="50" fill="#000" transform="rotate(20 250 160)"/>
-  
-  <!-- 腳 -->
-  <ellipse cx="180" cy="250" rx="18" ry="10" fill="#FFA500"/>
-  <ellipse cx="220" cy="250" rx="18" ry="10" fill="#FFA500"/>
-</svg>"""
-    },
-    
-    "shark": {
-        "svg": """<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 400 300">
-  <defs>
-    <linearGradient id="oceanBg7" x1="0%" y1="0%" x2="0%" y2="100%">
-      <stop offset="0%" style="stop-color:#87CEEB;stop-opacity:1" />
-      <stop offset="100%" style="stop-color:#4682B4;stop-opacity:1" />
-    </linearGradient>
-  </defs>
-  
-  <!-- 背景 -->
-  <rect width="400" height="300" fill="url(#oceanBg7)"/>
-  
-  <!-- 氣泡 -->
-  <circle cx="70" cy="70" r="10" fill="#fff" opacity="0.4"/>
-  <circle cx="330" cy="110" r="12" fill="#fff" opacity="0.3"/>
-  <circle cx="150" cy="250" r="8" fill="#fff" opacity="0.5"/>
-  
-  <!-- 鯊魚身體 -->
-  <ellipse cx="220" cy="150" rx="90" ry="45" fill="#708090"/>
-  
-  <!-- 鯊魚頭部 -->
-  <path d="M130,150 Q100,145 90,150 Q100,155 130,150" fill="#778899"/>
-  
-  <!-- 背鰭 -->
-  <path d="M220,105 Q235,70 240,105" fill="#556B7D"/>
-  
-  <!-- 尾鰭 -->
-  <path d="M310,145 Q350,120 360,140 Q350,145 340,150 Q350,160 310,155 Z" fill="#556B7D"/>
-  
-  <!-- 胸鰭 -->
-  <ellipse cx="170" cy="175" rx="30" ry="15" fill="#556B7D" transform="rotate(-15 170 175)"/>
-  
-  <!-- 腹鰭 -->
-  <path d="M240,180 Q245,200 250,180" fill="#556B7D"/>
-  
-  <!-- 眼睛（友善的）-->
-  <circle cx="120" cy="140" r="8" fill="#fff"/>
-  <circle cx="120" cy="140" r="5" fill="#000"/>
-  <circle cx="122" cy="138" r="2" fill="#fff"/>
-  
-  <!-- 嘴巴（微笑但有牙齒）-->
-  <path d="M85,153 Q100,162 115,153" stroke="#000" stroke-width="2" fill="none" stroke-linecap="round"/>
-  <line x1="92" y1="157" x2="92" y2="162" stroke="#fff" stroke-width="2"/>
-  <line x1="100" y1="159" x2="100" y2="164" stroke="#fff" stroke-width="2"/>
-  <line x1="108" y1="157" x2="108" y2="162" stroke="#fff" stroke-width="2"/>
-  
-  <!-- 肚子 -->
-  <ellipse cx="200" cy="165" rx="60" ry="30" fill="#D3D3D3" opacity="0.5"/>
-  
-  <!-- 鰓 -->
-  <path d="M150,145 Q148,150 150,155" stroke="#556B7D" stroke-width="2" fill="none"/>
-  <path d="M160,145 Q158,150 160,155" stroke="#556B7D" stroke-width="2" fill="none"/>
-  <path d="M170,145 Q168,150 170,155" stroke="#556B7D" stroke-width="2" fill="none"/>
-</svg>"""
-    },
-    
-    "manta-ray": {
-        "svg": """<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 400 300">
-  <defs>
-    <linearGradient id="oceanBg8" x1="0%" y1="0%" x2="0%" y2="100%">
-      <stop offset="0%" style="stop-color:#87CEEB;stop-opacity:1" />
-      <stop offset="100%" style="stop-color:#4682B4;stop-opacity:1" />
-    </linearGradient>
-  </defs>
-  
-  <!-- 背景 -->
-  <rect width="400" height="300" fill="url(#oceanBg8)"/>
-  
-  <!-- 氣泡 -->
-  <circle cx="80" cy="80" r="10" fill="#fff" opacity="0.4"/>
-  <circle cx="320" cy="120" r="12" fill="#fff" opacity="0.3"/>
-  
-  <!-- 鬼蝠魟身體（翼展）-->
-  <path d="M200,150 Q150,120 80,140 Q60,145 70,155 Q90,165 130,170 Q160,172 200,175 Z" 
-        fill="#2F4F4F"/>
-  <path d="M200,150 Q250,120 320,140 Q340,145 330,155 Q310,165 270,170 Q240,172 200,175 Z" 
-        fill="#2F4F4F"/>
-  
-  <!-- 身體中央 -->
-  <ellipse cx="200" cy="160" rx="40" ry="30" fill="#36454F"/>
-  
-  <!-- 頭部角（cephalic fins）-->
-  <ellipse cx="175" cy="145" rx="10" ry="20" fill="#2F4F4F" transform="rotate(-30 175 145)"/>
-  <ellipse cx="225" cy="145" rx="10" ry="20" fill="#2F4F4F" transform="rotate(30 225 145)"/>
-  
-  <!-- 眼睛 -->
-  <circle cx="185" cy="150" r="6" fill="#fff"/>
-  <circle cx="215" cy="150" r="6" fill="#fff"/>
-  <circle cx="185" cy="150" r="4" fill="#000"/>
-  <circle cx="215" cy="150" r="4" fill="#000"/>
-  
-  <!-- 嘴巴（微笑）-->
-  <ellipse cx="200" cy="165" rx="15" ry="8" fill="#000" opacity="0.7"/>
-  
-  <!-- 尾巴 -->
-  <path d="M200,185 Q200,220 195,260" stroke="#2F4F4F" stroke-width="8" fill="none" stroke-linecap="round"/>
-  
-  <!-- 肚子花紋 -->
-  <ellipse cx="200" cy="165" rx="25" ry="18" fill="#D3D3D3" opacity="0.3"/>
-  
-  <!-- 斑點 -->
-  <circle cx="180" cy="155" r="3" fill="#fff" opacity="0.6"/>
-  <circle cx="220" cy="160" r="3" fill="#fff" opacity="0.6"/>
-  <circle cx="200" cy="170" r="3" fill="#fff" opacity="0.6"/>
-</svg>"""
-    },
-    
-    "angelfish": {
-        "svg": """<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 400 300">
-  <defs>
-    <linearGradient id="oceanBg9" x1="0%" y1="0%" x2="0%" y2="100%">
-      <stop offset="0%" style="stop-color:#87CEEB;stop-opacity:1" />
-      <stop offset="100%" style="stop-color:#4682B4;stop-opacity:1" />
-    </linearGradient>
-  </defs>
-  
-  <!-- 背景 -->
-  <rect width="400" height="300" fill="url(#oceanBg9)"/>
-  
-  <!-- 珊瑚 -->
-  <circle cx="80" cy="260" r="25" fill="#FF6B9D" opacity="0.4"/>
-  <circle cx="100" cy="240" r="20" fill="#FF6B9D" opacity="0.4"/>
-  <circle cx="320" cy="270" r="30" fill="#9370DB" opacity="0.4"/>
-  
-  <!-- 氣泡 -->
-  <circle cx="120" cy="80" r="8" fill="#fff" opacity="0.4"/>
-  <circle cx="280" cy="100" r="10" fill="#fff" opacity="0.3"/>
-  
-  <!-- 神仙魚身體 -->
-  <ellipse cx="200" cy="150" rx="35" ry="50" fill="#FFD700"/>
-  
-  <!-- 背鰭（高大）-->
-  <path d="M185,100 Q190,60 200,55 Q210,60 215,100" fill="#FFA500"/>
-  
-  <!-- 臀鰭（對稱）-->
-  <path d="M185,200 Q190,240 200,245 Q210,240 215,200" fill="#FFA500"/>
-  
-  <!-- 條紋 -->
-  <ellipse cx="190" cy="150" rx="4" ry="45" fill="#FF8C00"/>
-  <ellipse cx="200" cy="150" rx="4" ry="48" fill="#FF8C00"/>
-  <ellipse cx="210" cy="150" rx="4" ry="45" fill="#FF8C00"/>
-  
-  <!-- 頭部 -->
-  <ellipse cx="170" cy="150" rx="20" ry="30" fill="#FFD700"/>
-  
-  <!-- 嘴部 -->
-  <ellipse cx="155" cy="150" rx="8" ry="10" fill="#FFA500"/>
-  
-  <!-- 眼睛 -->
-  <circle cx="165" cy="145" r="6" fill="#fff"/>
-  <circle cx="165" cy="145" r="4" fill="#000"/>
-  <circle cx="166" cy="144" r="2" fill="#fff"/>
-  
-  <!-- 尾鰭 -->
-  <path d="M235,140 Q270,130 280,145 Q270,160 235,160 Z" fill="#FFA500"/>
-  <line x1="240" y1="145" x2="265" y2="140" stroke="#FF8C00" stroke-width="2"/>
-  <line x1="240" y1="150" x2="270" y2="150" stroke="#FF8C00" stroke-width="2"/>
-  <line x1="240" y1="155" x2="265" y2="160" stroke="#FF8C00" stroke-width="2"/>
-  
-  <!-- 胸鰭 -->
-  <ellipse cx="175" cy="165" rx="18" ry="10" fill="#FFE4B5" opacity="0.7" transform="rotate(-30 175 165)"/>
-</svg>"""
-    },
-    
-    "sea-otter": {
-        "svg": """<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 400 300">
-  <defs>
-    <linearGradient id="oceanBg10" x1="0%" y1="0%" x2="0%" y2="100%">
-      <stop offset="0%" style="stop-color:#87CEEB;stop-opacity:1" />
-      <stop offset="100%" style="stop-color:#4682B4;stop-opacity:1" />
-    </linearGradient>
-  </defs>
-  
-  <!-- 背景 -->
-  <rect width="400" height="300" fill="url(#oceanBg10)"/>
-  
-  <!-- 水波紋 -->
-  <path d="M50,180 Q100,170 150,180 Q200,190 250,180 Q300,170 350,180" 
-        stroke="#fff" stroke-width="2" fill="none" opacity="0.3"/>
-  
-  <!-- 海獺身體（仰躺）-->
-  <ellipse cx="200" cy="160" rx="50" ry="35" fill="#8B4513"/>
-  
-  <!-- 肚子 -->
-  <ellipse cx="200" cy="165" rx="38" ry="25" fill="#D2B48C"/>
-  
-  <!-- 頭部 -->
-  <circle cx="200" cy="110" r="30" fill="#8B4513"/>
-  
-  <!-- 臉部 -->
-  <ellipse cx="200" cy="115" rx="22" ry="25" fill="#D2B48C"/>
-  
-  <!-- 耳朵 -->
-  <ellipse cx="180" cy="95" rx="8" ry="12" fill="#8B4513"/>
-  <ellipse cx="220" cy="95" rx="8" ry="12" fill="#8B4513"/>
-  <ellipse cx="180" cy="97" rx="5" ry="8" fill="#A0522D"/>
-  <ellipse cx="220" cy="97" rx="5" ry="8" fill="#A0522D"/>
-  
-  <!-- 眼睛（閉著，幸福的樣子）-->
-  <path d="M190,110 Q195,112 200,110" stroke="#000" stroke-width="3" fill="none" stroke-linecap="round"/>
-  <path d="M200,110 Q205,112 210,110" stroke="#000" stroke-width="3" fill="none" stroke-linecap="round"/>
-  
-  <!-- 鼻子 -->
-  <circle cx="200" cy="120" r="4" fill="#000"/>
-  
-  <!-- 鬍鬚 -->
-  <line x1="175" y1="120" x2="155" y2="118" stroke="#000" stroke-width="1"/>
-  <line x1="175" y1="125" x2="155" y2="128" stroke="#000" stroke-width="1"/>
-  <line x1="225" y1="120" x2="245" y2="118" stroke="#000" stroke-width="1"/>
-  <line x1="225" y1="125" x2="245" y2="128" stroke="#000" stroke-width="1"/>
-  
-  <!-- 手臂（抱著貝殼）-->
-  <ellipse cx="165" cy="155" rx="12" ry="25" fill="#8B4513" transform="rotate(-20 165 155)"/>
-  <ellipse cx="235" cy="155" rx="12" ry="25" fill="#8B4513" transform="rotate(20 235 155)"/>
-  
-  <!-- 貝殼 -->
-  <ellipse cx="200" cy="150" rx="20" ry="15" fill="#FFE4B5"/>
-  <path d="M185,150 L200,140 L215,150" stroke="#D2691E" stroke-width="2" fill="none"/>
-  <path d="M185,150 L200,160 L215,150" stroke="#D2691E" stroke-width="2" fill="none"/>
-  
-  <!-- 腳 -->
-  <ellipse cx="180" cy="190" rx="15" ry="10" fill="#8B4513"/>
-  <ellipse cx="220" cy="190" rx="15" ry="10" fill="#8B4513"/>
-  
-  <!-- 尾巴 -->
-  <ellipse cx="200" cy="200" rx="18" ry="25" fill="#8B4513" transform="rotate(10 200 200)"/>
-</svg>"""
-    },
-    
-    "pufferfish": {
-        "svg": """<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 400 300">
-  <defs>
-    <linearGradient id="oceanBg11" x1="0%" y1="0%" x2="0%" y2="100%">
-      <stop offset="0%" style="stop-color:#87CEEB;stop-opacity:1" />
-      <stop offset="100%" style="stop-color:#4682B4;stop-opacity:1" />
-    </linearGradient>
-  </defs>
-  
-  <!-- 背景 -->
-  <rect width="400" height="300" fill="url(#oceanBg11)"/>
-  
-  <!-- 氣泡 -->
-  <circle cx="90" cy="90" r="10" fill="#fff" opacity="0.4"/>
-  <circle cx="310" cy="110" r="12" fill="#fff" opacity="0.3"/>
-  
-  <!-- 河豚身體（鼓起來的球狀）-->
-  <circle cx="200" cy="150" r="70" fill="#FFEB3B"/>
-  
-  <!-- 斑點 -->
-  <circle cx="160" cy="130" r="8" fill="#FF9800"/>
-  <circle cx="180" cy="110" r="6" fill="#FF9800"/>
-  <circle cx="220" cy="115" r="7" fill="#FF9800"/>
-  <circle cx="240" cy="135" r="8" fill="#FF9800"/>
-  <circle cx="230" cy="170" r="6" fill="#FF9800"/>
-  <circle cx="170" cy="175" r="7" fill="#FF9800"/>
-  <circle cx="200" cy="190" r="6" fill="#FF9800"/>
-  
-  <!-- 刺（短短的）-->
-  <line x1="150" y1="100" x2="142" y2="90" stroke="#FFA500" stroke-width="3" stroke-linecap="round"/>
-  <line x1="170" y1="85" x2="168" y2="72" stroke="#FFA500" stroke-width="3" stroke-linecap="round"/>
-  <line x1="200" y1="80" x2="200" y2="65" stroke="#FFA500" stroke-width="3" stroke-linecap="round"/>
-  <line x1="230" y1="85" x2="232" y2="72" stroke="#FFA500" stroke-width="3" stroke-linecap="round"/>
-  <line x1="250" y1="100" x2="258" y2="90" stroke="#FFA500" stroke-width="3" stroke-linecap="round"/>
-  <line x1="265" y1="130" x2="278" y2="125" stroke="#FFA500" stroke-width="3" stroke-linecap="round"/>
-  <line x1="270" y1="160" x2="283" y2="162" stroke="#FFA500" stroke-width="3" stroke-linecap="round"/>
-  <line x1="135" y1="130" x2="122" y2="125" stroke="#FFA500" stroke-width="3" stroke-linecap="round"/>
-  <line x1="130" y1="160" x2="117" y2="162" stroke="#FFA500" stroke-width="3" stroke-linecap="round"/>
-  
-  <!-- 眼睛（大大的）-->
-  <circle cx="175" cy="140" r="12" fill="#fff"/>
-  <circle cx="225" cy="140" r="12" fill="#fff"/>
-  <circle cx="175" cy="140" r="8" fill="#000"/>
-  <circle cx="225" cy="140" r="8" fill="#000"/>
-  <circle cx="177" cy="138" r="4" fill="#fff"/>
-  <circle cx="227" cy="138" r="4" fill="#fff"/>
-  
-  <!-- 嘴巴（小小的O型）-->
-  <circle cx="200" cy="165" r="8" fill="#FF9800"/>
-  <circle cx="200" cy="165" r="5" fill="#000" opacity="0.5"/>
-  
-  <!-- 鰭（小小的）-->
-  <ellipse cx="130" cy="155" rx="8" ry="15" fill="#FFD54F" opacity="0.8"/>
-  <ellipse cx="270" cy="155" rx="8" ry="15" fill="#FFD54F" opacity="0.8"/>
-  
-  <!-- 尾鰭 -->
-  <path d="M265,175 L285,170 L285,180 Z" fill="#FFD54F"/>
-</svg>"""
-    },
-    
-    "goldfish": {
-        "svg": """<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 400 300">
-  <defs>
-    <linearGradient id="aquariumBg" x1="0%" y1="0%" x2="0%" y2="100%">
-      <stop offset="0%" style="stop-color:#E0F7FA;stop-opacity:1" />
-      <stop offset="100%" style="stop-color:#B2EBF2;stop-opacity:1" />
-    </linearGradient>
-  </defs>
-  
-  <!-- 水族箱背景 -->
-  <rect width="400" height="300" fill="url(#aquariumBg)"/>
-  
-  <!-- 水族箱裝飾 -->
-  <ellipse cx="100" cy="270" rx="40" ry="15" fill="#4CAF50" opacity="0.5"/>
-  <ellipse cx="320" cy="275" rx="35" ry="12" fill="#4CAF50" opacity="0.5"/>
-  
-  <!-- 氣泡 -->
-  <circle cx="80" cy="200" r="6" fill="#fff" opacity="0.5"/>
-  <circle cx="85" cy="150" r="8" fill="#fff" opacity="0.4"/>
-  <circle cx="90" cy="100" r="10" fill="#fff" opacity="0.3"/>
-  <circle cx="320" cy="180" r="7" fill="#fff" opacity="0.5"/>
-  
-  <!-- 金魚身體 -->
-  <ellipse cx="200" cy="140" rx="50" ry="35" fill="#FF6F00"/>
-  
-  <!-- 金魚頭部 -->
-  <ellipse cx="155" cy="140" rx="30" ry="28" fill="#FF8F00"/>
-  
-  <!-- 眼睛 -->
-  <circle cx="148" cy="132" r="8" fill="#fff"/>
-  <circle cx="148" cy="132" r="5" fill="#000"/>
-  <circle cx="150" cy="130" r="2" fill="#fff"/>
-  
-  <!-- 嘴巴 -->
-  <ellipse cx="135" cy="143" rx="8" ry="6" fill="#FF6F00"/>
-  <path d="M130,143 Q132,148 135,145" stroke="#000" stroke-width="1" fill="none"/>
-  
-  <!-- 背鰭（飄逸的）-->
-  <path d="M200,105 Q220,80 230,100 Q225,110 200,115" fill="#FF9800" opacity="0.8"/>
-  
-  <!-- 尾鰭（大而飄逸）-->
-  <path d="M250,130 Q290,110 300,130 Q290,150 250,150 Z" fill="#FF5722" opacity="0.9"/>
-  <path d="M250,135 Q280,120 288,135" stroke="#FF6F00" stroke-width="2" fill="none"/>
-  <path d="M250,140 Q280,128 288,140" stroke="#FF6F00" stroke-width="2" fill="none"/>
-  <path d="M250,145 Q280,136 288,145" stroke="#FF6F00" stroke-width="2" fill="none"/>
-  
-  <!-- 腹鰭 -->
-  <ellipse cx="180" cy="165" rx="20" ry="12" fill="#FF9800" opacity="0.7" transform="rotate(-30 180 165)"/>
-  
-  <!-- 臀鰭 -->
-  <path d="M215,165 Q230,185 235,170" fill="#FF9800" opacity="0.8"/>
-  
-  <!-- 鱗片紋理 -->
-  <circle cx="180" cy="135" r="4" fill="#FFB74D" opacity="0.4"/>
-  <circle cx="200" cy="140" r="4" fill="#FFB74D" opacity="0.4"/>
-  <circle cx="220" cy="138" r="4" fill="#FFB74D" opacity="0.4"/>
-  <circle cx="190" cy="150" r="4" fill="#FFB74D" opacity="0.4"/>
-  <circle cx="210" cy="152" r="4" fill="#FFB74D" opacity="0.4"/>
-</svg>"""
-    },
-    
-    "anglerfish": {
-        "svg": """<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 400 300">
-  <defs>
-    <linearGradient id="deepseaBg" x1="0%" y1="0%" x2="0%" y2="100%">
-      <stop offset="0%" style="stop-color:#001F3F;stop-opacity:1" />
-      <stop offset="100%" style="stop-color:#000814;stop-opacity:1" />
-    </linearGradient>
-    <radialGradient id="lightGlow">
-      <stop offset="0%" style="stop-color:#FFFF00;stop-opacity:1" />
-      <stop offset="100%" style="stop-color:#FFD700;stop-opacity:0" />
-    </radialGradient>
-  </defs>
-  
-  <!-- 深海背景 -->
-  <rect width="400" height="300" fill="url(#deepseaBg)"/>
-  
-  <!-- 鮟鱇魚發光器（最重要的特徵）-->
-  <line x1="185" y1="100" x2="165" y2="50" stroke="#4A4A4A" stroke-width="3"/>
-  <circle cx="165" cy="50" r="15" fill="url(#lightGlow)"/>
-  <circle cx="165" cy="50" r="8" fill="#FFFF00"/>
-  
-  <!-- 光暈效果 -->
-  <circle cx="165" cy="50" r="25" fill="#FFFF00" opacity="0.2"/>
-  <circle cx="165" cy="50" r="35" fill="#FFD700" opacity="0.1"/>
-  
-  <!-- 鮟鱇魚身體 -->
-  <ellipse cx="220" cy="150" rx="70" ry="50" fill="#2C3E50"/>
-  
-  <!-- 頭部 -->
-  <ellipse cx="160" cy="145" rx="50" ry="45" fill="#34495E"/>
-  
-  <!-- 大嘴巴（張開）-->
-  <path d="M120,155 Q130,175 150,165" fill="#000" opacity="0.8"/>
-  <ellipse cx="135" cy="165" rx="25" ry="12" fill="#1C1C1C"/>
-  
-  <!-- 牙齒（尖銳但可愛化）-->
-  <polygon points="125,160 128,170 131,160" fill="#F0F0F0"/>
-  <polygon points="135,158 138,168 141,158" fill="#F0F0F0"/>
-  <polygon points="145,160 148,170 151,160" fill="#F0F0F0"/>
-  
-  <!-- 眼睛（小小的）-->
-  <circle cx="145" cy="135" r="6" fill="#FFD700"/>
-  <circle cx="145" cy="135" r="3" fill="#000"/>
-  
-  <!-- 背鰭 -->
-  <path d="M220,100 Q235,85 240,105" fill="#1C2833"/>
-  
-  <!-- 胸鰭 -->
-  <ellipse cx="180" cy="175" rx="25" ry="12" fill="#1C2833" transform="rotate(-20 180 175)"/>
-  
-  <!-- 尾鰭 -->
-  <path d="M285,145 Q310,130 315,150 Q310,165 285,155 Z" fill="#1C2833"/>
-  
-  <!-- 腹部（略淺色）-->
-  <ellipse cx="210" cy="165" rx="50" ry="30" fill="#4A5568" opacity="0.5"/>
-  
-  <!-- 發光生物（遠處）-->
-  <circle cx="50" cy="80" r="3" fill="#00FFFF" opacity="0.6"/>
-  <circle cx="350" cy="200" r="4" fill="#00FF7F" opacity="0.5"/>
-  <circle cx="300" cy="100" r="2" fill="#FF69B4" opacity="0.7"/>
-</svg>"""
-    },
-    
-    "beluga-whale": {
-        "svg": """<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 400 300">
-  <defs>
-    <linearGradient id="arcticBg" x1="0%" y1="0%" x2="0%" y2="100%">
-      <stop offset="0%" style="stop-color:#B0E0E6;stop-opacity:1" />
-      <stop offset="100%" style="stop-color:#87CEEB;stop-opacity:1" />
-    </linearGradient>
-  </defs>
-  
-  <!-- 北極海背景 -->
-  <rect width="400" height="300" fill="url(#arcticBg)"/>
-  
-  <!-- 冰塊 -->
-  <polygon points="50,40 100,30 110,50 60,55" fill="#F0F8FF" opacity="0.7"/>
-  <polygon points="320,60 370,50 380,70 330,75" fill="#F0F8FF" opacity="0.7"/>
-  
-  <!-- 氣泡 -->
-  <circle cx="120" cy="180" r="8" fill="#fff" opacity="0.5"/>
-  <circle cx="130" cy="140" r="10" fill="#fff" opacity="0.4"/>
-  <circle cx="140" cy="100" r="12" fill="#fff" opacity="0.3"/>
-  
-  <!-- 白鯨身體 -->
-  <ellipse cx="220" cy="160" rx="80" ry="45" fill="#F5F5F5"/>
-  
-  <!-- 白鯨頭部（圓圓的額頭 - melon）-->
-  <circle cx="145" cy="155" r="45" fill="#FFFFFF"/>
-  
-  <!-- 嘴部（微笑）-->
-  <ellipse cx="110" cy="160" rx="20" ry="15" fill="#F5F5F5"/>
-  <path d="M95,165 Q105,172 115,165" stroke="#000" stroke-width="2" fill="none" stroke-linecap="round"/>
-  
-  <!-- 眼睛（小而友善）-->
-  <circle cx="130" cy="145" r="5" fill="#000"/>
-  <circle cx="132" cy="144" r="2" fill="#fff"/>
-  
-  <!-- 胸鰭 -->
-  <ellipse cx="170" cy="185" rx="30" ry="15" fill="#E8E8E8" transform="rotate(-25 170 185)"/>
-  <ellipse cx="170" cy="135" rx="30" ry="15" fill="#E8E8E8" transform="rotate(25 170 135)"/>
-  
-  <!-- 背脊（隆起，沒有背鰭）-->
-  <path d="M210,115 Q230,110 250,115" stroke="#E8E8E8" stroke-width="8" fill="none" stroke-linecap="round"/>
-  
-  <!-- 尾鰭 -->
-  <path d="M300,150 Q330,135 345,150 Q330,165 300,165 Z" fill="#E8E8E8"/>
-  <path d="M305,150 Q325,140 335,150" stroke="#D3D3D3" stroke-width="2" fill="none"/>
-  <path d="M305,160 Q325,165 335,160" stroke="#D3D3D3" stroke-width="2" fill="none"/>
-  
-  <!-- 皺褶（特徵）-->
-  <path d="M160,165 Q165,167 170,165" stroke="#E0E0E0" stroke-width="1" fill="none"/>
-  <path d="M180,170 Q185,172 190,170" stroke="#E0E0E0" stroke-width="1" fill="none"/>
-  
-  <!-- 噴氣孔 -->
-  <ellipse cx="155" cy="125" rx="6" ry="4" fill="#D3D3D3"/>
-  
-  <!-- 水花（呼吸）-->
-  <circle cx="155" cy="110" r="4" fill="#87CEEB" opacity="0.4"/>
-  <circle cx="150" cy="100" r="3" fill="#87CEEB" opacity="0.3"/>
-  <circle cx="160" cy="105" r="3" fill="#87CEEB" opacity="0.3"/>
-</svg>"""
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="生成可愛風格的水族館動物圖片")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                        help="平行工作行程數（預設為 CPU 核心數）")
+    parser.add_argument("-o", "--output", default=OUTPUT_DIR,
+                        help="輸出目錄（預設為 wwwroot/images/aquarium）")
+    parser.add_argument("--no-png", action="store_true",
+                        help="只產生 SVG，不轉換為 PNG")
+    parser.add_argument("--force", action="store_true",
+                        help="忽略建置快取，全部重新產生")
+    parser.add_argument("--widths", default=",".join(map(str, RESPONSIVE_WIDTHS)),
+                        help="響應式圖片寬度，以逗號分隔（預設 %(default)s）")
+    parser.add_argument("--formats", default=",".join(RESPONSIVE_FORMATS),
+                        help="響應式圖片格式，以逗號分隔（預設 %(default)s）")
+    parser.add_argument("--renderer", choices=("auto",) + RENDERERS, default="auto",
+                        help="點陣化工具（預設 auto：依序使用 rsvg-convert、resvg、Inkscape，"
+                             "都沒有時用內建的 NumPy 點陣化）")
+    parser.add_argument("--data", metavar="PATH",
+                        help="把低畫質預覽與指紋網址寫入此網站資料檔（預設不改寫任何資料檔）")
+    parser.add_argument("--publish", action="store_true",
+                        help="更新網站的 wwwroot/data/aquarium.json（低畫質預覽、雪碧圖片段與"
+                             "指紋網址，部署前執行；隱含 --sprite）")
+    parser.add_argument("--no-fingerprint", action="store_true",
+                        help="資料檔維持固定網址，不改用內容指紋檔名（main.<雜湊>.png）")
+    parser.add_argument("--fingerprint-grace", type=float, default=FINGERPRINT_GRACE / 86400,
+                        metavar="DAYS", help="被取代的指紋檔保留天數（預設 %(default)g）")
+    parser.add_argument("--quantize", action="store_true",
+                        help="把 PNG 轉為 8 位元索引色（失真超過 --max-error 時維持全彩）")
+    parser.add_argument("--dither", type=float, default=QUANTIZE_DITHER,
+                        help="量化時的有序抖色強度，0 表示不抖色（預設 %(default)s）")
+    parser.add_argument("--max-error", type=float, default=QUANTIZE_MAX_ERROR,
+                        help="量化可接受的平均 ΔE（預設 %(default)s）")
+    parser.add_argument("--quantize-tree", nargs="?", const=IMAGES_DIR, metavar="DIR",
+                        help="就地量化目錄下所有 PNG 並依動物列出節省的大小後結束（預設 wwwroot/images）")
+    parser.add_argument("--visual-gate", nargs="?", type=int, const=PROBE_MAX_DIFF,
+                        metavar="MAX_DIFF",
+                        help="以低解析度探針比對上次的畫面，差異不超過 MAX_DIFF（0–255，"
+                             f"預設 {PROBE_MAX_DIFF}）時保留舊的點陣圖（需要 NumPy）")
+    parser.add_argument("--render-tree", nargs="?", const=IMAGES_DIR, metavar="DIR",
+                        help="以外部點陣化工具把目錄下所有 main.svg 重新轉為 main.png"
+                             "（預設為 wwwroot/images）")
+    parser.add_argument("--shard", type=parse_shard, metavar="I/N",
+                        help="只建置第 I 片（共 N 片，依繪製成本平均分配），供多台 CI 機器分工")
+    parser.add_argument("--merge", nargs="+", metavar="SHARD_DIR",
+                        help="合併各分片的輸出目錄到 -o 指定的目錄，並合併量測報告（--report）")
+    parser.add_argument("--raster-cache", default=RASTER_CACHE_PATH, metavar="PATH",
+                        help="跨建置共用的點陣圖快取檔（預設 ~/.cache/storybook/rasters.sqlite）")
+    parser.add_argument("--no-raster-cache", action="store_true",
+                        help="不使用點陣圖快取")
+    parser.add_argument("--raster-cache-size", type=float,
+                        default=RASTER_CACHE_MAX_BYTES / 1048576, metavar="MB",
+                        help=f"點陣圖快取的容量上限（MB，預設 {RASTER_CACHE_MAX_BYTES // 1048576}）")
+    parser.add_argument("--raster-cache-stats", action="store_true",
+                        help="列出點陣圖快取的累計統計後結束")
+    parser.add_argument("--no-responsive", action="store_true",
+                        help="只產生 main.png，不產生響應式圖片")
+    parser.add_argument("--no-optimize", action="store_true",
+                        help="原樣寫出 ANIMALS 中的 SVG，不做最佳化")
+    parser.add_argument("--sprite", action="store_true",
+                        help=f"另外輸出合併所有動物的 {SPRITE_NAME} 與 {SPRITE_MAP_NAME}")
+    parser.add_argument("--atlas", action="store_true",
+                        help=f"把縮圖與 frames/*.png 動畫影格裝箱成紋理圖集與 {ATLAS_MAP_NAME}")
+    parser.add_argument("--atlas-size", type=int, default=ATLAS_MAX_SIZE,
+                        help="單張紋理圖集的邊長上限（預設 %(default)s）")
+    parser.add_argument("--precompress", action="store_true",
+                        help="為 SVG 與 JSON 輸出產生最高壓縮等級的 .gz／.br 副本")
+    parser.add_argument("--watch", action="store_true",
+                        help="常駐監看場景原始檔，存檔後只重新產生改動的動物")
+    parser.add_argument("--poll", action="store_true",
+                        help="監看模式改用輪詢（inotify 無法使用時會自動改用）")
+    parser.add_argument("--report", metavar="PATH",
+                        help="輸出 JSON 量測報告（各動物、各階段的耗時、位元組、元素數與記憶體峰值）")
+    parser.add_argument("--metrics", metavar="PATH",
+                        help="輸出 Prometheus textfile 格式的量測指標")
+    parser.add_argument("--profile", metavar="ANIMAL",
+                        help="以 cProfile 剖析指定動物的建置（一律重新產生）")
+    parser.add_argument("--analyze", nargs="?", const=IMAGES_DIR, metavar="DIR",
+                        help="估算 ANIMALS 與目錄下 SVG 的繪製成本並排名，超出預算時以狀態碼 1 結束"
+                             "（預設 wwwroot/images）")
+    parser.add_argument("--budget", metavar="PATH",
+                        help="繪製成本預算 JSON（覆寫預設上限）；建置時指定會先檢查 ANIMALS")
+    parser.add_argument("--story-variants", type=int, metavar="N",
+                        help="為每隻動物產生 N 張程序化故事插圖變體後結束")
+    parser.add_argument("--variant-seed", type=int, default=STORY_VARIANT_SEED,
+                        help="故事插圖變體的亂數種子（預設 %(default)s）")
+    parser.add_argument("--story-dir", default=STORY_VARIANTS_DIR,
+                        help="故事插圖變體的輸出目錄（預設 wwwroot/images/aquarium-stories）")
+    parser.add_argument("--optimize-tree", nargs="?", const=IMAGES_DIR, metavar="DIR",
+                        help="就地最佳化目錄下所有 SVG 檔後結束（預設 wwwroot/images）")
+    args = parser.parse_args(argv)
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs 必須大於 0")
+    if args.optimize_tree:
+        optimize_tree(args.optimize_tree, jobs=args.jobs)
+        return 0
+    if args.raster_cache_size <= 0:
+        parser.error("--raster-cache-size 必須大於 0")
+    if args.raster_cache_stats:
+        cache = open_raster_cache({"path": args.raster_cache,
+                                   "max_bytes": args.raster_cache_size * 1048576})
+        if cache is None:
+            return 1
+        with cache:
+            stats = cache.stats()
+        lookups = stats["hits"] + stats["misses"]
+        print(f"🗄️  點陣圖快取: {stats['path']}")
+        print(f"   {stats['entries']} 筆、{stats['bytes'] / 1048576:.1f}/{stats['max_bytes'] / 1048576:.1f} MB")
+        print(f"   累計命中 {stats['hits']}/{lookups}（{stats['hits'] / lookups if lookups else 0:.0%}）、"
+              f"存入 {stats['stored']}、淘汰 {stats['evictions']}")
+        return 0
+    if args.render_tree:
+        results = render_tree(args.render_tree, args.renderer, args.jobs)
+        return 1 if results is None or any(isinstance(r, Exception) for r in results.values()) else 0
+    if args.dither < 0 or args.max_error < 0:
+        parser.error("--dither 與 --max-error 不可為負數")
+    if args.quantize_tree:
+        reports = quantize_tree(args.quantize_tree, args.jobs, args.dither, args.max_error)
+        return 1 if reports is None else 0
+    if args.story_variants is not None:
+        if args.story_variants < 1:
+            parser.error("--story-variants 必須大於 0")
+        print(f"🎲 產生故事插圖變體: {len(ANIMALS)} 隻動物 × {args.story_variants} 張"
+              f"（種子 {args.variant_seed}）")
+        stats = generate_story_variants(args.story_dir, args.story_variants, args.variant_seed,
+                                        jobs=args.jobs)
+        print(f"✅ {stats['scenes']:,} 張場景，{stats['unique']:,} 張不重複"
+              f"（重複 {stats['duplicates']:,}），寫入 {stats['written']:,} 個檔案、"
+              f"移除 {stats['removed']:,} 個舊檔")
+        print(f"⏱️  {stats['seconds']:.2f} 秒，{stats['scenes_per_second']:,.1f} 張/秒"
+              f"（{args.jobs} 個工作行程）")
+        print(f"📁 變體位置: {args.story_dir}")
+        return 0
+    try:
+        budget = load_budget(args.budget)
+    except (OSError, ValueError) as e:
+        parser.error(f"無法讀取預算檔: {e}")
+    if args.analyze:
+        report = analyze_costs(analysis_sources(args.analyze, args.output), budget)
+        if args.report:
+            data = json.dumps({"budget": budget, "weights": COST_WEIGHTS, "scenes": report},
+                              indent=2, ensure_ascii=False) + "\n"
+            write_if_changed(args.report, data.encode('utf-8'))
+            print(f"📝 成本報告: {args.report}")
+        return 1 if any(entry["over"] for entry in report) else 0
+    if args.budget:
+        sources = {animal_id: scene_svg(data) for animal_id, data in ANIMALS.items()}
+        if any(entry["over"] for entry in analyze_costs(sources, budget)):
+            print("❌ 繪製成本超出預算，停止建置")
+            return 1
+    try:
+        widths = parse_list(args.widths, int)
+    except ValueError:
+        parser.error("--widths 必須是以逗號分隔的整數")
+    if any(width < 1 for width in widths):
+        parser.error("--widths 必須大於 0")
+    formats = parse_list(args.formats.lower())
+    unknown = [fmt for fmt in formats if fmt not in RASTER_FORMATS]
+    if unknown:
+        parser.error(f"不支援的格式: {', '.join(unknown)}")
+
+    if args.visual_gate is not None and not 0 <= args.visual_gate <= 255:
+        parser.error("--visual-gate 必須介於 0 到 255")
+    if args.atlas_size < ATLAS_THUMB_WIDTH + 2 * ATLAS_PADDING:
+        parser.error(f"--atlas-size 至少要 {ATLAS_THUMB_WIDTH + 2 * ATLAS_PADDING}")
+    if args.fingerprint_grace < 0:
+        parser.error("--fingerprint-grace 不可為負數")
+    if args.data and not os.path.isfile(args.data):
+        parser.error(f"找不到資料檔: {args.data}")
+    if args.publish:
+        # 網站的封面與搜尋結果以 <use href> 取用雪碧圖，部署時一併產生
+        args.sprite = True
+        if args.data is None:
+            args.data = ANIMAL_DATA
+
+    options = {
+        "rasterize": not args.no_png,
+        "renderer": args.renderer,
+        "force": args.force,
+        "widths": () if args.no_responsive else widths,
+        "formats": formats,
+        "optimize": not args.no_optimize,
+        "sprite": args.sprite,
+        "atlas": args.atlas,
+        "atlas_max_size": args.atlas_size,
+        "quantize": {"dither": args.dither, "max_error": args.max_error} if args.quantize else None,
+        "visual_gate": args.visual_gate,
+        "raster_cache": None if args.no_raster_cache else args.raster_cache,
+        "raster_cache_size": int(args.raster_cache_size * 1048576),
+        "precompress": args.precompress,
+        "report": args.report,
+        "metrics": args.metrics,
+        "data_file": args.data,
+        "fingerprint": not args.no_fingerprint,
+        "fingerprint_grace": args.fingerprint_grace * 86400,
     }
-}
+    if args.shard and (args.watch or args.merge):
+        parser.error("--shard 不可與 --watch 或 --merge 同時使用")
+    if args.watch:
+        watch(args.output, jobs=args.jobs, polling=args.poll, **options)
+        return 0
+    if args.merge:
+        report = options.pop("report")
+        try:
+            results = merge_shards(args.merge, args.output, report, jobs=args.jobs, **options)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 1
+        return 1 if any("error" in r for r in results) else 0
+
+    if args.profile and args.profile not in ANIMALS:
+        parser.error(f"找不到動物: {args.profile}")
+    results = generate_images(args.output, jobs=args.jobs, profile=args.profile, shard=args.shard,
+                              **options)
+    return 1 if any("error" in r for r in results) else 0
 
-def generate_images():
-    """生成所有水族館動物的 SVG 圖片"""
-    print("🎨 開始生成可愛風格的水族館動物圖片...")
-    
-    for animal_id, data in ANIMALS.items():
-        animal_dir = os.path.join(OUTPUT_DIR, animal_id)
-        
-        # 確保目錄存在
-        os.makedirs(animal_dir, exist_ok=True)
-        
-        # 寫入 SVG 檔案
-        svg_path = os.path.join(animal_dir, "main.png")  # 儲存為 .png 副檔名但內容是 SVG
-        
-        # 實際上我們要產生 PNG，但先儲存 SVG
-        svg_file = os.path.join(animal_dir, "main.svg")
-        with open(svg_file, 'w', encoding='utf-8') as f:
-            f.write(data['svg'])
-        
-        print(f"✅ 已生成: {animal_id}/main.svg")
-    
-    print(f"\n🎉 完成！共生成 {len(ANIMALS)} 隻可愛的水族館動物圖片")
-    print(f"📁 圖片位置: {OUTPUT_DIR}")
-    print("\n⚠️  注意: SVG 檔案已生成，建議將 .svg 轉換為 .png 以獲得更好的瀏覽器相容性")
-    print("可使用以下指令將 SVG 轉換為 PNG:")
-    print("  brew install librsvg")
-    print(f"  cd {OUTPUT_DIR}")
-    print("  for dir in */; do rsvg-convert \"${{dir}}main.svg\" -o \"${{dir}}main.png\" -w 800 -h 600; done")
 
 if __name__ == "__main__":
-    generate_images()
+    raise SystemExit(main())
@@ -0,0 +1,77 @@
+"""紋理圖集：MaxRects 裝箱的位置不重疊、不超出圖集，且保留間距"""
+
+import random
+
+import pytest
+
+from aquarium_images.atlas import MaxRectsBin, pack_rects
+
+
+def boxes(sizes, placements, padding):
+    """各影格連同四周間距佔用的範圍：{圖集編號: [(x0, y0, x1, y1)]}"""
+    result = {}
+    for (width, height), (index, x, y) in zip(sizes, placements):
+        result.setdefault(index, []).append(
+            (x - padding, y - padding, x + width + padding, y + height + padding))
+    return result
+
+
+def assert_valid(sizes, placements, extents, padding):
+    for index, rects in boxes(sizes, placements, padding).items():
+        width, height = extents[index]
+        for i, (x0, y0, x1, y1) in enumerate(rects):
+            assert 0 <= x0 and 0 <= y0 and x1 <= width and y1 <= height
+            for ox0, oy0, ox1, oy1 in rects[i + 1:]:
+                assert x1 <= ox0 or ox1 <= x0 or y1 <= oy0 or oy1 <= y0
+
+
+def test_bin_places_top_left_first():
+    atlas = MaxRectsBin(100, 100)
+    assert atlas.insert(60, 40) == (0, 0)
+    assert atlas.insert(40, 40) == (60, 0)
+    assert atlas.insert(50, 30) == (0, 40)
+    assert atlas.insert(101, 10) is None
+
+
+def test_bin_fills_exactly():
+    atlas = MaxRectsBin(64, 64)
+    positions = [atlas.insert(16, 16) for _ in range(16)]
+    assert len(set(positions)) == 16
+    assert atlas.insert(1, 1) is None
+
+
+def test_pack_random_frames():
+    rng = random.Random(7)
+    sizes = [(rng.randint(8, 160), rng.randint(8, 120)) for _ in range(60)]
+    placements, extents = pack_rects(sizes, max_size=512, padding=2)
+    assert len(placements) == len(sizes)
+    assert all(width <= 512 and height <= 512 for width, height in extents)
+    assert_valid(sizes, placements, extents, padding=2)
+
+
+def test_pack_spills_into_new_atlas():
+    sizes = [(100, 100)] * 5
+    placements, extents = pack_rects(sizes, max_size=204, padding=1)
+    assert len(extents) == 2
+    assert sorted(index for index, _, _ in placements) == [0, 0, 0, 0, 1]
+    assert_valid(sizes, placements, extents, padding=1)
+
+
+def test_pack_small_set_into_square_atlas():
+    placements, extents = pack_rects([(30, 30)] * 4, max_size=2048, padding=0)
+    assert extents == [(60, 60)]
+    assert {(x, y) for _, x, y in placements} == {(0, 0), (30, 0), (0, 30), (30, 30)}
+
+
+def test_pack_is_deterministic():
+    sizes = [(40, 20), (20, 40), (30, 30), (40, 20)]
+    assert pack_rects(sizes, 128, 2) == pack_rects(sizes, 128, 2)
+
+
+def test_pack_rejects_oversized_frame():
+    with pytest.raises(ValueError):
+        pack_rects([(100, 10)], max_size=100, padding=1)
+
+
+def test_pack_nothing():
+    assert pack_rects([]) == ([], [])
@@ -0,0 +1,89 @@
+"""點陣圖快取：存取、總大小的簿記與最久未使用的淘汰"""
+
+import pytest
+
+from aquarium_images import cache
+from aquarium_images.cache import (
+    RasterCache, open_raster_cache, raster_cache_key, worker_raster_cache,
+)
+
+pytestmark = pytest.mark.skipif(cache.sqlite3 is None, reason="點陣圖快取需要 sqlite3")
+
+SETTINGS = {"png": {"renderer": "numpy", "width": 800, "height": 600, "version": 3}}
+
+
+@pytest.fixture
+def raster_cache(tmp_path):
+    with RasterCache(str(tmp_path / "rasters.sqlite"), max_bytes=1000) as opened:
+        yield opened
+
+
+def test_put_and_get(raster_cache):
+    raster_cache.put_many([("a", b"png-a", {"width": 8}), ("b", b"png-b", None)])
+    found = raster_cache.get_many(["a", "b", "missing"])
+    assert found == {"a": (b"png-a", {"width": 8}), "b": (b"png-b", None)}
+    stats = raster_cache.stats()
+    assert (stats["entries"], stats["bytes"], stats["hits"], stats["misses"]) == (2, 10, 2, 1)
+    assert (raster_cache.hits, raster_cache.misses) == (2, 1)
+
+
+def test_replacing_an_entry_keeps_the_total(raster_cache):
+    raster_cache.put_many([("a", b"x" * 100, None)])
+    raster_cache.put_many([("a", b"x" * 40, None), ("a", b"x" * 30, None)])
+    stats = raster_cache.stats()
+    assert (stats["entries"], stats["bytes"]) == (1, 30)
+
+
+def test_evicts_least_recently_used(raster_cache, monkeypatch):
+    clock = iter(range(100))
+    monkeypatch.setattr(cache.time, "time", lambda: next(clock))
+    raster_cache.put_many([("old", b"x" * 400, None)])
+    raster_cache.put_many([("used", b"x" * 400, None)])
+    raster_cache.get_many(["old"])
+    # 超過 1000 bytes：淘汰到低水位（900）以下，最久未使用的是 used
+    raster_cache.put_many([("new", b"x" * 400, None)])
+    assert set(raster_cache.get_many(["old", "used", "new"])) == {"old", "new"}
+    stats = raster_cache.stats()
+    assert (stats["bytes"], stats["evictions"], raster_cache.evicted) == (800, 1, 1)
+
+
+def test_stats_persist_across_connections(tmp_path):
+    path = str(tmp_path / "rasters.sqlite")
+    with RasterCache(path) as first:
+        first.put_many([("a", b"123", None)])
+        first.get_many(["a"])
+    with RasterCache(path) as second:
+        stats = second.stats()
+    assert (stats["entries"], stats["bytes"], stats["hits"], stats["stored"]) == (1, 3, 1, 1)
+
+
+def test_key_depends_on_every_input():
+    base = raster_cache_key("digest", 800, 600, "png", SETTINGS, False)
+    assert base == raster_cache_key("digest", 800, 600, "png", SETTINGS, False)
+    variants = {
+        raster_cache_key("other", 800, 600, "png", SETTINGS, False),
+        raster_cache_key("digest", 400, 300, "png", SETTINGS, False),
+        raster_cache_key("digest", 800, 600, "webp", SETTINGS, False),
+        raster_cache_key("digest", 800, 600, "png", SETTINGS, True),
+        raster_cache_key("digest", 800, 600, "png",
+                         {"png": {**SETTINGS["png"], "version": 4}}, False),
+        raster_cache_key("digest", 800, 600, "png",
+                         {**SETTINGS, "quantize": {"dither": 0.5}}, False),
+    }
+    assert base not in variants and len(variants) == 6
+
+
+def test_open_without_config():
+    assert open_raster_cache(None) is None
+    assert worker_raster_cache(None) is None
+
+
+def test_worker_reuses_connection(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "_worker_caches", {})
+    config = {"path": str(tmp_path / "rasters.sqlite"), "max_bytes": 1000}
+    opened = worker_raster_cache(config)
+    try:
+        assert isinstance(opened, RasterCache)
+        assert worker_raster_cache(config) is opened
+    finally:
+        opened.close()
@@ -0,0 +1,96 @@
+"""指紋網址：指紋檔的產生，以及只清除本工具寫出、過了寬限期的舊指紋"""
+
+import hashlib
+import json
+
+import pytest
+
+from aquarium_images.common import FINGERPRINT_LENGTH, FINGERPRINT_STATE_NAME, URL_PREFIX
+from aquarium_images.web import collect_fingerprints, fingerprint_url
+
+GRACE = 100
+
+
+@pytest.fixture
+def output_dir(tmp_path):
+    (tmp_path / "octopus").mkdir()
+    (tmp_path / "octopus" / "main.png").write_bytes(b"octopus")
+    return tmp_path
+
+
+def digest(data):
+    return hashlib.sha256(data).hexdigest()[:FINGERPRINT_LENGTH]
+
+
+def test_fingerprint_url_writes_copy(output_dir):
+    emitted = set()
+    url = fingerprint_url(f"{URL_PREFIX}/octopus/main.png", str(output_dir), emitted)
+    name = f"main.{digest(b'octopus')}.png"
+    assert url == f"{URL_PREFIX}/octopus/{name}"
+    assert (output_dir / "octopus" / name).read_bytes() == b"octopus"
+    assert emitted == {f"octopus/{name}"}
+
+
+def test_fingerprint_url_follows_source_changes(output_dir):
+    old = fingerprint_url(f"{URL_PREFIX}/octopus/main.png", str(output_dir))
+    (output_dir / "octopus" / "main.png").write_bytes(b"redrawn")
+    assert fingerprint_url(old, str(output_dir)).endswith(f"/main.{digest(b'redrawn')}.png")
+
+
+@pytest.mark.parametrize("url", ["/images/other/main.png", f"{URL_PREFIX}/octopus/missing.png"])
+def test_fingerprint_url_leaves_other_urls(output_dir, url):
+    assert fingerprint_url(url, str(output_dir)) == url
+
+
+def fingerprinted(output_dir, name, data=b"old"):
+    path = output_dir / "octopus" / name
+    path.write_bytes(data)
+    for encoding in ("gz", "br"):
+        (output_dir / "octopus" / f"{name}.{encoding}").write_bytes(data)
+    return f"octopus/{name}"
+
+
+def state(output_dir):
+    return json.loads((output_dir / FINGERPRINT_STATE_NAME).read_text(encoding="utf-8"))["files"]
+
+
+def test_replaced_fingerprint_survives_grace_period(output_dir):
+    old = fingerprinted(output_dir, "main.aaaaaaaaaa.svg")
+    new = fingerprinted(output_dir, "main.bbbbbbbbbb.svg")
+    assert collect_fingerprints(str(output_dir), {old}, {old}, GRACE, now=1000) == []
+    assert state(output_dir) == {old: None}
+
+    # 改引用新指紋：舊指紋從這時起算寬限期
+    assert collect_fingerprints(str(output_dir), {new}, {new}, GRACE, now=2000) == []
+    assert state(output_dir) == {old: 2000, new: None}
+    assert collect_fingerprints(str(output_dir), {new}, {new}, GRACE, now=2099) == []
+
+    assert collect_fingerprints(str(output_dir), {new}, {new}, GRACE, now=2100) == [old]
+    assert state(output_dir) == {new: None}
+    remaining = sorted(path.name for path in (output_dir / "octopus").iterdir())
+    assert remaining == ["main.bbbbbbbbbb.svg", "main.bbbbbbbbbb.svg.br",
+                         "main.bbbbbbbbbb.svg.gz", "main.png"]
+
+
+def test_untracked_files_are_never_removed(output_dir):
+    stranger = fingerprinted(output_dir, "logo.cccccccccc.svg")
+    collect_fingerprints(str(output_dir), set(), set(), 0, now=1000)
+    assert (output_dir / stranger).exists()
+    assert not (output_dir / FINGERPRINT_STATE_NAME).exists()
+
+
+def test_reference_again_cancels_removal(output_dir):
+    old = fingerprinted(output_dir, "main.aaaaaaaaaa.svg")
+    collect_fingerprints(str(output_dir), {old}, {old}, GRACE, now=1000)
+    collect_fingerprints(str(output_dir), set(), set(), GRACE, now=2000)
+    collect_fingerprints(str(output_dir), {old}, {old}, GRACE, now=2050)
+    assert collect_fingerprints(str(output_dir), {old}, {old}, GRACE, now=5000) == []
+    assert (output_dir / old).exists()
+
+
+def test_unknown_state_version_is_ignored(output_dir):
+    old = fingerprinted(output_dir, "main.aaaaaaaaaa.svg")
+    (output_dir / FINGERPRINT_STATE_NAME).write_text(
+        json.dumps({"version": 1, "files": {old: 0}}), encoding="utf-8")
+    assert collect_fingerprints(str(output_dir), set(), set(), 0, now=1000) == []
+    assert (output_dir / old).exists()
@@ -0,0 +1,49 @@
+"""路徑、變換與顏色的解析"""
+
+import math
+
+import pytest
+
+from aquarium_images.geometry import flatten_path, parse_color, parse_transform
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("#f00", (1.0, 0.0, 0.0, 1.0)),
+    ("#FF000080", (1.0, 0.0, 0.0, 128 / 255)),
+    ("white", (1.0, 1.0, 1.0, 1.0)),
+    ("rgba(255, 0, 0, .5)", (1.0, 0.0, 0.0, 0.5)),
+    ("rgb(100%,0%,0%)", (1.0, 0.0, 0.0, 1.0)),
+    ("transparent", (0.0, 0.0, 0.0, 0.0)),
+    ("none", None),
+    ("currentColor", None),
+])
+def test_parse_color(value, expected):
+    assert parse_color(value) == expected
+
+
+def test_parse_transform_applies_left_to_right():
+    np = pytest.importorskip("numpy")
+    matrix = parse_transform("translate(10 20) scale(2)")
+    assert (matrix @ [1, 1, 1]).tolist() == [12.0, 22.0, 1.0]
+    rotate = parse_transform("rotate(90 5 5)")
+    assert np.allclose(rotate @ [10, 5, 1], [5, 10, 1])
+
+
+def test_flatten_lines_and_subpaths():
+    assert flatten_path("M0 0h10v10H0zM20 20l5 5", 0.1) == [
+        ([[0.0, 0.0], [10.0, 0.0], [10.0, 10.0], [0.0, 10.0]], True),
+        ([[20.0, 20.0], [25.0, 25.0]], False),
+    ]
+
+
+@pytest.mark.parametrize("tolerance", [0.1, 0.01])
+def test_flatten_arc_within_tolerance(tolerance):
+    [(points, closed)] = flatten_path("M10 0A10 10 0 0 1 -10 0A10 10 0 0 1 10 0Z", tolerance)
+    assert closed
+    assert max(abs(math.hypot(x, y) - 10) for x, y in points) <= tolerance
+
+
+def test_flatten_cubic_ends_on_endpoint():
+    [(points, _)] = flatten_path("M0 0C0 10 10 10 10 0", 0.05)
+    assert points[0] == [0.0, 0.0] and points[-1] == pytest.approx([10.0, 0.0])
+    assert max(y for _, y in points) == pytest.approx(7.5, abs=0.05)
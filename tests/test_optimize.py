@@ -0,0 +1,111 @@
+"""SVG 最佳化器：座標捨入不可造成看得出的差異"""
+
+import pytest
+
+from aquarium_images.geometry import flatten_path
+from aquarium_images.optimize import (
+    GEOMETRY_MAX_WIDTH, GEOMETRY_TOLERANCE, optimize_svg, round_path, short_color, short_number,
+    short_path,
+)
+from aquarium_images.raster import np, rasterize_scenes
+from aquarium_images.scene import ANIMALS, scene_svg
+
+# 比較繪製結果的測試需要內建點陣化
+needs_numpy = pytest.mark.skipif(np is None, reason="內建點陣化需要 NumPy")
+
+# 座標捨入的誤差上限是 GEOMETRY_TOLERANCE 像素（x、y 各自），邊緣的覆蓋率差異不超過此值
+MAX_EDGE_DIFF = int(GEOMETRY_TOLERANCE * 2 ** 0.5 * 255) + 2
+
+
+def render(svg, width=GEOMETRY_MAX_WIDTH):
+    [[pixels]] = rasterize_scenes([(svg, [(width, width * 3 // 4)])])
+    return pixels.astype(int)
+
+
+def unrounded(svg):
+    """只做無損最佳化的版本（最大寬度極大時座標不會被捨入）"""
+    return optimize_svg(svg, max_width=10 ** 12)
+
+
+def relative_chain(count=200, step=0.0449):
+    """一長串相對線段：逐段捨入時誤差會累積到好幾個像素"""
+    segments = " ".join(f"l{step} {step}" for _ in range(count))
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 400 300">'
+            f'<path d="M50.123 40.456{segments}" fill="none" stroke="#123" stroke-width="3"/>'
+            f'</svg>')
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("0.500", ".5"), ("-0.25", "-.25"), ("10.0", "10"), ("1e-7", "1e-07"),
+])
+def test_short_number(text, expected):
+    assert short_number(text) == expected
+
+
+def test_short_path_drops_separators():
+    assert short_path("M 10.0 20.50 L -5 0.5 L 3 4") == "M10 20.5L-5 .5L3 4"
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("#FF0000", "red"), ("#AABBCC", "#abc"), ("white", "#fff"), ("#c0c0c0", "silver"),
+    ("none", "none"),
+])
+def test_short_color(value, expected):
+    assert short_color(value) == expected
+
+
+def test_optimize_removes_defaults_and_merges_shapes():
+    svg = ('<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 10 10"><!-- 註解 -->'
+           '<rect x="0" y="0" width="5" height="5" fill="#000000" opacity="1"/>'
+           '<circle cx="1" cy="1" r="1" fill="#FF0000"/><circle cx="8" cy="8" r="1" fill="#FF0000"/>'
+           '</svg>')
+    assert optimize_svg(svg) == (
+        '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 10 10"><path d="M0 0h5v5h-5z"/>'
+        '<path d="M0 1a1 1 0 1 0 2 0a1 1 0 1 0-2 0zM7 8a1 1 0 1 0 2 0a1 1 0 1 0-2 0z" fill="red"/>'
+        '</svg>')
+
+
+def test_optimize_drops_unreferenced_definitions():
+    svg = ('<svg xmlns="http://www.w3.org/2000/svg"><defs><linearGradient id="unused"/>'
+           '<linearGradient id="g"/></defs><rect width="1" height="1" fill="url(#g)"/></svg>')
+    assert 'id="unused"' not in optimize_svg(svg)
+    assert 'id="g"' in optimize_svg(svg)
+
+
+def test_optimize_returns_unparseable_svg_unchanged():
+    assert optimize_svg("<svg") == "<svg"
+
+
+def test_round_path_keeps_relative_endpoints_on_absolute_grid():
+    d = "M10.123 20.456" + "l.0449 .0449" * 200 + "h3.3333v-1.1111"
+    rounded = round_path(d, 2)
+    [(original, _)] = flatten_path(d, 1.0)
+    [(result, _)] = flatten_path(rounded, 1.0)
+    assert len(original) == len(result)
+    for (x0, y0), (x1, y1) in zip(original, result):
+        assert abs(x0 - x1) <= 0.005 + 1e-9
+        assert abs(y0 - y1) <= 0.005 + 1e-9
+
+
+def test_round_path_handles_closepath_and_arcs():
+    d = "M1.111 1.111l2.222 0 0 2.222zm1.001 1.001a5.5555 5.5555 0 0 1 10.10101 0"
+    assert round_path(d, 1) == "M1.1 1.1l2.2 0 0 2.2zm1 1a5.6 5.6 0 0 1 10.1 0"
+
+
+def test_round_path_leaves_unparseable_data_alone():
+    assert round_path("M 10 10 L abc", 1) == "M 10 10 L abc"
+
+
+@needs_numpy
+def test_rounding_a_long_relative_path_is_invisible():
+    svg = relative_chain()
+    before, after = render(unrounded(svg)), render(optimize_svg(svg))
+    assert np.abs(before - after).max() <= MAX_EDGE_DIFF
+
+
+@needs_numpy
+@pytest.mark.parametrize("animal_id", sorted(ANIMALS))
+def test_rounding_catalog_scenes_is_invisible(animal_id):
+    svg = scene_svg(ANIMALS[animal_id])
+    before, after = render(unrounded(svg)), render(optimize_svg(svg))
+    assert np.abs(before - after).max() <= MAX_EDGE_DIFF
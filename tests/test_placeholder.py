@@ -0,0 +1,45 @@
+"""低畫質預覽：尺寸與縮圖比例取自實際的 main.png"""
+
+import base64
+import struct
+
+import numpy as np
+import pytest
+
+from aquarium_images import web
+from aquarium_images.common import PLACEHOLDER_WIDTH
+from aquarium_images.raster import encode_png
+from aquarium_images.web import make_placeholder, png_dimensions
+
+SVG = ('<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 300 100">'
+       '<rect width="300" height="100" fill="#3366cc"/></svg>')
+
+
+def thumbnail_size(placeholder):
+    data = base64.b64decode(placeholder["thumbnail"].split(",", 1)[1])
+    return struct.unpack(">II", data[16:24])
+
+
+@pytest.mark.parametrize("pillow", [True, False])
+def test_dimensions_come_from_png(tmp_path, monkeypatch, pillow):
+    if not pillow:
+        monkeypatch.setattr(web, "Image", None)
+    elif web.Image is None:
+        pytest.skip("需要 Pillow")
+    png = tmp_path / "main.png"
+    image = np.zeros((100, 300, 4), dtype=np.uint8)
+    image[...] = (0x33, 0x66, 0xcc, 255)
+    png.write_bytes(encode_png(image))
+
+    placeholder = make_placeholder(SVG, str(png))
+
+    assert (placeholder["width"], placeholder["height"]) == (300, 100)
+    assert thumbnail_size(placeholder) == (PLACEHOLDER_WIDTH, 5)
+    assert placeholder["color"] == "#3366cc"
+
+
+def test_png_dimensions_rejects_other_files(tmp_path):
+    path = tmp_path / "main.png"
+    path.write_bytes(b"GIF89a" + bytes(20))
+    with pytest.raises(ValueError):
+        png_dimensions(str(path))
@@ -0,0 +1,103 @@
+"""調色盤量化：顏色不多時完全無損，失真超過門檻時維持全彩"""
+
+import io
+
+import pytest
+
+from aquarium_images import quantize
+from aquarium_images.quantize import (
+    QUANTIZE_MAX_ERROR, build_palette, encode_indexed_png, perceptual_error, quantize_pixels,
+    quantize_png,
+)
+from aquarium_images.raster import encode_png
+
+np = pytest.importorskip("numpy")
+
+
+def gradient(width=64, height=48):
+    """紅、綠兩個方向的漸層：3,072 種顏色"""
+    image = np.zeros((height, width, 4), dtype=np.uint8)
+    image[..., 0] = np.linspace(0, 255, width)[None, :]
+    image[..., 1] = np.linspace(0, 255, height)[:, None]
+    image[..., 2] = 128
+    image[..., 3] = 255
+    return image
+
+
+def stripes():
+    """三種顏色（含半透明）的條紋"""
+    image = np.zeros((8, 24, 4), dtype=np.uint8)
+    image[:, :8] = (255, 0, 0, 255)
+    image[:, 8:16] = (0, 0, 255, 128)
+    image[:, 16:] = (0, 0, 0, 0)
+    return image
+
+
+def decode(data):
+    Image = pytest.importorskip("PIL.Image")
+    with Image.open(io.BytesIO(data)) as image:
+        return image.mode, np.asarray(image.convert("RGBA"))
+
+
+def test_palette_of_few_colors_is_exact():
+    image = stripes()
+    palette, indices = build_palette(image.reshape(-1, 4))
+    assert len(palette) == 3
+    assert (palette[indices].astype(np.uint8) == image.reshape(-1, 4)).all()
+
+
+@pytest.mark.parametrize("dither", [0.0, 0.5])
+def test_few_colors_survive_quantization(dither):
+    image = stripes()
+    indices, palette = quantize_pixels(image, dither=dither)
+    assert (palette[indices] == image).all()
+
+
+def test_palette_size_is_limited():
+    indices, palette = quantize_pixels(gradient(), colors=16, dither=0)
+    assert len(palette) <= 16
+    assert indices.max() < len(palette)
+
+
+def test_perceptual_error_of_identical_images_is_zero():
+    image = gradient()
+    assert perceptual_error(image, image) == 0.0
+
+
+def test_indexed_png_keeps_transparency():
+    image = stripes()
+    indices, palette = quantize_pixels(image, dither=0)
+    mode, pixels = decode(encode_indexed_png(indices, palette))
+    assert mode == "P"
+    assert (pixels == image).all()
+
+
+def test_quantize_png_shrinks_gradient():
+    pytest.importorskip("PIL")
+    data = encode_png(gradient())
+    result, stats = quantize_png(data)
+    assert stats["indexed"] and stats["error"] <= QUANTIZE_MAX_ERROR
+    assert stats["after"] == len(result) < len(data)
+    mode, pixels = decode(result)
+    assert mode == "P"
+    assert np.abs(pixels.astype(int) - gradient()).max() <= 16
+
+
+def test_quantize_png_keeps_full_color_when_error_is_too_large():
+    pytest.importorskip("PIL")
+    data = encode_png(gradient())
+    result, stats = quantize_png(data, max_error=0.0)
+    assert result == data and not stats["indexed"]
+
+
+def test_quantize_png_leaves_indexed_input_alone():
+    pytest.importorskip("PIL")
+    indices, palette = quantize_pixels(stripes(), dither=0)
+    data = encode_indexed_png(indices, palette)
+    assert quantize_png(data) == (data, {"before": len(data), "after": len(data),
+                                         "error": 0.0, "indexed": False})
+
+
+def test_quantize_tree_requires_numpy_and_pillow(tmp_path, monkeypatch):
+    monkeypatch.setattr(quantize, "Image", None)
+    assert quantize.quantize_tree(str(tmp_path)) is None
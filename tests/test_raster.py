@@ -0,0 +1,63 @@
+"""內建點陣化：群組 opacity 以離屏圖層合成"""
+
+import pytest
+
+from aquarium_images import raster
+from aquarium_images.raster import CURVE_TOLERANCE, compile_scene, rasterize_scenes
+from aquarium_images.scene import load_scene
+
+pytestmark = pytest.mark.skipif(raster.np is None, reason="內建點陣化需要 NumPy")
+
+
+def render(body, size=(100, 50)):
+    svg = f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 50">{body}</svg>'
+    [[image]] = rasterize_scenes([(svg, [size])])
+    return image
+
+
+def test_group_opacity_composites_once():
+    image = render('<g opacity="0.5"><circle cx="40" cy="25" r="20" fill="#f00"/>'
+                   '<circle cx="60" cy="25" r="20" fill="#f00"/></g>')
+    # 兩個圓重疊處與單獨一個圓的地方一樣透明，不會疊成 0.75
+    assert tuple(image[25, 50]) == (255, 0, 0, 128)
+    assert tuple(image[25, 30]) == (255, 0, 0, 128)
+
+
+def test_group_opacity_keeps_paint_order():
+    image = render('<g opacity="0.5"><rect width="100" height="50" fill="#f00"/>'
+                   '<rect width="50" height="50" fill="#00f"/></g>')
+    # 圖層內上層的藍色完全蓋住紅色，合成後不會透出紅色
+    assert tuple(image[25, 25]) == (0, 0, 255, 128)
+    assert tuple(image[25, 75]) == (255, 0, 0, 128)
+
+
+def test_element_opacity_covers_fill_and_stroke():
+    image = render('<rect x="10" y="10" width="30" height="30" fill="#00f" '
+                   'stroke="#00f" stroke-width="6" opacity="0.5"/>')
+    # 填色與筆畫重疊的邊框上同樣只有 0.5
+    assert tuple(image[10, 25]) == (0, 0, 255, 128)
+    assert tuple(image[25, 25]) == (0, 0, 255, 128)
+
+
+def test_nested_opacity_multiplies():
+    image = render('<g opacity="0.5"><g opacity="0.5">'
+                   '<rect width="100" height="50" fill="#0f0"/></g></g>')
+    assert tuple(image[25, 50]) == (0, 255, 0, 64)
+
+
+def test_single_shape_group_is_not_layered():
+    scene = load_scene('<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 50">'
+                           '<g opacity="0.5"><circle cx="40" cy="25" r="20" fill="#f00"/></g>'
+                           '<g opacity="0.5"><circle cx="40" cy="25" r="20" fill="#f00"/>'
+                           '<circle cx="60" cy="25" r="20" fill="#f00"/></g></svg>')
+    _, _, ops = compile_scene(scene, CURVE_TOLERANCE)
+    assert [type(op).__name__ for op in ops] == ["DrawOp", "LayerOp"]
+    assert ops[0].fill_alpha == 0.5
+
+
+def test_layer_partly_outside_canvas():
+    image = render('<g opacity="0.5" transform="translate(-30 0)">'
+                   '<circle cx="20" cy="25" r="20" fill="#f00"/>'
+                   '<circle cx="30" cy="25" r="20" fill="#f00"/></g>')
+    assert tuple(image[25, 0]) == (255, 0, 0, 128)
+    assert image[25, 40, 3] == 0
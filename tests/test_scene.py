@@ -0,0 +1,35 @@
+"""場景載入：<stop> 與漸層的屬性在讀入、寫出後不會遺失"""
+
+import xml.etree.ElementTree as ET
+
+from aquarium_images.scene import _stop_from_attrs, load_scene
+from aquarium_images.svg import SVG_NS
+
+NAMESPACES = {"svg": SVG_NS}
+
+
+def roundtrip(defs):
+    svg = (f'<svg xmlns="{SVG_NS}" viewBox="0 0 10 10"><defs>{defs}</defs>'
+           '<rect width="10" height="10" fill="url(#g)"/></svg>')
+    return ET.fromstring(load_scene(svg).to_svg())
+
+
+def test_stop_keeps_unknown_attributes():
+    root = roundtrip('<linearGradient id="g"><stop offset="50%" id="s" class="warm" '
+                     'style="stop-color:#f00;stop-opacity:.5;transition:none"/></linearGradient>')
+    stop = root.find(".//svg:stop", NAMESPACES)
+    assert stop.attrib == {"offset": "0.5", "stop-color": "#f00", "stop-opacity": "0.5",
+                           "id": "s", "class": "warm", "style": "transition:none"}
+
+
+def test_style_overrides_stop_attributes():
+    stop = _stop_from_attrs({"offset": "1", "stop-color": "#000", "style": "stop-color: #fff"})
+    assert (stop.offset, stop.color, stop.opacity, stop.attrs) == (1.0, "#fff", 1.0, {})
+
+
+def test_gradient_with_animated_stop_is_kept_verbatim():
+    root = roundtrip('<radialGradient id="g"><stop offset="0" stop-color="#fff">'
+                     '<animate attributeName="stop-color" values="#fff;#000" dur="2s"/>'
+                     '</stop></radialGradient>')
+    animate = root.find(".//svg:stop/svg:animate", NAMESPACES)
+    assert animate is not None and animate.get("values") == "#fff;#000"
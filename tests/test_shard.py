@@ -0,0 +1,104 @@
+"""分片建置：LPT 分配、分片參數與分片紀錄的檢查"""
+
+import argparse
+import json
+
+import pytest
+
+from aquarium_images.common import SHARD_RECORD_NAME
+from aquarium_images.scene import ANIMALS, scene_svg
+from aquarium_images.shard import (
+    load_shard_records, merge_reports, parse_shard, partition_scenes, shard_costs,
+)
+
+
+def test_partition_longest_first():
+    costs = {"a": 5, "b": 4, "c": 3, "d": 3, "e": 3}
+    # a→0、b→1、c→1（4 < 5）、d→0（5 < 7）、e→1（7 < 8）
+    assert partition_scenes(costs, 2) == [{"a", "d"}, {"b", "c", "e"}]
+
+
+def test_partition_ties_go_to_lower_shard():
+    assert partition_scenes({"x": 1, "y": 1, "z": 1}, 3) == [{"x"}, {"y"}, {"z"}]
+    assert partition_scenes({"x": 1}, 3) == [{"x"}, set(), set()]
+
+
+def test_partition_covers_every_scene_once():
+    costs = shard_costs({animal_id: scene_svg(data) for animal_id, data in ANIMALS.items()})
+    shards = partition_scenes(costs, 4)
+    assert sorted(scene for shard in shards for scene in shard) == sorted(ANIMALS)
+    loads = [sum(costs[scene] for scene in shard) for shard in shards]
+    # LPT 的最大負載不超過最佳解的 4/3 倍，最佳解至少是平均值與最大單一成本
+    assert max(loads) <= 4 / 3 * max(sum(loads) / 4, max(costs.values())) + 1e-9
+
+
+def test_partition_does_not_depend_on_input_order():
+    costs = {f"scene-{i}": float(i % 7) for i in range(30)}
+    reversed_costs = dict(reversed(list(costs.items())))
+    assert partition_scenes(costs, 3) == partition_scenes(reversed_costs, 3)
+
+
+def test_shard_costs_of_broken_scene():
+    assert shard_costs({"broken": "<svg"}) == {"broken": 1.0}
+
+
+@pytest.mark.parametrize("value, expected", [("1/4", (1, 4)), (" 3 / 3 ", (3, 3))])
+def test_parse_shard(value, expected):
+    assert parse_shard(value) == expected
+
+
+@pytest.mark.parametrize("value", ["0/4", "5/4", "1", "a/b"])
+def test_parse_shard_rejects(value):
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_shard(value)
+
+
+def write_record(directory, index, count, scenes, settings=None):
+    directory.mkdir()
+    record = {"shard": [index, count], "scenes": scenes, "settings": settings or {"svg": True}}
+    (directory / SHARD_RECORD_NAME).write_text(json.dumps(record), encoding="utf-8")
+    return str(directory)
+
+
+def test_load_records_sorted_by_index(tmp_path):
+    second = write_record(tmp_path / "b", 2, 2, ["b"])
+    first = write_record(tmp_path / "a", 1, 2, ["a"])
+    records = load_shard_records([second, first])
+    assert [shard_dir for shard_dir, _ in records] == [first, second]
+
+
+@pytest.mark.parametrize("records, message", [
+    ([(1, 2, ["a"], None)], "不完整"),
+    ([(1, 2, ["a"], None), (1, 2, ["b"], None)], "不完整"),
+    ([(1, 2, ["a"], None), (2, 3, ["b"], None)], "總片數"),
+    ([(1, 2, ["a"], None), (2, 2, ["a"], None)], "同時出現"),
+    ([(1, 2, ["a"], None), (2, 2, ["b"], {"svg": False})], "設定不同"),
+])
+def test_load_records_rejects_inconsistent_shards(tmp_path, records, message):
+    dirs = [write_record(tmp_path / str(i), index, count, scenes, settings)
+            for i, (index, count, scenes, settings) in enumerate(records)]
+    with pytest.raises(ValueError, match=message):
+        load_shard_records(dirs)
+
+
+def test_load_records_missing_file(tmp_path):
+    with pytest.raises(ValueError, match="無法讀取"):
+        load_shard_records([str(tmp_path)])
+
+
+def test_merge_reports_sums_counts_and_keeps_order():
+    def report(animals, wall, peak):
+        return {
+            "settings": {"svg": True},
+            "animals": [{"id": animal} for animal in animals],
+            "summary": {"animals": len(animals), "built": len(animals), "cached": 0, "failed": 0,
+                        "cpu_seconds": wall, "bytes_written": 100, "elements": 10,
+                        "wall_seconds": wall, "peak_rss_bytes": peak,
+                        "stages": {"svg": {"seconds": wall, "count": len(animals)}}},
+        }
+    merged = merge_reports([report(["c", "a"], 2.0, 50), report(["b"], 3.0, None)], ["a", "b", "c"])
+    summary = merged["summary"]
+    assert [animal["id"] for animal in merged["animals"]] == ["a", "b", "c"]
+    assert (summary["animals"], summary["bytes_written"], summary["wall_seconds"],
+            summary["runner_seconds"], summary["peak_rss_bytes"]) == (3, 200, 3.0, 5.0, 50)
+    assert summary["stages"] == {"svg": {"seconds": 5.0, "count": 3}}
@@ -0,0 +1,74 @@
+"""串流寫出：記憶體用量與場景大小無關，輸出與一次組成的字串完全相同"""
+
+import gc
+import hashlib
+import random
+import tracemalloc
+
+from aquarium_images.scene import (
+    Circle, Ellipse, Group, LinearGradient, Polygon, Scene, Stop, file_digest, stream_svg,
+    write_stream,
+)
+
+SMALL, LARGE = 2_000, 50_000
+
+# 大場景的記憶體峰值可容許為小場景的倍數（吸收配置器與緩衝的雜訊）
+MEMORY_FACTOR = 1.5
+
+
+def reef(count, seed=20240316):
+    """以產生器逐一產生恰好 count 個元素的珊瑚礁全景"""
+    rng = random.Random(seed)
+    produced = 0
+    while produced < count:
+        x, y = round(rng.uniform(0, 4000), 1), round(rng.uniform(0, 300), 1)
+        if rng.random() < 0.3 and count - produced >= 3:
+            yield Group([
+                Ellipse(x, y, 12.0, 6.0, {"fill": "url(#water)"}),
+                Polygon([(x - 12, y), (x - 20, y - 6), (x - 20, y + 6)], {"fill": "#FFA500"}),
+            ], {"opacity": "0.9"})
+            produced += 3
+        else:
+            yield Circle(x, y, round(rng.uniform(2, 10), 1), {"fill": "#fff", "opacity": "0.4"})
+            produced += 1
+
+
+ATTRS = {"viewBox": "0 0 4000 300"}
+DEFS = [LinearGradient("water", 0.0, 0.0, 0.0, "100%",
+                           [Stop(0.0, "#87CEEB"), Stop(1.0, "#1E90FF")])]
+
+
+def streamed_peak(path, count):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        _, size = write_stream(str(path), stream_svg(reef(count), ATTRS, DEFS))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return size, peak
+
+
+def test_peak_memory_does_not_grow_with_element_count(tmp_path):
+    small_size, small_peak = streamed_peak(tmp_path / "small.svg", SMALL)
+    large_size, large_peak = streamed_peak(tmp_path / "large.svg", LARGE)
+    assert large_size > small_size * (LARGE / SMALL) * 0.8
+    assert large_peak <= small_peak * MEMORY_FACTOR
+
+
+def test_streamed_file_matches_non_streamed_svg(tmp_path):
+    path = tmp_path / "reef.svg"
+    written, size = write_stream(str(path), stream_svg(reef(SMALL), ATTRS, DEFS))
+    svg = Scene(ATTRS, DEFS, list(reef(SMALL))).to_svg().encode("utf-8")
+    assert written and size == len(svg)
+    assert file_digest(str(path)) == hashlib.sha256(svg).digest()
+
+
+def test_unchanged_content_is_not_rewritten(tmp_path):
+    path = tmp_path / "reef.svg"
+    write_stream(str(path), stream_svg(reef(SMALL), ATTRS, DEFS))
+    mtime = path.stat().st_mtime_ns
+    written, _ = write_stream(str(path), stream_svg(reef(SMALL), ATTRS, DEFS))
+    assert not written
+    assert path.stat().st_mtime_ns == mtime
+    assert not (tmp_path / "reef.svg.tmp").exists()